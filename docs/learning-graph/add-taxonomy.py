@@ -60,6 +60,18 @@ def assign_taxonomy(concept_id: int, concept_label: str, taxonomy_config: dict =
     return 'MISC'
 
 
+def write_csv(rows: List[dict], output_csv: str):
+    """
+    Write concept rows (dicts with ConceptID, ConceptLabel, Dependencies
+    and TaxonomyID keys) to a learning graph CSV file.
+    """
+    with open(output_csv, 'w', encoding='utf-8', newline='') as f:
+        fieldnames = ['ConceptID', 'ConceptLabel', 'Dependencies', 'TaxonomyID']
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
 def add_taxonomy_to_csv(input_csv: str, output_csv: str, taxonomy_config: dict = None):
     """
     Read CSV, add taxonomy column, and write updated CSV.
@@ -87,12 +99,7 @@ def add_taxonomy_to_csv(input_csv: str, output_csv: str, taxonomy_config: dict =
                 'TaxonomyID': taxonomy_id
             })
 
-    # Write updated CSV
-    with open(output_csv, 'w', encoding='utf-8', newline='') as f:
-        fieldnames = ['ConceptID', 'ConceptLabel', 'Dependencies', 'TaxonomyID']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(rows)
+    write_csv(rows, output_csv)
 
     # Count concepts per taxonomy
     taxonomy_counts = {}
@@ -9,41 +9,22 @@ Analyzes the concept dependency graph and generates quality metrics including:
 - Terminal node detection (indegree=0, outdegree>0: nothing depends on them)
 - Orphaned node detection (indegree=0, outdegree=0: completely disconnected)
 - Connected component analysis
+
+The adjacency lists are built once by learning_graph.LearningGraph, so
+every analysis runs in linear time even on very large merged graphs.
 """
 
-import csv
-from collections import defaultdict, deque
+from collections import defaultdict
 from typing import Dict, List, Set, Tuple
 
-
-def load_graph(csv_path: str) -> Tuple[Dict[int, str], Dict[int, List[int]]]:
-    """Load the dependency graph from CSV file."""
-    concepts = {}  # id -> label
-    dependencies = defaultdict(list)  # id -> list of prerequisite ids
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            concept_id = int(row['ConceptID'])
-            concepts[concept_id] = row['ConceptLabel']
-
-            if row['Dependencies']:
-                deps = [int(d) for d in row['Dependencies'].split('|')]
-                dependencies[concept_id] = deps
-
-    return concepts, dependencies
+from graph_cache import GraphCache
+from learning_graph import LearningGraph, load_graph
 
 
 def calculate_indegree(concepts: Dict[int, str],
                        dependencies: Dict[int, List[int]]) -> Dict[int, int]:
     """Calculate indegree (number of concepts that depend on each concept)."""
-    indegree = {cid: 0 for cid in concepts}
-
-    for concept_id, prereqs in dependencies.items():
-        for prereq in prereqs:
-            indegree[prereq] += 1
-
-    return indegree
+    return LearningGraph(concepts, dependencies).indegree()
 
 
 def calculate_outdegree(concepts: Dict[int, str],
@@ -74,159 +55,89 @@ def find_orphaned_nodes(concepts: Dict[int, str],
 
 
 def verify_dag(concepts: Dict[int, str],
-               dependencies: Dict[int, List[int]]) -> Tuple[bool, List[List[int]]]:
+               dependencies: Dict[int, List[int]],
+               graph: LearningGraph = None) -> Tuple[bool, List[List[int]]]:
     """Verify the graph is a DAG using topological sort (Kahn's algorithm).
 
     Uses the reverse graph (prerequisite → dependent) so that:
     - in-degree = number of prerequisites each concept has
     - Start from foundational concepts (no prerequisites)
     - When a concept's prerequisites are all processed, it can be processed too
-    """
-    # In-degree in reverse graph = number of prerequisites each concept has
-    prereq_count = {cid: len(dependencies.get(cid, [])) for cid in concepts}
 
-    # Start with foundational concepts (no prerequisites)
-    queue = deque([cid for cid in concepts if prereq_count[cid] == 0])
-    processed = []
-
-    while queue:
-        node = queue.popleft()
-        processed.append(node)
-
-        # Find all concepts that depend on this node (this node is their prerequisite)
-        for concept_id, prereqs in dependencies.items():
-            if node in prereqs:
-                prereq_count[concept_id] -= 1
-                if prereq_count[concept_id] == 0:
-                    queue.append(concept_id)
-
-    is_dag = len(processed) == len(concepts)
-    cycles = [] if is_dag else find_cycles(concepts, dependencies)
+    Pass a prebuilt `graph` to reuse its adjacency lists.
+    """
+    if graph is None:
+        graph = LearningGraph(concepts, dependencies)
+    is_dag = graph.is_dag()
+    cycles = [] if is_dag else graph.find_cycles()
 
     return is_dag, cycles
 
 
 def find_cycles(concepts: Dict[int, str],
                 dependencies: Dict[int, List[int]]) -> List[List[int]]:
-    """Find cycles in the graph using DFS."""
-    visited = set()
-    rec_stack = set()
-    cycles = []
-
-    def dfs(node, path):
-        visited.add(node)
-        rec_stack.add(node)
-        path.append(node)
-
-        # Check all nodes that this node depends on (reverse edges in dependency graph)
-        for next_node, prereqs in dependencies.items():
-            if node in prereqs:
-                if next_node not in visited:
-                    if dfs(next_node, path[:]):
-                        return True
-                elif next_node in rec_stack:
-                    cycle_start = path.index(next_node)
-                    cycles.append(path[cycle_start:] + [next_node])
-                    return True
-
-        rec_stack.remove(node)
-        return False
-
-    for node in concepts:
-        if node not in visited:
-            dfs(node, [])
-
-    return cycles
+    """Find cycles in the graph using Tarjan's strongly connected components."""
+    return LearningGraph(concepts, dependencies).find_cycles()
 
 
 def find_longest_chain(concepts: Dict[int, str],
-                       dependencies: Dict[int, List[int]]) -> Tuple[int, List[int]]:
-    """Find the longest dependency chain using DFS."""
-    memo = {}
-
-    def dfs(node):
-        if node in memo:
-            return memo[node]
-
-        if node not in dependencies or not dependencies[node]:
-            memo[node] = (1, [node])
-            return memo[node]
-
-        max_length = 0
-        max_path = []
-
-        for prereq in dependencies[node]:
-            length, path = dfs(prereq)
-            if length > max_length:
-                max_length = length
-                max_path = path
-
-        memo[node] = (max_length + 1, max_path + [node])
-        return memo[node]
-
-    max_chain_length = 0
-    max_chain_path = []
-
-    for concept_id in concepts:
-        length, path = dfs(concept_id)
-        if length > max_chain_length:
-            max_chain_length = length
-            max_chain_path = path
-
-    return max_chain_length, max_chain_path
+                       dependencies: Dict[int, List[int]],
+                       graph: LearningGraph = None) -> Tuple[int, List[int]]:
+    """Find the longest dependency chain over the topological order."""
+    if graph is None:
+        graph = LearningGraph(concepts, dependencies)
+    return graph.longest_chain()
 
 
 def find_connected_components(concepts: Dict[int, str],
-                               dependencies: Dict[int, List[int]]) -> List[Set[int]]:
+                               dependencies: Dict[int, List[int]],
+                               graph: LearningGraph = None) -> List[Set[int]]:
     """Find connected components (treating graph as undirected)."""
-    visited = set()
-    components = []
-
-    def bfs(start):
-        component = set()
-        queue = deque([start])
-        component.add(start)
-        visited.add(start)
-
-        while queue:
-            node = queue.popleft()
-
-            # Add all neighbors (both directions)
-            if node in dependencies:
-                for prereq in dependencies[node]:
-                    if prereq not in visited:
-                        visited.add(prereq)
-                        component.add(prereq)
-                        queue.append(prereq)
+    if graph is None:
+        graph = LearningGraph(concepts, dependencies)
+    return graph.connected_components()
 
-            for concept_id, prereqs in dependencies.items():
-                if node in prereqs and concept_id not in visited:
-                    visited.add(concept_id)
-                    component.add(concept_id)
-                    queue.append(concept_id)
 
-        return component
+def generate_report(csv_path: str, output_path: str, use_cache: bool = False,
+                    graph: LearningGraph = None):
+    """Generate comprehensive quality metrics report.
 
-    for concept_id in concepts:
-        if concept_id not in visited:
-            component = bfs(concept_id)
-            components.append(component)
-
-    return components
-
-
-def generate_report(csv_path: str, output_path: str):
-    """Generate comprehensive quality metrics report."""
-    concepts, dependencies = load_graph(csv_path)
+    With use_cache=True the metrics come from graph_cache.GraphCache, which
+    only recomputes the part of the graph touched by edited CSV rows.
+    Pass an already built `graph` to skip reading csv_path entirely.
+    """
+    if graph is not None:
+        concepts, dependencies = graph.concepts, graph.dependencies
+        indegree = graph.indegree()
+        outdegree = graph.outdegree()
+        is_dag, cycles = verify_dag(concepts, dependencies, graph)
+        max_chain_length, max_chain_path = find_longest_chain(concepts, dependencies, graph)
+        components = find_connected_components(concepts, dependencies, graph)
+    elif use_cache:
+        cache = GraphCache(csv_path).load()
+        print(cache.summary())
+        concepts, dependencies = cache.concepts_and_dependencies()
+        indegree = cache.indegree
+        outdegree = cache.outdegree
+        is_dag = cache.is_dag
+        cycles = [] if is_dag else LearningGraph(concepts, dependencies).find_cycles()
+        max_chain_length, max_chain_path = cache.longest_chain()
+        components = cache.components()
+    else:
+        concepts, dependencies = load_graph(csv_path)
+
+        # Build the adjacency lists once and share them across every analysis
+        graph = LearningGraph(concepts, dependencies)
+
+        # Calculate metrics
+        indegree = graph.indegree()
+        outdegree = graph.outdegree()
+        is_dag, cycles = verify_dag(concepts, dependencies, graph)
+        max_chain_length, max_chain_path = find_longest_chain(concepts, dependencies, graph)
+        components = find_connected_components(concepts, dependencies, graph)
 
-    # Calculate metrics
-    indegree = calculate_indegree(concepts, dependencies)
-    outdegree = calculate_outdegree(concepts, dependencies)
     terminal = find_terminal_nodes(concepts, indegree, dependencies)
     orphaned = find_orphaned_nodes(concepts, indegree, dependencies)
-    is_dag, cycles = verify_dag(concepts, dependencies)
-    max_chain_length, max_chain_path = find_longest_chain(concepts, dependencies)
-    components = find_connected_components(concepts, dependencies)
 
     # Foundational concepts (no prerequisites but other concepts depend on them)
     foundational = [(cid, label) for cid, label in concepts.items()
@@ -367,13 +278,17 @@ if __name__ == "__main__":
     import sys
 
     # Parse command line arguments
-    if len(sys.argv) < 3:
-        print("Usage: python analyze-graph.py <input_csv> <output_report.md>")
+    use_cache = '--cache' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--cache']
+    if len(args) < 2:
+        print("Usage: python analyze-graph.py <input_csv> <output_report.md> [--cache]")
         print("\nExample:")
         print("  python analyze-graph.py learning-graph.csv quality-metrics.md")
+        print("  python analyze-graph.py learning-graph.csv quality-metrics.md --cache")
+        print("\n--cache keeps metrics in learning-graph.cache.json and only recomputes edited rows")
         sys.exit(1)
 
-    csv_path = sys.argv[1]
-    output_path = sys.argv[2]
+    csv_path = args[0]
+    output_path = args[1]
 
-    generate_report(csv_path, output_path)
+    generate_report(csv_path, output_path, use_cache)
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Batch Learning Graph Analysis
+
+Runs the analyze-graph.py and taxonomy-distribution.py reports for many
+learning-graph.csv files at once, spreading the graphs across a process
+pool so nightly checks of all of our textbook repos scale with the number
+of cores.
+
+For every graph it writes <name>-quality-metrics.md and
+<name>-taxonomy-distribution.md into the output directory, where <name> is
+the repository folder the CSV lives in. It then writes batch-summary.md with
+one row per course (concept count, edges, max chain length, orphan rate, ...).
+
+Usage: python batch-analyze.py <csv_or_glob> [<csv_or_glob> ...] [--output DIR] [--workers N]
+
+Example:
+    python batch-analyze.py "~/projects/*/docs/learning-graph/learning-graph.csv" --output reports
+"""
+
+import csv
+import glob
+import importlib.util
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+# Folder names that never identify a course
+GENERIC_DIRS = {'learning-graph', 'docs', 'data', 'src'}
+
+_modules = {}
+
+
+def load_script(name: str):
+    """Import a hyphenated learning graph script once per worker process."""
+    if name not in _modules:
+        if str(SCRIPT_DIR) not in sys.path:
+            sys.path.insert(0, str(SCRIPT_DIR))
+        spec = importlib.util.spec_from_file_location(name.replace('-', '_'),
+                                                      SCRIPT_DIR / f"{name}.py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _modules[name] = module
+    return _modules[name]
+
+
+def expand_inputs(patterns):
+    """Expand globs and ~ into a sorted, de-duplicated list of CSV paths."""
+    paths = []
+    for pattern in patterns:
+        matches = glob.glob(os.path.expanduser(pattern), recursive=True) or [pattern]
+        paths.extend(str(Path(p).resolve()) for p in sorted(matches))
+    return list(dict.fromkeys(paths))
+
+
+def course_name(csv_path: str) -> str:
+    """Name a graph after the first non-generic folder above its CSV."""
+    for parent in Path(csv_path).parents:
+        if parent.name and parent.name not in GENERIC_DIRS:
+            return parent.name
+    return Path(csv_path).stem
+
+
+def analyze_one(csv_path: str, name: str, output_dir: str) -> dict:
+    """Write both reports for one graph and return its summary row."""
+    from learning_graph import LearningGraph
+
+    analyze_graph = load_script('analyze-graph')
+    taxonomy_distribution = load_script('taxonomy-distribution')
+    start = time.perf_counter()
+
+    # Parse the CSV once for both reports
+    concepts = {}
+    dependencies = {}
+    taxonomy_rows = []
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            concept_id = int(row['ConceptID'])
+            label = row.get('ConceptLabel') or row.get('ConceptName', '')
+            concepts[concept_id] = label
+            if row['Dependencies']:
+                dependencies[concept_id] = [int(d) for d in row['Dependencies'].split('|')]
+            if row.get('TaxonomyID'):
+                taxonomy_rows.append((concept_id, label, row['TaxonomyID']))
+
+    graph = LearningGraph(concepts, dependencies)
+    with redirect_stdout(io.StringIO()):
+        is_dag, foundational, terminal, orphaned, max_chain = analyze_graph.generate_report(
+            csv_path, os.path.join(output_dir, f"{name}-quality-metrics.md"), graph=graph)
+        if taxonomy_rows:
+            taxonomy_distribution.analyze_taxonomy_distribution(
+                csv_path, os.path.join(output_dir, f"{name}-taxonomy-distribution.md"),
+                rows=taxonomy_rows)
+
+    count = len(concepts)
+    return {
+        'name': name,
+        'path': csv_path,
+        'concepts': count,
+        'edges': graph.edge_count(),
+        'taxonomies': len({tax for _, _, tax in taxonomy_rows}),
+        'max_chain': max_chain,
+        'orphans': orphaned,
+        'orphan_rate': orphaned / count * 100 if count else 0,
+        'terminal_rate': terminal / count * 100 if count else 0,
+        'components': len(graph.connected_components()),
+        'is_dag': is_dag,
+        'seconds': time.perf_counter() - start,
+    }
+
+
+def write_summary(results, summary_path: str):
+    """Write the cross-course summary table."""
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        f.write("# Learning Graph Batch Summary\n\n")
+        f.write(f"- **Graphs Analyzed**: {len(results)}\n")
+        f.write(f"- **Total Concepts**: {sum(r['concepts'] for r in results)}\n\n")
+        f.write("| Course | Concepts | Edges | Taxonomies | Max Chain | Orphans | Orphan Rate "
+                "| Terminal % | Components | DAG |\n")
+        f.write("|--------|----------|-------|------------|-----------|---------|-------------"
+                "|------------|------------|-----|\n")
+        for r in results:
+            f.write(f"| {r['name']} | {r['concepts']} | {r['edges']} | {r['taxonomies']} "
+                    f"| {r['max_chain']} | {r['orphans']} | {r['orphan_rate']:.1f}% "
+                    f"| {r['terminal_rate']:.1f}% | {r['components']} "
+                    f"| {'✅' if r['is_dag'] else '❌'} |\n")
+        f.write("\n---\n\n")
+        f.write("*Report generated by learning-graph-reports/batch-analyze.py*\n")
+
+
+def batch_analyze(csv_paths, output_dir: str, workers: int = None):
+    """Analyze every graph across a process pool and write the summary."""
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Give every graph a unique report prefix
+    names = {}
+    used = set()
+    for path in csv_paths:
+        name = base = course_name(path)
+        suffix = 2
+        while name in used:
+            name = f"{base}-{suffix}"
+            suffix += 1
+        names[path] = name
+        used.add(name)
+
+    results = {}
+    failures = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(analyze_one, path, names[path], output_dir): path
+                   for path in csv_paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                failures.append((path, e))
+                print(f"❌ {names[path]}: {e}")
+                continue
+            results[path] = result
+            print(f"✅ {result['name']}: {result['concepts']} concepts "
+                  f"({result['seconds'] * 1000:.0f} ms)")
+
+    ordered = [results[path] for path in csv_paths if path in results]
+    summary_path = os.path.join(output_dir, 'batch-summary.md')
+    write_summary(ordered, summary_path)
+
+    print(f"\n✅ Batch summary generated: {summary_path}")
+    print(f"   {len(ordered)} graphs analyzed, {len(failures)} failed, "
+          f"{time.perf_counter() - start:.2f} s total")
+    return ordered, failures
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    output_dir = 'batch-reports'
+    workers = None
+
+    if '--output' in args:
+        i = args.index('--output')
+        output_dir = args[i + 1]
+        del args[i:i + 2]
+    if '--workers' in args:
+        i = args.index('--workers')
+        workers = int(args[i + 1])
+        del args[i:i + 2]
+
+    if not args:
+        print("Usage: python batch-analyze.py <csv_or_glob> [<csv_or_glob> ...] [--output DIR] [--workers N]")
+        print("\nExample:")
+        print('  python batch-analyze.py "~/projects/*/docs/learning-graph/learning-graph.csv" --output reports')
+        sys.exit(1)
+
+    csv_paths = expand_inputs(args)
+    _, failures = batch_analyze(csv_paths, output_dir, workers)
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Learning Graph Analysis Benchmark
+
+Times each analysis in learning_graph.LearningGraph on synthetic DAGs so
+we can confirm they scale linearly with the size of the graph.
+
+Each synthetic concept depends on 0-3 randomly chosen earlier concepts,
+which is close to the shape of the real course graphs.
+
+Usage: python benchmark-graph.py [node_count ...]
+"""
+
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from learning_graph import LearningGraph
+
+
+def generate_graph(node_count: int, max_deps: int = 3,
+                   seed: int = 42) -> Tuple[Dict[int, str], Dict[int, List[int]]]:
+    """Generate a random DAG with node_count concepts."""
+    rng = random.Random(seed)
+    concepts = {}
+    dependencies = defaultdict(list)
+
+    for concept_id in range(1, node_count + 1):
+        concepts[concept_id] = f"Concept {concept_id}"
+        if concept_id > 1:
+            dep_count = rng.randint(0, max_deps)
+            deps = {rng.randint(max(1, concept_id - 500), concept_id - 1)
+                    for _ in range(dep_count)}
+            if deps:
+                dependencies[concept_id] = sorted(deps)
+
+    return concepts, dependencies
+
+
+def time_call(func, *args):
+    """Return (seconds, result) for a single call."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def benchmark(node_count: int):
+    """Run every analysis on one synthetic graph and print the timings."""
+    concepts, dependencies = generate_graph(node_count)
+
+    build_time, graph = time_call(LearningGraph, concepts, dependencies)
+    timings = [
+        ('build adjacency', build_time),
+        ('indegree', time_call(graph.indegree)[0]),
+        ('outdegree', time_call(graph.outdegree)[0]),
+        ('toposort (Kahn)', time_call(graph.topological_order)[0]),
+        ('SCC (Tarjan)', time_call(graph.strongly_connected_components)[0]),
+        ('components (union-find)', time_call(graph.connected_components)[0]),
+        ('longest chain', time_call(graph.longest_chain)[0]),
+    ]
+
+    print(f"\n{node_count:,} concepts, {graph.edge_count():,} edges")
+    print(f"  {'Analysis':<26} {'Time (ms)':>10}")
+    for name, seconds in timings:
+        print(f"  {name:<26} {seconds * 1000:10.1f}")
+    print(f"  {'total':<26} {sum(t for _, t in timings) * 1000:10.1f}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+    for size in sizes:
+        benchmark(size)
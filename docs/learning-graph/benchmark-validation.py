@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Learning Graph Validation Benchmark
+
+Compares plain jsonschema.validate() with the CompiledValidator used by
+validate-learning-graph.py --fast on a generated graph (50,000 concepts
+by default).
+
+Usage: python benchmark-validation.py [node_count]
+"""
+
+import importlib.util
+import json
+import random
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SCHEMA_PATH = SCRIPT_DIR / 'learning-graph-schema.json'
+
+
+def load_validator_module():
+    """Import validate-learning-graph.py (hyphenated name) as a module."""
+    spec = importlib.util.spec_from_file_location('validate_learning_graph',
+                                                  SCRIPT_DIR / 'validate-learning-graph.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def generate_document(node_count: int, seed: int = 42) -> dict:
+    """Generate a schema-valid learning graph document."""
+    rng = random.Random(seed)
+    taxonomies = ['FOUND', 'CORE', 'ADV', 'APPL', 'SPEC', 'MISC']
+    nodes = []
+    edges = []
+    for concept_id in range(1, node_count + 1):
+        node = {'id': concept_id, 'label': f"Concept {concept_id}",
+                'group': rng.choice(taxonomies)}
+        if concept_id == 1:
+            node['shape'] = 'box'
+        nodes.append(node)
+        for _ in range(rng.randint(1, 3) if concept_id > 1 else 0):
+            edges.append({'from': concept_id, 'to': rng.randint(1, concept_id - 1)})
+
+    return {
+        'metadata': {'title': 'Benchmark Graph', 'version': '1.0'},
+        'groups': {tax: {'classifierName': tax.title(), 'color': {'color': 'steelblue'}}
+                   for tax in taxonomies},
+        'nodes': nodes,
+        'edges': edges,
+    }
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    import sys
+
+    import jsonschema
+
+    node_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    module = load_validator_module()
+    schema = json.loads(SCHEMA_PATH.read_text())
+    document = generate_document(node_count)
+    print(f"{node_count:,} nodes, {len(document['edges']):,} edges")
+
+    rows = []
+    rows.append(('jsonschema.validate (first error only)',
+                 timed(jsonschema.validate, document, schema)[0]))
+
+    compile_time, compiled = timed(module.CompiledValidator, schema)
+    rows.append(('compile schema (with meta-schema check)', compile_time))
+    rows.append(('compile schema (check cached)',
+                 timed(module.CompiledValidator, schema, True)[0]))
+    rows.append(('compiled validator, all errors',
+                 timed(lambda: list(compiled.iter_errors(document)))[0]))
+
+    # One invalid node per 1,000 to show the cost of collecting every error
+    for node in document['nodes'][::1000]:
+        node['group'] = 'lowercase'
+    error_time, errors = timed(lambda: list(compiled.iter_errors(document)))
+    rows.append((f"compiled validator, {len(errors)} errors", error_time))
+
+    print(f"\n  {'Step':<42} {'Time (ms)':>10}")
+    for name, seconds in rows:
+        print(f"  {name:<42} {seconds * 1000:10.1f}")
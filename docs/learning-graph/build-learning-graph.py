@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Single-Pass Learning Graph Pipeline
+
+Runs the whole learning graph toolchain in one process:
+
+    add-taxonomy.py (optional) → csv-to-json.py → validate-learning-graph.py
+    → analyze-graph.py → taxonomy-distribution.py
+
+The CSV is parsed once and the in-memory rows are handed to every stage,
+the schema is compiled once (see validate-learning-graph.py --fast), and
+the vis.js JSON is validated straight from memory instead of being read
+back from disk.
+
+Outputs (written next to the input CSV):
+- learning-graph.json
+- quality-metrics.md
+- taxonomy-distribution.md
+
+The optional color-config.json, metadata.json and taxonomy-names.json
+files are picked up automatically when they sit next to the CSV.
+
+Usage: python build-learning-graph.py [learning-graph.csv] [taxonomy_config.json]
+
+If a taxonomy_config.json (the add-taxonomy.py format) is given, TaxonomyID
+values are reassigned in memory and written back to the CSV first.
+"""
+
+import importlib.util
+import json
+import sys
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+
+def load_script(name: str):
+    """Import one of the hyphenated learning graph scripts as a module."""
+    spec = importlib.util.spec_from_file_location(name.replace('-', '_'),
+                                                  SCRIPT_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_optional_json(path: Path):
+    """Load a JSON config file if it exists, otherwise return None."""
+    if not path.exists():
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        print(f"📋 Loaded {path.name}")
+        return json.load(f)
+
+
+def build_learning_graph(csv_path: str, taxonomy_config: dict = None):
+    """
+    Run every learning graph stage on a single parse of the CSV.
+
+    Args:
+        csv_path: Path to learning-graph.csv
+        taxonomy_config: Optional add-taxonomy.py configuration. When given,
+                         TaxonomyIDs are reassigned and the CSV is rewritten.
+
+    Returns:
+        List of (stage name, seconds) timings
+    """
+    sys.path.insert(0, str(SCRIPT_DIR))
+    from learning_graph import LearningGraph
+
+    csv_to_json = load_script('csv-to-json')
+    validator_module = load_script('validate-learning-graph')
+    analyze_graph = load_script('analyze-graph')
+    taxonomy_distribution = load_script('taxonomy-distribution')
+
+    out_dir = Path(csv_path).resolve().parent
+    json_path = out_dir / 'learning-graph.json'
+    schema_path = SCRIPT_DIR / 'learning-graph-schema.json'
+
+    timings = []
+
+    def timed(stage, func, *args, **kwargs):
+        start = time.perf_counter()
+        result = func(*args, **kwargs)
+        timings.append((stage, time.perf_counter() - start))
+        return result
+
+    color_config = load_optional_json(out_dir / 'color-config.json')
+    metadata = load_optional_json(out_dir / 'metadata.json')
+    taxonomy_names = load_optional_json(out_dir / 'taxonomy-names.json')
+
+    # 1. Parse the CSV once
+    rows = timed('parse csv', lambda: list(csv_to_json.read_concepts(csv_path)))
+
+    # 2. Optionally reassign taxonomy IDs and save them back to the CSV
+    if taxonomy_config is not None:
+        add_taxonomy = load_script('add-taxonomy')
+
+        def assign_taxonomies():
+            updated = []
+            for concept_id, label, _, prereq_ids in rows:
+                tax = add_taxonomy.assign_taxonomy(concept_id, label, taxonomy_config)
+                updated.append((concept_id, label, tax, prereq_ids))
+            add_taxonomy.write_csv([{
+                'ConceptID': concept_id,
+                'ConceptLabel': label,
+                'Dependencies': '|'.join(str(p) for p in prereq_ids),
+                'TaxonomyID': tax,
+            } for concept_id, label, tax, prereq_ids in updated], csv_path)
+            return updated
+
+        rows = timed('add taxonomy', assign_taxonomies)
+
+    # 3. vis.js JSON
+    graph_data = timed('csv to json', csv_to_json.csv_to_json, csv_path, str(json_path),
+                       color_config, metadata, taxonomy_names, rows=rows)
+
+    # 4. Schema validation from memory with the compiled validator
+    compiled = timed('compile schema', validator_module.CompiledValidator.from_file, schema_path)
+    valid = timed('validate', validator_module.validate_learning_graph_fast,
+                  str(json_path), str(schema_path), data=graph_data, compiled=compiled)
+
+    # 5. Quality metrics from the shared adjacency lists
+    concepts = {concept_id: label for concept_id, label, _, _ in rows}
+    dependencies = {concept_id: prereq_ids for concept_id, _, _, prereq_ids in rows
+                    if prereq_ids}
+    graph = timed('build graph', LearningGraph, concepts, dependencies)
+    timed('quality metrics', analyze_graph.generate_report, csv_path,
+          str(out_dir / 'quality-metrics.md'), graph=graph)
+
+    # 6. Taxonomy distribution
+    timed('taxonomy distribution', taxonomy_distribution.analyze_taxonomy_distribution,
+          csv_path, str(out_dir / 'taxonomy-distribution.md'), taxonomy_names,
+          rows=[(concept_id, label, tax) for concept_id, label, tax, _ in rows])
+
+    print("\n## Pipeline Timings\n")
+    print(f"| {'Stage':<22} | {'Time (ms)':>10} |")
+    print(f"|{'-' * 24}|{'-' * 12}|")
+    for stage, seconds in timings:
+        print(f"| {stage:<22} | {seconds * 1000:10.1f} |")
+    print(f"| {'total':<22} | {sum(t for _, t in timings) * 1000:10.1f} |")
+
+    if not valid:
+        print("\n⚠️  learning-graph.json did not pass schema validation (see above)")
+
+    return timings
+
+
+if __name__ == "__main__":
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else str(SCRIPT_DIR / 'learning-graph.csv')
+
+    taxonomy_config = None
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], 'r', encoding='utf-8') as f:
+            taxonomy_config = json.load(f)
+        print(f"📋 Loaded taxonomy config from: {sys.argv[2]}")
+
+    build_learning_graph(csv_path, taxonomy_config)
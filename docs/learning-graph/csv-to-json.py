@@ -7,30 +7,62 @@ used by the existing graph viewer (vis.js network format).
 IMPORTANT: For custom taxonomies, provide taxonomy-names.json to ensure
 human-readable classifierName values in the output. Without this file,
 taxonomy IDs will be used as fallback (which is usually wrong).
+
+With --layout=hierarchical or --layout=force, fixed x/y positions are
+computed offline with NumPy (see graph_layout.py) and written into every
+node so the graph viewer can skip its physics simulation.
 """
 
-VERSION = "0.04"
+VERSION = "0.06"
 
 import csv
 import json
+from collections.abc import Iterator
 from typing import Dict, List
 from datetime import datetime
 
 
-def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
-                metadata: dict = None, taxonomy_names: dict = None):
+def read_concepts(csv_path: str, use_cache: bool = False):
     """
-    Convert CSV dependency graph to vis.js JSON format with metadata and groups.
+    Yield (concept_id, label, taxonomy_id, prerequisite_ids) for each CSV row.
+
+    With use_cache=True the rows come from graph_cache.GraphCache so only
+    rows edited since the last run are parsed again.
+    """
+    if use_cache:
+        from graph_cache import GraphCache
+
+        cache = GraphCache(csv_path).load()
+        print(cache.summary())
+        for concept_id in cache.order:
+            row = cache.rows[concept_id]
+            yield concept_id, row['label'], row['taxonomy'], row['deps']
+        return
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            concept_id = int(row['ConceptID'])
+            # Support both ConceptLabel and ConceptName column names
+            label = row.get('ConceptLabel') or row.get('ConceptName', '')
+            dependencies_str = row['Dependencies']
+            prereq_ids = [int(pid) for pid in dependencies_str.split('|')] if dependencies_str else []
+            yield concept_id, label, row['TaxonomyID'], prereq_ids
+
+
+def build_graph_header(node_count: int, used_taxonomies, color_config: dict = None,
+                       metadata: dict = None, taxonomy_names: dict = None):
+    """
+    Build the metadata and groups sections of the vis.js JSON.
 
     Args:
-        csv_path: Path to input CSV file with columns: ConceptID, ConceptLabel, Dependencies, TaxonomyID
-        json_path: Path to output JSON file
-        color_config: Optional dictionary mapping taxonomy IDs to colors.
-                     If not provided, uses default color scheme.
-        metadata: Optional dictionary with metadata fields (title, description, creator, etc.)
-                 If not provided, creates minimal metadata.
-        taxonomy_names: Dictionary mapping taxonomy IDs to human-readable names.
-                       STRONGLY RECOMMENDED for custom taxonomies.
+        node_count: Number of concepts in the graph
+        used_taxonomies: Iterable of the TaxonomyID of every concept
+        color_config, metadata, taxonomy_names: See csv_to_json()
+
+    Returns:
+        (metadata, groups, missing_names) where missing_names lists the
+        taxonomy IDs that have no human-readable classifier name
     """
     # Default 24-color palette designed for distinct, accessible category coloring.
     # Hues progress through subject-family groupings (cool blues for foundations,
@@ -118,52 +150,11 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
     if taxonomy_names:
         all_taxonomy_names.update(taxonomy_names)
 
-    # Read CSV
-    nodes = []
-    edges = []
-    foundational_ids = []
-
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            concept_id = int(row['ConceptID'])
-            # Support both ConceptLabel and ConceptName column names
-            label = row.get('ConceptLabel') or row.get('ConceptName', '')
-            taxonomy = row['TaxonomyID']
-            dependencies_str = row['Dependencies']
-
-            # Determine if foundational (no dependencies)
-            is_foundational = (dependencies_str == '')
-            if is_foundational:
-                foundational_ids.append(concept_id)
-
-            # Create node - use taxonomy ID directly as group reference
-            node = {
-                'id': concept_id,
-                'label': label,
-                'group': taxonomy
-            }
-
-            # Special styling for foundational concepts
-            if is_foundational:
-                node['shape'] = 'box'
-
-            nodes.append(node)
-
-            # Create edges (from concept to its prerequisites)
-            if dependencies_str:
-                prereq_ids = [int(pid) for pid in dependencies_str.split('|')]
-                for prereq_id in prereq_ids:
-                    edge = {
-                        'from': concept_id,
-                        'to': prereq_id
-                    }
-                    edges.append(edge)
 
     # Create metadata section
     default_metadata = {
         'title': 'Learning Graph',
-        'description': f'Learning graph with {len(nodes)} concepts generated from CSV',
+        'description': f'Learning graph with {node_count} concepts generated from CSV',
         'creator': 'CSV to JSON Converter',
         'date': datetime.now().strftime('%Y-%m-%d'),
         'version': '1.0',
@@ -179,8 +170,8 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
     # Create groups section from taxonomy colors
     groups = {}
 
-    # Determine which taxonomy IDs are actually used
-    used_taxonomies = set(node['group'] for node in nodes)
+    # Determine which taxonomy IDs are actually used (in order of first use)
+    used_taxonomies = dict.fromkeys(used_taxonomies)
 
     # Track taxonomies with missing human-readable names
     missing_names = []
@@ -237,6 +228,75 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
                 }
             }
 
+    return default_metadata, groups, missing_names
+
+
+def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
+                metadata: dict = None, taxonomy_names: dict = None,
+                use_cache: bool = False, rows=None, layout: str = None):
+    """
+    Convert CSV dependency graph to vis.js JSON format with metadata and groups.
+
+    Args:
+        csv_path: Path to input CSV file with columns: ConceptID, ConceptLabel, Dependencies, TaxonomyID
+        json_path: Path to output JSON file
+        color_config: Optional dictionary mapping taxonomy IDs to colors.
+                     If not provided, uses default color scheme.
+        metadata: Optional dictionary with metadata fields (title, description, creator, etc.)
+                 If not provided, creates minimal metadata.
+        taxonomy_names: Dictionary mapping taxonomy IDs to human-readable names.
+                       STRONGLY RECOMMENDED for custom taxonomies.
+        use_cache: Reuse parsed rows from the graph_cache.GraphCache file
+                   instead of re-parsing every CSV row.
+        rows: Optional already parsed rows in the read_concepts() format.
+              When given, csv_path is not read.
+        layout: Optional graph_layout.py method ('hierarchical' or 'force').
+                When given, every node gets fixed 'x' and 'y' positions.
+    """
+    # Read CSV
+    nodes = []
+    edges = []
+    foundational_ids = []
+
+    if rows is None:
+        rows = read_concepts(csv_path, use_cache)
+
+    for concept_id, label, taxonomy, prereq_ids in rows:
+        # Determine if foundational (no dependencies)
+        is_foundational = not prereq_ids
+        if is_foundational:
+            foundational_ids.append(concept_id)
+
+        # Create node - use taxonomy ID directly as group reference
+        node = {
+            'id': concept_id,
+            'label': label,
+            'group': taxonomy
+        }
+
+        # Special styling for foundational concepts
+        if is_foundational:
+            node['shape'] = 'box'
+
+        nodes.append(node)
+
+        # Create edges (from concept to its prerequisites)
+        for prereq_id in prereq_ids:
+            edge = {
+                'from': concept_id,
+                'to': prereq_id
+            }
+            edges.append(edge)
+
+    if layout:
+        from graph_layout import apply_layout
+        apply_layout(nodes, edges, layout)
+
+    # Create metadata and groups sections
+    default_metadata, groups, missing_names = build_graph_header(
+        len(nodes), (node['group'] for node in nodes),
+        color_config, metadata, taxonomy_names)
+
     # Create final JSON structure
     graph_data = {
         'metadata': default_metadata,
@@ -249,13 +309,159 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
     with open(json_path, 'w', encoding='utf-8') as f:
         json.dump(graph_data, f, indent=2)
 
+    print_summary(csv_path, json_path, default_metadata, groups, len(nodes), len(edges),
+                  len(foundational_ids), missing_names, foundational_ids)
+
+    return graph_data
+
+
+# Short keys used by the compact output. The reverse mapping is written into
+# the file as "keyMap" so the graph viewer can expand them to vis.js names.
+COMPACT_KEYS = {
+    'id': 'i',
+    'label': 'l',
+    'group': 'g',
+    'shape': 's',
+    'from': 'f',
+    'to': 't',
+}
+
+
+def iter_json_object(fields, indent: int = None):
+    """
+    Yield the text of a JSON object piece by piece.
+
+    Args:
+        fields: List of (key, value) pairs. A value that is a generator is
+                written as a JSON array one item at a time, so the array is
+                never held in memory. Other values are written with json.dumps.
+        indent: Same as json.dump(). None writes compact JSON without spaces.
+
+    With indent=2 the text is identical to json.dump(..., indent=2).
+    """
+    if indent is None:
+        newline, pad, item_pad = '', '', ''
+        separators = (',', ':')
+    else:
+        newline, pad, item_pad = '\n', ' ' * indent, ' ' * (2 * indent)
+        separators = (',', ': ')
+
+    def dump(value, prefix):
+        text = json.dumps(value, indent=indent, separators=separators)
+        return text.replace('\n', '\n' + prefix) if indent is not None else text
+
+    yield '{'
+    for i, (key, value) in enumerate(fields):
+        yield (',' if i else '') + newline + pad + json.dumps(key) + separators[1]
+        if not isinstance(value, Iterator):
+            yield dump(value, pad)
+            continue
+
+        yield '['
+        empty = True
+        for item in value:
+            yield ('' if empty else ',') + newline + item_pad + dump(item, item_pad)
+            empty = False
+        yield ']' if empty else newline + pad + ']'
+    yield newline + '}'
+
+
+def stream_csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
+                       metadata: dict = None, taxonomy_names: dict = None,
+                       compact: bool = False, layout: str = None):
+    """
+    Convert CSV dependency graph to vis.js JSON without building the node
+    and edge lists in memory.
+
+    The CSV is read three times: once to count concepts and collect the
+    taxonomy IDs for the metadata and groups sections, then once each to
+    write nodes and edges straight to the output file. Peak memory does not
+    grow with the number of concepts.
+
+    Args:
+        csv_path, json_path, color_config, metadata, taxonomy_names: See csv_to_json()
+        compact: Write without indentation and with the short COMPACT_KEYS
+                 key names to shrink the file the graph viewer downloads.
+        layout: Optional graph_layout.py method. Needs one extra pass that
+                keeps the edge list and two integers per node in memory.
+
+    Returns:
+        (metadata, groups) sections that were written
+    """
+    node_count = 0
+    edge_count = 0
+    foundational_count = 0
+    used_taxonomies = {}
+
+    for concept_id, label, taxonomy, prereq_ids in read_concepts(csv_path):
+        node_count += 1
+        edge_count += len(prereq_ids)
+        if not prereq_ids:
+            foundational_count += 1
+        used_taxonomies.setdefault(taxonomy)
+
+    default_metadata, groups, missing_names = build_graph_header(
+        node_count, used_taxonomies, color_config, metadata, taxonomy_names)
+
+    keys = COMPACT_KEYS if compact else {key: key for key in COMPACT_KEYS}
+
+    positions = {}
+    if layout:
+        from graph_layout import apply_layout
+        layout_nodes = []
+        layout_edges = []
+        for concept_id, _, taxonomy, prereq_ids in read_concepts(csv_path):
+            layout_nodes.append({'id': concept_id, 'group': taxonomy})
+            layout_edges.extend({'from': concept_id, 'to': p} for p in prereq_ids)
+        positions = apply_layout(layout_nodes, layout_edges, layout)
+        del layout_nodes, layout_edges
+
+    def iter_nodes():
+        for concept_id, label, taxonomy, prereq_ids in read_concepts(csv_path):
+            node = {keys['id']: concept_id, keys['label']: label, keys['group']: taxonomy}
+            if not prereq_ids:
+                node[keys['shape']] = 'box'
+            if concept_id in positions:
+                node['x'], node['y'] = positions[concept_id]
+            yield node
+
+    def iter_edges():
+        for concept_id, _, _, prereq_ids in read_concepts(csv_path):
+            for prereq_id in prereq_ids:
+                yield {keys['from']: concept_id, keys['to']: prereq_id}
+
+    fields = []
+    if compact:
+        fields.append(('keyMap', {short: key for key, short in COMPACT_KEYS.items()}))
+    fields += [
+        ('metadata', default_metadata),
+        ('groups', groups),
+        ('nodes', iter_nodes()),
+        ('edges', iter_edges()),
+    ]
+
+    with open(json_path, 'w', encoding='utf-8') as f:
+        for chunk in iter_json_object(fields, indent=None if compact else 2):
+            f.write(chunk)
+
+    print_summary(csv_path, json_path, default_metadata, groups, node_count, edge_count,
+                  foundational_count, missing_names)
+
+    return default_metadata, groups
+
+
+def print_summary(csv_path: str, json_path: str, graph_metadata: dict, groups: dict,
+                  node_count: int, edge_count: int, foundational_count: int,
+                  missing_names: List[str], foundational_ids: List[int] = None):
+    """Print what was written and warn about taxonomies without readable names."""
     print(f"✅ JSON graph created: {json_path} (csv-to-json v{VERSION})")
-    print(f"   - Title: {default_metadata['title']}")
+    print(f"   - Title: {graph_metadata['title']}")
     print(f"   - {len(groups)} groups/taxonomies")
-    print(f"   - {len(nodes)} nodes")
-    print(f"   - {len(edges)} edges")
-    print(f"   - {len(foundational_ids)} foundational concepts")
-    print(f"\nFoundational concept IDs: {foundational_ids}")
+    print(f"   - {node_count} nodes")
+    print(f"   - {edge_count} edges")
+    print(f"   - {foundational_count} foundational concepts")
+    if foundational_ids is not None:
+        print(f"\nFoundational concept IDs: {foundational_ids}")
     print(f"Groups: {list(groups.keys())}")
 
     # IMPORTANT: Warn about missing human-readable names
@@ -270,8 +476,6 @@ def csv_to_json(csv_path: str, json_path: str, color_config: dict = None,
         print(f"   }}")
         print(f"\n   Then run: python csv-to-json.py {csv_path} {json_path} [colors.json] [metadata.json] taxonomy-names.json")
 
-    return graph_data
-
 
 def create_taxonomy_legend(groups: dict = None):
     """
@@ -298,13 +502,27 @@ if __name__ == "__main__":
     import sys
 
     # Parse command line arguments
-    if len(sys.argv) < 3:
+    flags = {'--cache', '--stream', '--compact'}
+    use_cache = '--cache' in sys.argv
+    compact = '--compact' in sys.argv
+    stream = compact or '--stream' in sys.argv
+    layout = None
+    for arg in sys.argv[1:]:
+        if arg.startswith('--layout'):
+            layout = arg.partition('=')[2] or 'hierarchical'
+    args = [arg for arg in sys.argv[1:] if arg not in flags and not arg.startswith('--layout')]
+    if len(args) < 2:
         print(f"csv-to-json.py v{VERSION}")
-        print("\nUsage: python csv-to-json.py <input_csv> <output_json> [color_config.json] [metadata.json] [taxonomy_names.json]")
+        print("\nUsage: python csv-to-json.py <input_csv> <output_json> [color_config.json] [metadata.json] [taxonomy_names.json] [--cache] [--stream] [--compact] [--layout[=hierarchical|force]]")
         print("Looking for CSV column names: ConceptID, ConceptLabel, Dependencies, TaxonomyID")
         print("\nExample:")
         print("   python csv-to-json.py learning-graph.csv learning-graph.json")
         print("   python csv-to-json.py learning-graph.csv learning-graph.json color-config.json metadata.json taxonomy-names.json")
+        print("\n--cache reuses rows parsed on earlier runs (stored in learning-graph.cache.json)")
+        print("--stream writes nodes and edges as they are read (constant memory for huge graphs)")
+        print("--compact implies --stream and writes minified JSON with short keys")
+        print("   (--cache cannot be combined with --stream or --compact)")
+        print("--layout precomputes fixed node positions (needs numpy) so the viewer skips physics")
         print("\nOptional color_config.json format:")
         print(json.dumps({
             'FOUND': 'MistyRose',
@@ -326,13 +544,18 @@ if __name__ == "__main__":
         }, indent=2))
         sys.exit(1)
 
-    csv_path = sys.argv[1]
-    json_path = sys.argv[2]
+    if stream and use_cache:
+        # The cache holds every parsed row in memory, which is what streaming avoids
+        print("❌ --cache cannot be combined with --stream or --compact")
+        sys.exit(1)
+
+    csv_path = args[0]
+    json_path = args[1]
 
     # Load color config if provided
     color_config = None
-    if len(sys.argv) > 3:
-        config_file = sys.argv[3]
+    if len(args) > 2:
+        config_file = args[2]
         try:
             with open(config_file, 'r', encoding='utf-8') as f:
                 color_config = json.load(f)
@@ -342,8 +565,8 @@ if __name__ == "__main__":
 
     # Load metadata config if provided
     metadata = None
-    if len(sys.argv) > 4:
-        metadata_file = sys.argv[4]
+    if len(args) > 3:
+        metadata_file = args[3]
         try:
             with open(metadata_file, 'r', encoding='utf-8') as f:
                 metadata = json.load(f)
@@ -353,8 +576,8 @@ if __name__ == "__main__":
 
     # Load taxonomy names if provided (STRONGLY RECOMMENDED)
     taxonomy_names = None
-    if len(sys.argv) > 5:
-        names_file = sys.argv[5]
+    if len(args) > 4:
+        names_file = args[4]
         try:
             with open(names_file, 'r', encoding='utf-8') as f:
                 taxonomy_names = json.load(f)
@@ -363,8 +586,14 @@ if __name__ == "__main__":
             print(f"⚠️  Taxonomy names file not found: {names_file}")
             print(f"   This may result in taxonomy IDs being used as display names.")
 
-    graph_data = csv_to_json(csv_path, json_path, color_config, metadata, taxonomy_names)
-    create_taxonomy_legend(graph_data['groups'])
+    if stream:
+        _, groups = stream_csv_to_json(csv_path, json_path, color_config, metadata,
+                                       taxonomy_names, compact, layout)
+    else:
+        graph_data = csv_to_json(csv_path, json_path, color_config, metadata, taxonomy_names, use_cache,
+                                 layout=layout)
+        groups = graph_data['groups']
+    create_taxonomy_legend(groups)
 
     print("\n✅ CSV to JSON format complete. Ready to use with graph-viewer!")
     print(f"   Validate with: ./validate-learning-graph.sh {json_path}")
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Incremental Learning Graph Cache
+
+Keeps the parsed learning-graph.csv and its metrics in a JSON file next to
+the CSV (learning-graph.csv -> learning-graph.cache.json) so the report
+scripts do not recompute everything after a one-row edit.
+
+Each CSV row is keyed by a hash of its content. On the next run only rows
+whose hash changed are re-parsed, and only the affected part of the graph
+is updated:
+
+- indegree/outdegree of the changed rows and their prerequisites
+- chain depths of the changed concepts and everything that depends on them
+- connected component IDs of the components the changed rows touch
+
+A full rebuild happens when there is no cache yet, the cache format
+changed, or the previous graph contained a cycle.
+
+Used by analyze-graph.py, taxonomy-distribution.py and csv-to-json.py
+when they are run with --cache.
+"""
+
+import csv
+import hashlib
+import json
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from learning_graph import LearningGraph
+
+CACHE_VERSION = 1
+
+
+def default_cache_path(csv_path: str) -> str:
+    """learning-graph.csv -> learning-graph.cache.json"""
+    return str(Path(csv_path).with_suffix('.cache.json'))
+
+
+def row_hash(row: List[str]) -> str:
+    """Content hash of one CSV row."""
+    return hashlib.sha1('\x1f'.join(row).encode('utf-8')).hexdigest()[:16]
+
+
+class GraphCache:
+    """Parsed learning graph and metrics persisted between runs.
+
+    Args:
+        csv_path: Path to the learning graph CSV file
+        cache_path: Path to the cache file. Defaults to <csv name>.cache.json
+
+    After load() the following are available:
+        order: concept IDs in CSV order
+        rows: concept ID -> {'hash', 'label', 'deps', 'taxonomy'}
+        dependents: concept ID -> list of concepts that depend on it
+        indegree, outdegree: concept ID -> int
+        depth: concept ID -> length of the longest chain ending at the concept
+        previous: concept ID -> prerequisite on that chain (None at the start)
+        component: concept ID -> connected component ID
+        is_dag: False if the graph contains a cycle
+        stats: counts of unchanged, changed and recomputed concepts
+    """
+
+    def __init__(self, csv_path: str, cache_path: str = None):
+        self.csv_path = csv_path
+        self.cache_path = cache_path or default_cache_path(csv_path)
+        self.order = []
+        self.rows = {}
+        self.dependents = {}
+        self.indegree = {}
+        self.outdegree = {}
+        self.depth = {}
+        self.previous = {}
+        self.component = {}
+        self.next_component = 0
+        self.is_dag = True
+        self.stats = {}
+
+    def load(self) -> 'GraphCache':
+        """Read the CSV, bring the cached metrics up to date and save them."""
+        cached = self._read_cache()
+        old_rows = cached['rows'] if cached else {}
+
+        new_rows = {}
+        order = []
+        seen_ids = set()
+        reused = 0
+        with open(self.csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            columns = {name: i for i, name in enumerate(header)}
+            label_col = columns.get('ConceptLabel', columns.get('ConceptName'))
+            tax_col = columns.get('TaxonomyID')
+            for raw in reader:
+                if not raw:
+                    continue
+                digest = row_hash(raw)
+                concept_id = int(raw[columns['ConceptID']])
+                old = old_rows.get(concept_id)
+                if old is not None and old['hash'] == digest:
+                    new_rows[concept_id] = old
+                    reused += 1
+                else:
+                    deps_str = raw[columns['Dependencies']]
+                    new_rows[concept_id] = {
+                        'hash': digest,
+                        'label': raw[label_col] if label_col is not None else '',
+                        'deps': [int(d) for d in deps_str.split('|')] if deps_str else [],
+                        'taxonomy': raw[tax_col] if tax_col is not None else '',
+                    }
+                if concept_id not in seen_ids:
+                    seen_ids.add(concept_id)
+                    order.append(concept_id)
+
+        changed = {cid for cid, row in new_rows.items()
+                   if old_rows.get(cid) is not row}
+        changed |= set(old_rows) - set(new_rows)
+
+        self.order = order
+        if cached is None or not cached['is_dag']:
+            self.rows = new_rows
+            recomputed = self._rebuild()
+        else:
+            self._restore(cached)
+            recomputed = self._update(old_rows, new_rows, changed)
+            self.rows = new_rows
+
+        self.stats = {
+            'rows': len(new_rows),
+            'unchanged': reused,
+            'changed': len(changed),
+            'recomputed': recomputed,
+        }
+
+        if changed or cached is None:
+            self._write_cache()
+
+        return self
+
+    def concepts_and_dependencies(self) -> Tuple[Dict[int, str], Dict[int, List[int]]]:
+        """Return (concepts, dependencies) in the format load_graph() uses."""
+        concepts = {cid: self.rows[cid]['label'] for cid in self.order}
+        dependencies = {cid: self.rows[cid]['deps'] for cid in self.order
+                        if self.rows[cid]['deps']}
+        return concepts, dependencies
+
+    def longest_chain(self) -> Tuple[int, List[int]]:
+        """Longest dependency chain from the cached chain depths."""
+        max_chain_length = 0
+        end = None
+        for concept_id in self.order:
+            if self.depth.get(concept_id, 0) > max_chain_length:
+                max_chain_length = self.depth[concept_id]
+                end = concept_id
+
+        path = []
+        while end is not None:
+            path.append(end)
+            end = self.previous.get(end)
+        path.reverse()
+
+        return max_chain_length, path
+
+    def components(self) -> List[Set[int]]:
+        """Connected components ordered by their first concept in the CSV."""
+        components = {}
+        for concept_id in self.order:
+            components.setdefault(self.component[concept_id], set()).add(concept_id)
+        return list(components.values())
+
+    def summary(self) -> str:
+        """One-line description of how much work the cache saved."""
+        s = self.stats
+        return (f"♻️  Graph cache: {s['unchanged']}/{s['rows']} rows unchanged, "
+                f"{s['changed']} changed, {s['recomputed']} concepts recomputed "
+                f"({self.cache_path})")
+
+    # -- full rebuild -------------------------------------------------------
+
+    def _rebuild(self) -> int:
+        concepts, dependencies = self.concepts_and_dependencies()
+        graph = LearningGraph(concepts, dependencies)
+
+        self.dependents = {cid: [] for cid in self.rows}
+        for concept_id in self.order:
+            for prereq in self.rows[concept_id]['deps']:
+                self.dependents.setdefault(prereq, []).append(concept_id)
+
+        self.indegree = graph.indegree()
+        self.outdegree = graph.outdegree()
+        self.is_dag = graph.is_dag()
+        self.depth = {}
+        self.previous = {}
+        self._compute_depths(graph.topological_order())
+
+        self.component = {}
+        for i, members in enumerate(graph.connected_components()):
+            for concept_id in members:
+                self.component[concept_id] = i
+        self.next_component = len(set(self.component.values()))
+
+        return len(self.rows)
+
+    # -- incremental update -------------------------------------------------
+
+    def _update(self, old_rows: dict, new_rows: dict, changed: Set[int]) -> int:
+        if not changed:
+            return 0
+
+        # Adjacency and degrees: only the changed rows and their prerequisites
+        touched = set()
+        for concept_id in changed:
+            old = old_rows.get(concept_id)
+            new = new_rows.get(concept_id)
+            if old is not None:
+                for prereq in old['deps']:
+                    self.dependents[prereq].remove(concept_id)
+                    touched.add(prereq)
+            if new is not None:
+                for prereq in new['deps']:
+                    self.dependents.setdefault(prereq, []).append(concept_id)
+                    touched.add(prereq)
+                self.dependents.setdefault(concept_id, [])
+                self.outdegree[concept_id] = len(new['deps'])
+            else:
+                self.outdegree.pop(concept_id, None)
+                self.depth.pop(concept_id, None)
+                self.previous.pop(concept_id, None)
+
+        for concept_id in touched | changed:
+            if concept_id in new_rows:
+                self.indegree[concept_id] = len(self.dependents.get(concept_id, []))
+            else:
+                self.indegree.pop(concept_id, None)
+
+        self.rows = new_rows
+        affected = self._descendants(changed)
+        self._update_depths(affected)
+        self._update_components(old_rows, changed)
+
+        return len(affected)
+
+    def _descendants(self, start: Set[int]) -> Set[int]:
+        """Changed concepts plus everything that (transitively) depends on them."""
+        seen = set()
+        queue = deque(start)
+        while queue:
+            node = queue.popleft()
+            for dependent in self.dependents.get(node, []):
+                if dependent not in seen:
+                    seen.add(dependent)
+                    queue.append(dependent)
+        return {cid for cid in seen | start if cid in self.rows}
+
+    def _update_depths(self, affected: Set[int]):
+        """Recompute chain depths for the affected concepts in topological order."""
+        prereq_count = {cid: sum(1 for p in self.rows[cid]['deps'] if p in affected)
+                        for cid in affected}
+        queue = deque(cid for cid in self.order
+                      if cid in affected and prereq_count[cid] == 0)
+        order = []
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for dependent in self.dependents.get(node, []):
+                if dependent in prereq_count:
+                    prereq_count[dependent] -= 1
+                    if prereq_count[dependent] == 0:
+                        queue.append(dependent)
+
+        # Any new cycle runs through a changed concept, so it is caught here
+        self.is_dag = len(order) == len(affected)
+        for concept_id in affected:
+            self.depth.pop(concept_id, None)
+            self.previous.pop(concept_id, None)
+        self._compute_depths(order)
+
+    def _compute_depths(self, topo_order: List[int]):
+        for node in topo_order:
+            best_length = 0
+            best_prereq = None
+            for prereq in self.rows[node]['deps']:
+                prereq_length = self.depth.get(prereq, 1 if prereq not in self.rows else 0)
+                if prereq_length > best_length:
+                    best_length = prereq_length
+                    best_prereq = prereq
+            self.depth[node] = best_length + 1
+            self.previous[node] = best_prereq
+
+    def _update_components(self, old_rows: dict, changed: Set[int]):
+        """Re-label only the connected components that the changed rows touch."""
+        seeds = set()
+        for concept_id in changed:
+            seeds.add(concept_id)
+            for row in (old_rows.get(concept_id), self.rows.get(concept_id)):
+                if row is not None:
+                    seeds.update(row['deps'])
+
+        stale = {self.component[cid] for cid in seeds if cid in self.component}
+        region = {cid for cid, comp in self.component.items() if comp in stale}
+        region |= seeds
+        region = {cid for cid in region if cid in self.rows}
+
+        for concept_id in list(self.component):
+            if concept_id not in self.rows or self.component[concept_id] in stale:
+                del self.component[concept_id]
+
+        for start in region:
+            if start in self.component:
+                continue
+            comp_id = self.next_component
+            self.next_component += 1
+            self.component[start] = comp_id
+            queue = deque([start])
+            while queue:
+                node = queue.popleft()
+                neighbors = self.rows[node]['deps'] + self.dependents.get(node, [])
+                for neighbor in neighbors:
+                    if neighbor in self.rows and neighbor not in self.component:
+                        self.component[neighbor] = comp_id
+                        queue.append(neighbor)
+
+    # -- persistence --------------------------------------------------------
+
+    def _read_cache(self):
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if data.get('version') != CACHE_VERSION:
+            return None
+
+        def int_keys(d):
+            return {int(k): v for k, v in d.items()}
+
+        data['rows'] = int_keys(data['rows'])
+        for key in ('dependents', 'indegree', 'outdegree', 'depth', 'previous', 'component'):
+            data[key] = int_keys(data[key])
+        return data
+
+    def _restore(self, cached: dict):
+        self.dependents = cached['dependents']
+        self.indegree = cached['indegree']
+        self.outdegree = cached['outdegree']
+        self.depth = cached['depth']
+        self.previous = cached['previous']
+        self.component = cached['component']
+        self.next_component = cached['next_component']
+        self.is_dag = cached['is_dag']
+
+    def _write_cache(self):
+        data = {
+            'version': CACHE_VERSION,
+            'is_dag': self.is_dag,
+            'next_component': self.next_component,
+            'rows': self.rows,
+            'dependents': self.dependents,
+            'indegree': self.indegree,
+            'outdegree': self.outdegree,
+            'depth': self.depth,
+            'previous': self.previous,
+            'component': self.component,
+        }
+        with open(self.cache_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, separators=(',', ':'))
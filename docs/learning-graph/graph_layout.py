@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Offline Layout for the Graph Viewer
+
+Computes fixed x/y positions for every concept so the graph viewer
+(docs/sims/graph-viewer) can show the graph immediately instead of running
+the vis-network physics simulation on every page load.
+
+Two layouts are available, both vectorized with NumPy:
+
+- hierarchical: x is the dependency level (length of the longest chain of
+  prerequisites), so foundational concepts sit on the left and advanced
+  concepts on the right. Within a level, concepts start out grouped by
+  taxonomy and are then reordered by the average position of their
+  prerequisites (barycenter sweeps) to reduce edge crossings.
+- force: a Fruchterman-Reingold force-directed layout that starts from the
+  hierarchical positions. Each concept may only drift a fraction of a level
+  horizontally while the simulation runs; at the end concepts snap back to
+  their level and are spread out vertically so no two labels overlap.
+
+Used by csv-to-json.py --layout=hierarchical or --layout=force.
+"""
+
+from collections import deque
+from typing import Dict, List
+
+import numpy as np
+
+LEVEL_SPACING = 250  # pixels between dependency levels (x axis)
+ROW_SPACING = 45     # pixels between concepts in the same level (y axis)
+
+# How far the force layout may move a concept away from its level (x axis)
+LEVEL_SLACK = 0.3 * LEVEL_SPACING
+
+# Node labels are drawn as boxes about this many times wider than tall, so
+# the force layout measures repulsion distances with x scaled down by it
+LABEL_ASPECT = 3.0
+
+# Rows of the pairwise repulsion matrix computed at once (bounds memory)
+REPULSION_BLOCK = 1024
+
+
+def edge_arrays(node_ids: List[int], edges: List[dict]):
+    """Convert vis.js edges (from concept to prerequisite) into index arrays."""
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    pairs = [(index[e['from']], index[e['to']]) for e in edges
+             if e['from'] in index and e['to'] in index]
+    if not pairs:
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    src, dst = np.array(pairs, dtype=np.intp).T
+    return src, dst
+
+
+def compute_levels(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Longest-chain level of every concept (0 for foundational concepts).
+
+    Concepts on a cycle keep level 0.
+    """
+    dependents = [[] for _ in range(n)]
+    for s, d in zip(src.tolist(), dst.tolist()):
+        dependents[d].append(s)
+    remaining = np.bincount(src, minlength=n)
+
+    levels = np.zeros(n, dtype=np.intp)
+    queue = deque(np.flatnonzero(remaining == 0).tolist())
+    while queue:
+        node = queue.popleft()
+        for dependent in dependents[node]:
+            levels[dependent] = max(levels[dependent], levels[node] + 1)
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                queue.append(dependent)
+    return levels
+
+
+def _ranks_within_levels(levels: np.ndarray, keys: np.ndarray, tiebreak: np.ndarray):
+    """Rank of every concept inside its level when sorted by (keys, tiebreak)."""
+    order = np.lexsort((tiebreak, keys, levels))
+    sorted_levels = levels[order]
+    level_start = np.searchsorted(sorted_levels, sorted_levels, side='left')
+    ranks = np.empty(len(levels), dtype=float)
+    ranks[order] = np.arange(len(levels)) - level_start
+    return ranks
+
+
+def hierarchical_layout(node_ids: List[int], edges: List[dict],
+                        groups: List[str] = None, sweeps: int = 4) -> np.ndarray:
+    """Return an (n, 2) array of x/y pixel positions, one row per node_ids entry."""
+    n = len(node_ids)
+    src, dst = edge_arrays(node_ids, edges)
+    levels = compute_levels(n, src, dst)
+
+    if groups is not None:
+        group_ids = {g: i for i, g in enumerate(dict.fromkeys(groups))}
+        group_index = np.array([group_ids[g] for g in groups], dtype=float)
+    else:
+        group_index = np.zeros(n)
+    ids = np.array(node_ids, dtype=float)
+
+    ranks = _ranks_within_levels(levels, group_index, ids)
+    counts = np.bincount(src, minlength=n)
+    for _ in range(sweeps):
+        # Barycenter of each concept's prerequisites; concepts without
+        # prerequisites keep their current rank
+        totals = np.bincount(src, weights=ranks[dst], minlength=n)
+        barycenter = np.where(counts > 0, totals / np.maximum(counts, 1), ranks)
+        ranks = _ranks_within_levels(levels, barycenter, group_index)
+
+    level_sizes = np.bincount(levels)
+    y = (ranks - (level_sizes[levels] - 1) / 2) * ROW_SPACING
+    x = levels * LEVEL_SPACING
+    return np.column_stack([x, y]).astype(float)
+
+
+def force_layout(node_ids: List[int], edges: List[dict], groups: List[str] = None,
+                 iterations: int = 200) -> np.ndarray:
+    """Fruchterman-Reingold layout seeded with the hierarchical positions.
+
+    Repulsion is computed between every pair of concepts, so each iteration
+    is O(n^2): about a second for a 500 concept textbook graph, but use the
+    hierarchical layout for graphs with many thousands of concepts.
+    """
+    n = len(node_ids)
+    pos = hierarchical_layout(node_ids, edges, groups)
+    if n < 2:
+        return pos
+
+    src, dst = edge_arrays(node_ids, edges)
+    target_x = pos[:, 0].copy()
+    k = float(LEVEL_SPACING) * 0.6  # ideal edge length
+    temperature = LEVEL_SPACING / 2
+
+    scale = (1 / LABEL_ASPECT, 1.0)
+
+    for _ in range(iterations):
+        disp = np.zeros_like(pos)
+
+        # Repulsion between every pair of concepts, a block of rows at a time
+        sx = pos[:, 0] * scale[0]
+        sy = pos[:, 1]
+        for start in range(0, n, REPULSION_BLOCK):
+            stop = start + REPULSION_BLOCK
+            dx = sx[start:stop, None] - sx[None, :]
+            dy = sy[start:stop, None] - sy[None, :]
+            strength = dx * dx
+            strength += dy * dy
+            np.maximum(strength, 1.0, out=strength)
+            np.divide(k * k, strength, out=strength)
+            disp[start:stop, 0] += (dx * strength).sum(axis=1)
+            disp[start:stop, 1] += (dy * strength).sum(axis=1)
+
+        # Attraction along prerequisite edges
+        if len(src):
+            delta = pos[src] - pos[dst]
+            dist = np.sqrt(np.einsum('ij,ij->i', delta, delta)) + 1e-9
+            force = delta * (dist / k)[:, None]
+            np.subtract.at(disp, src, force)
+            np.add.at(disp, dst, force)
+
+        length = np.sqrt(np.einsum('ij,ij->i', disp, disp)) + 1e-9
+        pos += disp * (np.minimum(length, temperature) / length)[:, None]
+        temperature = max(1.0, temperature * (1 - 3.0 / iterations))
+
+        # Keep the left-to-right reading order of the hierarchy
+        np.clip(pos[:, 0], target_x - LEVEL_SLACK, target_x + LEVEL_SLACK, out=pos[:, 0])
+
+    pos[:, 0] = target_x
+    pos[:, 1] = _spread_levels(target_x, pos[:, 1])
+    return pos - pos.mean(axis=0)
+
+
+def _spread_levels(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """Push concepts in the same level apart until they are ROW_SPACING apart."""
+    order = np.lexsort((y, x))
+    sorted_x = x[order]
+    level_start = np.searchsorted(sorted_x, sorted_x, side='left')
+    rank = np.arange(len(x)) - level_start
+
+    # y[i] = max(y[i], y[i-1] + ROW_SPACING) within each level, as a running
+    # maximum of y - rank * ROW_SPACING that restarts at every level
+    shifted = y[order] - rank * ROW_SPACING
+    starts = np.flatnonzero(rank == 0)
+    for begin, end in zip(starts, np.append(starts[1:], len(x))):
+        np.maximum.accumulate(shifted[begin:end], out=shifted[begin:end])
+
+    spread = np.empty_like(y)
+    spread[order] = shifted + rank * ROW_SPACING
+    return spread
+
+
+LAYOUTS = {
+    'hierarchical': hierarchical_layout,
+    'force': force_layout,
+}
+
+
+def apply_layout(nodes: List[dict], edges: List[dict], method: str = 'hierarchical') -> Dict[int, tuple]:
+    """Add integer 'x' and 'y' fields to every vis.js node dictionary in place.
+
+    Returns:
+        Dictionary mapping node IDs to (x, y)
+    """
+    if method not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{method}'. Choose from: {', '.join(LAYOUTS)}")
+
+    node_ids = [node['id'] for node in nodes]
+    groups = [node.get('group') for node in nodes]
+    positions = np.rint(LAYOUTS[method](node_ids, edges, groups)).astype(int)
+
+    placed = {}
+    for node, (x, y) in zip(nodes, positions.tolist()):
+        node['x'] = x
+        node['y'] = y
+        placed[node['id']] = (x, y)
+    return placed
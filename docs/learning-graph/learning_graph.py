@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Shared Learning Graph Model
+
+Loads the concept dependency CSV once and builds forward (concept →
+prerequisites) and reverse (prerequisite → dependents) adjacency lists.
+Every analysis then walks these lists instead of rescanning all of the
+dependency rows for each node, so the full report runs in O(V + E):
+
+- Kahn's algorithm for the topological order / DAG check
+- Tarjan's algorithm for strongly connected components (cycles)
+- Union-find for connected components
+- Longest dependency chain by dynamic programming over the topological order
+
+All traversals are iterative so graphs with tens of thousands of
+concepts do not hit Python's recursion limit.
+
+Import it from the other learning-graph scripts with:
+
+    from learning_graph import LearningGraph
+"""
+
+import csv
+from collections import defaultdict, deque
+from typing import Dict, List, Set, Tuple
+
+
+def load_graph(csv_path: str) -> Tuple[Dict[int, str], Dict[int, List[int]]]:
+    """Load the dependency graph from CSV file."""
+    concepts = {}  # id -> label
+    dependencies = defaultdict(list)  # id -> list of prerequisite ids
+
+    with open(csv_path, 'r', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            concept_id = int(row['ConceptID'])
+            concepts[concept_id] = row['ConceptLabel']
+
+            if row['Dependencies']:
+                deps = [int(d) for d in row['Dependencies'].split('|')]
+                dependencies[concept_id] = deps
+
+    return concepts, dependencies
+
+
+class LearningGraph:
+    """Concept dependency graph with prebuilt adjacency lists.
+
+    Args:
+        concepts: Dictionary mapping concept IDs to labels
+        dependencies: Dictionary mapping concept IDs to their prerequisite IDs
+
+    Attributes:
+        prerequisites: concept ID -> list of prerequisite IDs (outbound edges)
+        dependents: concept ID -> list of concepts that depend on it (inbound edges)
+
+    Results of the topological sort are computed on first use and reused
+    by the DAG check and the longest chain analysis.
+    """
+
+    def __init__(self, concepts: Dict[int, str], dependencies: Dict[int, List[int]]):
+        self.concepts = concepts
+        self.dependencies = dependencies
+        self.prerequisites = {cid: list(dependencies.get(cid, [])) for cid in concepts}
+        self.dependents = {cid: [] for cid in concepts}
+
+        for concept_id, prereqs in dependencies.items():
+            for prereq in prereqs:
+                # Prerequisites that are not defined as concepts are ignored
+                if prereq in self.dependents:
+                    self.dependents[prereq].append(concept_id)
+
+        self._topo_order = None
+
+    @classmethod
+    def from_csv(cls, csv_path: str) -> 'LearningGraph':
+        """Build a graph directly from a learning-graph.csv file."""
+        concepts, dependencies = load_graph(csv_path)
+        return cls(concepts, dependencies)
+
+    def __len__(self) -> int:
+        return len(self.concepts)
+
+    def edge_count(self) -> int:
+        """Total number of dependency edges."""
+        return sum(len(prereqs) for prereqs in self.prerequisites.values())
+
+    def indegree(self) -> Dict[int, int]:
+        """Number of concepts that depend on each concept."""
+        return {cid: len(deps) for cid, deps in self.dependents.items()}
+
+    def outdegree(self) -> Dict[int, int]:
+        """Number of prerequisites for each concept."""
+        return {cid: len(prereqs) for cid, prereqs in self.prerequisites.items()}
+
+    def topological_order(self) -> List[int]:
+        """Order concepts so every prerequisite comes before its dependents.
+
+        Uses Kahn's algorithm on the reverse graph (prerequisite → dependent).
+        Concepts that sit on or behind a cycle are left out, so the order is
+        shorter than the concept count exactly when the graph is not a DAG.
+        """
+        if self._topo_order is not None:
+            return self._topo_order
+
+        prereq_count = {cid: 0 for cid in self.concepts}
+        for cid, prereqs in self.prerequisites.items():
+            prereq_count[cid] = sum(1 for p in prereqs if p in prereq_count)
+
+        # Start with foundational concepts (no prerequisites)
+        queue = deque([cid for cid in self.concepts if prereq_count[cid] == 0])
+        order = []
+
+        while queue:
+            node = queue.popleft()
+            order.append(node)
+            for dependent in self.dependents[node]:
+                prereq_count[dependent] -= 1
+                if prereq_count[dependent] == 0:
+                    queue.append(dependent)
+
+        self._topo_order = order
+        return order
+
+    def is_dag(self) -> bool:
+        """True if the graph has no cycles."""
+        return len(self.topological_order()) == len(self.concepts)
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Find strongly connected components with an iterative Tarjan's algorithm."""
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+
+        for root in self.concepts:
+            if root in index:
+                continue
+
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self.dependents[root]))]
+
+            while work:
+                node, neighbors = work[-1]
+                advanced = False
+                for nxt in neighbors:
+                    if nxt not in index:
+                        index[nxt] = lowlink[nxt] = counter
+                        counter += 1
+                        stack.append(nxt)
+                        on_stack.add(nxt)
+                        work.append((nxt, iter(self.dependents[nxt])))
+                        advanced = True
+                        break
+                    elif nxt in on_stack:
+                        lowlink[node] = min(lowlink[node], index[nxt])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components
+
+    def find_cycles(self) -> List[List[int]]:
+        """Return one example cycle for each strongly connected component that has one.
+
+        Each cycle is listed in learning order (prerequisite → dependent) and
+        repeats its first concept at the end, e.g. [3, 7, 9, 3].
+        """
+        cycles = []
+        for component in self.strongly_connected_components():
+            start = component[0]
+            if len(component) == 1 and start not in self.dependents[start]:
+                continue
+
+            # Every member has a dependent inside the component, so walking
+            # inside it must eventually revisit a concept and close a cycle.
+            members = set(component)
+            position = {}
+            path = []
+            node = start
+            while node not in position:
+                position[node] = len(path)
+                path.append(node)
+                node = next(d for d in self.dependents[node] if d in members)
+            cycle = path[position[node]:]
+            cycles.append(cycle + [node])
+
+        return cycles
+
+    def longest_chain(self) -> Tuple[int, List[int]]:
+        """Find the longest dependency chain over the topological order.
+
+        Returns the chain length and the path from the most foundational
+        concept to the most advanced one. Concepts on a cycle are skipped.
+        """
+        length = {}
+        previous = {}
+
+        for node in self.topological_order():
+            best_length = 0
+            best_prereq = None
+            for prereq in self.prerequisites[node]:
+                prereq_length = length.get(prereq, 1 if prereq not in self.concepts else 0)
+                if prereq_length > best_length:
+                    best_length = prereq_length
+                    best_prereq = prereq
+            length[node] = best_length + 1
+            previous[node] = best_prereq
+
+        max_chain_length = 0
+        end = None
+        for concept_id in self.concepts:
+            if length.get(concept_id, 0) > max_chain_length:
+                max_chain_length = length[concept_id]
+                end = concept_id
+
+        path = []
+        while end is not None:
+            path.append(end)
+            end = previous.get(end)
+        path.reverse()
+
+        return max_chain_length, path
+
+    def connected_components(self) -> List[Set[int]]:
+        """Find connected components (treating graph as undirected) with union-find."""
+        parent = {cid: cid for cid in self.concepts}
+
+        def find(x):
+            root = x
+            while parent[root] != root:
+                root = parent[root]
+            while parent[x] != root:
+                parent[x], x = root, parent[x]
+            return root
+
+        for concept_id, prereqs in self.prerequisites.items():
+            for prereq in prereqs:
+                if prereq in parent:
+                    a, b = find(concept_id), find(prereq)
+                    if a != b:
+                        parent[b] = a
+
+        # Keep components in order of their first concept, like a BFS sweep would
+        components = {}
+        for concept_id in self.concepts:
+            components.setdefault(find(concept_id), set()).add(concept_id)
+
+        return list(components.values())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Learning Path Query Tool
+
+Answers learning path questions from a learning-graph.csv using the
+precomputed reachability index in reachability.py.
+
+Concepts can be given by ID or by label (case-insensitive).
+
+Usage:
+    python query-graph.py <input_csv> prereqs <concept>
+    python query-graph.py <input_csv> dependents <concept>
+    python query-graph.py <input_csv> path <from_concept> <to_concept>
+    python query-graph.py <input_csv> unlocks <concept> [<concept> ...]
+
+Examples:
+    python query-graph.py learning-graph.csv prereqs "PWM Frequency"
+    python query-graph.py learning-graph.csv path "Computer Program" "Play a Melody"
+    python query-graph.py learning-graph.csv unlocks 1 2 3 4 5
+"""
+
+import sys
+import time
+
+from learning_graph import LearningGraph
+from reachability import ReachabilityIndex
+
+
+def resolve_concept(graph: LearningGraph, name: str) -> int:
+    """Look up a concept by ID or case-insensitive label."""
+    if name.isdigit() and int(name) in graph.concepts:
+        return int(name)
+    wanted = name.strip().lower()
+    for cid, label in graph.concepts.items():
+        if label.lower() == wanted:
+            return cid
+    raise KeyError(f"Unknown concept: {name}")
+
+
+def print_concepts(graph: LearningGraph, concept_ids):
+    for cid in concept_ids:
+        print(f"- **{cid}**: {graph.concepts[cid]}")
+
+
+def run_query(index: ReachabilityIndex, command: str, names):
+    """Run one query and print the result with its lookup time."""
+    graph = index.graph
+    concepts = [resolve_concept(graph, name) for name in names]
+
+    start = time.perf_counter()
+    if command == 'prereqs':
+        result = index.prerequisites(concepts[0])
+        title = f"All prerequisites of {graph.concepts[concepts[0]]}"
+    elif command == 'dependents':
+        result = index.dependents(concepts[0])
+        title = f"All concepts that build on {graph.concepts[concepts[0]]}"
+    elif command == 'path':
+        result = index.shortest_path(concepts[0], concepts[1]) or []
+        title = (f"Shortest learning path from {graph.concepts[concepts[0]]} "
+                 f"to {graph.concepts[concepts[1]]}")
+    elif command == 'unlocks':
+        result = index.unlocked_by(concepts)
+        title = f"Concepts unlocked by mastering {len(concepts)} concept(s)"
+    else:
+        raise ValueError(f"Unknown query: {command}")
+    elapsed = time.perf_counter() - start
+
+    print(f"## {title}\n")
+    if result:
+        print_concepts(graph, result)
+    else:
+        print("None")
+    print(f"\n*{len(result)} concepts, query took {elapsed * 1e6:.0f} µs*")
+
+
+if __name__ == "__main__":
+    required_args = {'prereqs': 1, 'dependents': 1, 'path': 2, 'unlocks': 1}
+
+    if len(sys.argv) < 4 or sys.argv[2] not in required_args \
+            or len(sys.argv) - 3 < required_args[sys.argv[2]]:
+        print(__doc__.strip())
+        sys.exit(1)
+
+    csv_path = sys.argv[1]
+    command = sys.argv[2]
+
+    start = time.perf_counter()
+    index = ReachabilityIndex(LearningGraph.from_csv(csv_path))
+    print(f"📋 Reachability index for {len(index.order)} concepts built in "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms\n")
+
+    try:
+        run_query(index, command, sys.argv[3:])
+    except KeyError as e:
+        print(f"❌ {e.args[0]}")
+        sys.exit(1)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Reachability Index for Learning Path Queries
+
+Precomputes the transitive closure of a learning graph as one bitset per
+concept so questions like "what are all the prerequisites of X" or "is A
+needed before B" are answered with a few integer operations instead of a
+fresh DFS.
+
+Each concept gets a bit position equal to its place in the topological
+order. Python integers are used as bitsets:
+
+- ancestors[c]: every concept that must be learned before c
+- descendants[c]: every concept that (transitively) depends on c
+
+Both are built in a single pass over the topological order, OR-ing the
+bitsets of the direct prerequisites (or dependents). The graph must be
+a DAG.
+
+Example:
+
+    from learning_graph import LearningGraph
+    from reachability import ReachabilityIndex
+
+    index = ReachabilityIndex(LearningGraph.from_csv('learning-graph.csv'))
+    index.prerequisites(42)
+    index.shortest_path(1, 42)
+    index.unlocked_by([1, 2, 3, 4, 5])
+"""
+
+from collections import deque
+from typing import Iterable, List, Optional
+
+from learning_graph import LearningGraph
+
+
+class ReachabilityIndex:
+    """Bitset transitive closure of a learning graph.
+
+    Args:
+        graph: A LearningGraph that is a DAG
+
+    Raises:
+        ValueError: If the graph contains a cycle
+    """
+
+    def __init__(self, graph: LearningGraph):
+        if not graph.is_dag():
+            raise ValueError("Reachability index needs a DAG; fix the cycles reported by analyze-graph.py first")
+
+        self.graph = graph
+        self.order = graph.topological_order()
+        self.position = {cid: i for i, cid in enumerate(self.order)}
+
+        # Direct prerequisites as a bitset, used by unlocked_by()
+        self.prereq_bits = {}
+        self.ancestors = {}
+        for cid in self.order:
+            direct = 0
+            closure = 0
+            for prereq in graph.prerequisites[cid]:
+                if prereq in self.position:
+                    bit = 1 << self.position[prereq]
+                    direct |= bit
+                    closure |= bit | self.ancestors[prereq]
+            self.prereq_bits[cid] = direct
+            self.ancestors[cid] = closure
+
+        self.descendants = {}
+        for cid in reversed(self.order):
+            closure = 0
+            for dependent in graph.dependents[cid]:
+                closure |= (1 << self.position[dependent]) | self.descendants[dependent]
+            self.descendants[cid] = closure
+
+    def _decode(self, bits: int) -> List[int]:
+        """Concept IDs for the set bits, in topological (learning) order."""
+        ids = []
+        text = bin(bits)[:1:-1]  # least significant bit first
+        i = text.find('1')
+        while i != -1:
+            ids.append(self.order[i])
+            i = text.find('1', i + 1)
+        return ids
+
+    def _encode(self, concept_ids: Iterable[int]) -> int:
+        bits = 0
+        for cid in concept_ids:
+            bits |= 1 << self.position[cid]
+        return bits
+
+    def is_prerequisite(self, prereq: int, concept: int) -> bool:
+        """True if `prereq` must be learned (directly or indirectly) before `concept`."""
+        return bool(self.ancestors[concept] >> self.position[prereq] & 1)
+
+    def prerequisites(self, concept: int) -> List[int]:
+        """All concepts that must be learned before `concept`, in learning order."""
+        return self._decode(self.ancestors[concept])
+
+    def dependents(self, concept: int) -> List[int]:
+        """All concepts that build on `concept`, in learning order."""
+        return self._decode(self.descendants[concept])
+
+    def prerequisite_count(self, concept: int) -> int:
+        """Number of concepts that must be learned before `concept`."""
+        return bin(self.ancestors[concept]).count('1')
+
+    def shortest_path(self, start: int, goal: int) -> Optional[List[int]]:
+        """Shortest learning path from `start` to `goal`, or None if `goal`
+        does not depend on `start`.
+
+        The BFS only visits concepts that lie between the two, which the
+        closure bitsets identify up front.
+        """
+        if start == goal:
+            return [start]
+        if not self.is_prerequisite(start, goal):
+            return None
+
+        between = self.descendants[start] & self.ancestors[goal]
+        between |= 1 << self.position[goal]
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for dependent in self.graph.dependents[node]:
+                if dependent in previous or not between >> self.position[dependent] & 1:
+                    continue
+                previous[dependent] = node
+                if dependent == goal:
+                    path = [goal]
+                    while previous[path[-1]] is not None:
+                        path.append(previous[path[-1]])
+                    return path[::-1]
+                queue.append(dependent)
+        return None
+
+    def unlocked_by(self, mastered: Iterable[int]) -> List[int]:
+        """Concepts a learner can start once they master `mastered`.
+
+        Mastering a concept implies knowing all of its prerequisites. A
+        concept is unlocked when it is not yet known and every one of its
+        direct prerequisites is known.
+        """
+        mastered = list(mastered)
+        known = self._encode(mastered)
+        for cid in mastered:
+            known |= self.ancestors[cid]
+
+        candidates = set()
+        for cid in self._decode(known):
+            candidates.update(self.graph.dependents[cid])
+
+        unlocked = [cid for cid in candidates
+                    if not known >> self.position[cid] & 1
+                    and self.prereq_bits[cid] & ~known == 0]
+        return sorted(unlocked, key=self.position.__getitem__)
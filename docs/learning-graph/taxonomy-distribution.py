@@ -11,7 +11,8 @@ from collections import defaultdict
 from typing import Dict, List, Tuple
 
 
-def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_names: dict = None):
+def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_names: dict = None,
+                                  use_cache: bool = False, rows=None):
     """
     Analyze taxonomy distribution and generate report.
 
@@ -19,6 +20,9 @@ def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_name
         csv_path: Path to input CSV file
         output_path: Path to output markdown report
         taxonomy_names: Optional dictionary mapping taxonomy IDs to full names
+        use_cache: Reuse parsed rows from the graph_cache.GraphCache file
+        rows: Optional already parsed (concept_id, label, taxonomy_id) tuples.
+              When given, csv_path is not read.
     """
     # Default taxonomy names
     default_names = {
@@ -39,12 +43,26 @@ def analyze_taxonomy_distribution(csv_path: str, output_path: str, taxonomy_name
     taxonomy_counts = defaultdict(int)
     taxonomy_concepts = defaultdict(list)
 
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            tax = row['TaxonomyID']
+    if rows is not None:
+        for concept_id, label, tax in rows:
             taxonomy_counts[tax] += 1
-            taxonomy_concepts[tax].append((int(row['ConceptID']), row['ConceptLabel']))
+            taxonomy_concepts[tax].append((concept_id, label))
+    elif use_cache:
+        from graph_cache import GraphCache
+
+        cache = GraphCache(csv_path).load()
+        print(cache.summary())
+        for concept_id in cache.order:
+            row = cache.rows[concept_id]
+            taxonomy_counts[row['taxonomy']] += 1
+            taxonomy_concepts[row['taxonomy']].append((concept_id, row['label']))
+    else:
+        with open(csv_path, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                tax = row['TaxonomyID']
+                taxonomy_counts[tax] += 1
+                taxonomy_concepts[tax].append((int(row['ConceptID']), row['ConceptLabel']))
 
     total_concepts = sum(taxonomy_counts.values())
 
@@ -181,8 +199,10 @@ if __name__ == "__main__":
     import json
 
     # Parse command line arguments
-    if len(sys.argv) < 3:
-        print("Usage: python taxonomy-distribution.py <input_csv> <output_report.md> [taxonomy_names.json]")
+    use_cache = '--cache' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--cache']
+    if len(args) < 2:
+        print("Usage: python taxonomy-distribution.py <input_csv> <output_report.md> [taxonomy_names.json] [--cache]")
         print("\nExample:")
         print("  python taxonomy-distribution.py data/concept-dependencies.csv reports/taxonomy-distribution.md")
         print("\nOptional taxonomy_names.json format:")
@@ -193,15 +213,15 @@ if __name__ == "__main__":
         }, indent=2))
         sys.exit(1)
 
-    csv_path = sys.argv[1]
-    output_path = sys.argv[2]
+    csv_path = args[0]
+    output_path = args[1]
 
     # Load taxonomy names if provided
     taxonomy_names = None
-    if len(sys.argv) > 3:
-        config_file = sys.argv[3]
+    if len(args) > 2:
+        config_file = args[2]
         with open(config_file, 'r', encoding='utf-8') as f:
             taxonomy_names = json.load(f)
         print(f"📋 Loaded taxonomy names from: {config_file}")
 
-    analyze_taxonomy_distribution(csv_path, output_path, taxonomy_names)
+    analyze_taxonomy_distribution(csv_path, output_path, taxonomy_names, use_cache)
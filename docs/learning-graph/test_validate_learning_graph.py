@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Tests for the compiled validator in validate-learning-graph.py.
+
+Run with: python -m pytest test_validate_learning_graph.py
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('jsonschema')
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+SCHEMA_PATH = SCRIPT_DIR / 'learning-graph-schema.json'
+
+
+def load_validator_module():
+    """Import validate-learning-graph.py (hyphenated name) as a module."""
+    spec = importlib.util.spec_from_file_location('validate_learning_graph',
+                                                  SCRIPT_DIR / 'validate-learning-graph.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+validate = load_validator_module()
+
+
+@pytest.fixture(scope='module')
+def compiled():
+    return validate.CompiledValidator(json.loads(SCHEMA_PATH.read_text()))
+
+
+@pytest.fixture
+def graph():
+    """A small schema-valid document: a chain of five concepts."""
+    return {
+        'metadata': {'title': 'Test Graph', 'version': '1.0'},
+        'groups': {'FOUND': {'classifierName': 'Foundation', 'color': {'color': 'steelblue'}}},
+        'nodes': [{'id': i, 'label': f"Concept {i}", 'group': 'FOUND'} for i in range(1, 6)],
+        'edges': [{'from': i, 'to': i - 1} for i in range(2, 6)],
+    }
+
+
+def test_valid_graph_has_no_errors(compiled, graph):
+    assert list(compiled.iter_errors(graph)) == []
+    assert len(compiled.stats['node_ids']) == len(graph['nodes'])
+    assert validate.validate_learning_graph_fast(None, None, graph, compiled)
+
+
+def test_unhashable_ids_are_reported_not_raised(compiled, graph):
+    graph['nodes'][0]['id'] = [1]
+    graph['nodes'][1]['id'] = {'id': 2}
+    graph['edges'][0]['from'] = [3]
+    graph['edges'][1]['to'] = {'to': 4}
+
+    errors = list(compiled.iter_errors(graph))
+    paths = [path for path, message in errors]
+    assert sorted(paths) == [['edges', 0, 'from'], ['edges', 1, 'to'],
+                             ['nodes', 0, 'id'], ['nodes', 1, 'id']]
+    # The bad IDs are left out of the stats
+    assert len(compiled.stats['node_ids']) == len(graph['nodes']) - 2
+    assert not validate.validate_learning_graph_fast(None, None, graph, compiled)
+
+
+def test_duplicate_ids(compiled, graph):
+    graph['nodes'][1]['id'] = graph['nodes'][0]['id']
+    assert list(compiled.iter_errors(graph)) == []
+    assert compiled.stats['duplicates'] == {graph['nodes'][0]['id']}
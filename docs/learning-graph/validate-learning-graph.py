@@ -3,10 +3,15 @@
 validate-learning-graph.py
 Validates a learning graph JSON file against the learning-graph-schema.json
 
-Usage: python3 validate-learning-graph.py <data-file> <schema-file>
+Usage: python3 validate-learning-graph.py <data-file> <schema-file> [--fast]
+
+--fast compiles the schema once (cached between runs), checks nodes and
+edges in batches with fast-path checks and reports every error instead
+of only the first one.
 """
 
 import json
+import re
 import sys
 from pathlib import Path
 
@@ -16,13 +21,28 @@ RED = '\033[0;31m'
 YELLOW = '\033[1;33m'
 NC = '\033[0m'  # No Color
 
-def validate_learning_graph(data_path, schema_path):
-    """Validate a learning graph JSON file against the schema."""
+def build_validator(schema):
+    """Check the schema once and return a validator that can be reused
+    for any number of documents."""
+    from jsonschema.validators import validator_for
+
+    validator_class = validator_for(schema)
+    validator_class.check_schema(schema)
+    return validator_class(schema)
+
+
+def validate_learning_graph(data_path, schema_path, data=None, validator=None):
+    """Validate a learning graph JSON file against the schema.
+
+    Pass an already loaded `data` dictionary and/or a `validator` from
+    build_validator() to skip re-reading the data file and the schema.
+    """
 
     # Try to import jsonschema
     try:
         import jsonschema
-        from jsonschema import validate, ValidationError, SchemaError
+        from jsonschema import ValidationError, SchemaError
+        from jsonschema.exceptions import best_match
     except ImportError:
         print(f"{RED}Error: jsonschema library not found{NC}")
         print("\nPlease install it with:")
@@ -32,30 +52,40 @@ def validate_learning_graph(data_path, schema_path):
         return False
 
     # Load schema
-    try:
-        with open(schema_path, 'r') as f:
-            schema = json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"{RED}✗ Schema file is not valid JSON: {e}{NC}")
-        return False
-    except Exception as e:
-        print(f"{RED}✗ Error reading schema file: {e}{NC}")
-        return False
+    if validator is None:
+        try:
+            with open(schema_path, 'r') as f:
+                schema = json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"{RED}✗ Schema file is not valid JSON: {e}{NC}")
+            return False
+        except Exception as e:
+            print(f"{RED}✗ Error reading schema file: {e}{NC}")
+            return False
+
+        try:
+            validator = build_validator(schema)
+        except SchemaError as e:
+            print(f"{RED}✗ Schema itself is invalid: {e}{NC}")
+            return False
 
     # Load data
-    try:
-        with open(data_path, 'r') as f:
-            data = json.load(f)
-    except json.JSONDecodeError as e:
-        print(f"{RED}✗ Data file is not valid JSON: {e}{NC}")
-        return False
-    except Exception as e:
-        print(f"{RED}✗ Error reading data file: {e}{NC}")
-        return False
+    if data is None:
+        try:
+            with open(data_path, 'r') as f:
+                data = json.load(f)
+        except json.JSONDecodeError as e:
+            print(f"{RED}✗ Data file is not valid JSON: {e}{NC}")
+            return False
+        except Exception as e:
+            print(f"{RED}✗ Error reading data file: {e}{NC}")
+            return False
 
     # Validate
     try:
-        validate(instance=data, schema=schema)
+        error = best_match(validator.iter_errors(data))
+        if error is not None:
+            raise error
         print(f"{GREEN}✓ Validation successful!{NC}")
         print("")
         print("Summary:")
@@ -130,18 +160,313 @@ def validate_learning_graph(data_path, schema_path):
         return False
 
 
+# --- Compiled fast-path validation -------------------------------------------
+
+# Keywords that only describe a schema and never fail validation
+ANNOTATION_KEYWORDS = {'description', 'title', '$comment', 'examples', 'default', '$schema', '$id'}
+
+# Python expressions equivalent to the JSON Schema (draft 4+) type names
+TYPE_EXPRESSIONS = {
+    'string': 'isinstance({0}, str)',
+    'integer': ('(isinstance({0}, int) and not isinstance({0}, bool)'
+                ' or isinstance({0}, float) and {0}.is_integer())'),
+    'number': 'isinstance({0}, (int, float)) and not isinstance({0}, bool)',
+    'object': 'isinstance({0}, dict)',
+    'array': 'isinstance({0}, list)',
+    'boolean': 'isinstance({0}, bool)',
+    'null': '{0} is None',
+}
+
+# Node and edge endpoint IDs the compiled validator gathers for its checks
+ID_TYPES = (str, int, float)
+
+
+def _fast_expression(schema, var, constants):
+    """Translate a subschema into a Python boolean expression on `var`."""
+    terms = []
+    is_number = '(' + TYPE_EXPRESSIONS['number'].format(var) + ')'
+
+    def constant(value):
+        name = f"c{len(constants)}"
+        constants[name] = value
+        return name
+
+    for keyword, value in schema.items():
+        if keyword in ANNOTATION_KEYWORDS:
+            continue
+        if keyword == 'type':
+            types = value if isinstance(value, list) else [value]
+            if any(t not in TYPE_EXPRESSIONS for t in types):
+                return None
+            terms.append(' or '.join(f"({TYPE_EXPRESSIONS[t].format(var)})" for t in types))
+        elif keyword == 'required':
+            keys = ' and '.join(f"{k!r} in {var}" for k in value) or 'True'
+            terms.append(f"not isinstance({var}, dict) or ({keys})")
+        elif keyword == 'properties':
+            props = []
+            for name, subschema in value.items():
+                sub = _fast_expression(subschema, f"{var}[{name!r}]", constants)
+                if sub is None:
+                    return None
+                props.append(f"({name!r} not in {var} or ({sub}))")
+            if props:
+                terms.append(f"not isinstance({var}, dict) or ({' and '.join(props)})")
+        elif keyword == 'pattern':
+            regex = constant(re.compile(value))
+            terms.append(f"not isinstance({var}, str) or {regex}.search({var}) is not None")
+        elif keyword == 'minLength':
+            terms.append(f"not isinstance({var}, str) or len({var}) >= {int(value)}")
+        elif keyword == 'maxLength':
+            terms.append(f"not isinstance({var}, str) or len({var}) <= {int(value)}")
+        elif keyword == 'minimum' and isinstance(value, (int, float)):
+            terms.append(f"not {is_number} or {var} >= {value!r}")
+        elif keyword == 'maximum' and isinstance(value, (int, float)):
+            terms.append(f"not {is_number} or {var} <= {value!r}")
+        elif keyword == 'enum' and all(isinstance(e, str) for e in value):
+            terms.append(f"isinstance({var}, str) and {var} in {constant(frozenset(value))}")
+        else:
+            return None
+
+    return ' and '.join(f"({term})" for term in terms) or 'True'
+
+
+def compile_fast_check(schema):
+    """
+    Compile a simple subschema into a single Python predicate.
+
+    Supports the keywords the node and edge schemas use (type, required,
+    properties, pattern, minLength, maxLength, minimum, maximum, string enum)
+    by generating one boolean expression and compiling it with eval().
+    Returns None if the schema uses anything else, in which case every item
+    goes through jsonschema. A True result means the item is valid; items
+    that fail are re-checked by jsonschema to get its error messages.
+    """
+    constants = {}
+    expression = _fast_expression(schema, 'v', constants)
+    if expression is None:
+        return None
+    return eval(f"lambda v: {expression}", constants)
+
+
+class CompiledValidator:
+    """
+    Learning graph validator compiled once from the schema.
+
+    The document is split into the small "shell" (metadata and groups),
+    which is validated with jsonschema, and the nodes and edges arrays,
+    whose items are checked in batches against compiled fast-path
+    predicates. Only items that fail the fast path are handed to
+    jsonschema, so every error is still reported with its usual message.
+
+    Use CompiledValidator.from_file() to reuse the compiled validator:
+    it is kept in memory for the life of the process, and the (slow)
+    meta-schema check is skipped on later runs while the schema file is
+    unchanged.
+    """
+
+    _loaded = {}
+
+    def __init__(self, schema: dict, schema_checked: bool = False):
+        from jsonschema.validators import validator_for
+
+        validator_class = validator_for(schema)
+        if not schema_checked:
+            validator_class.check_schema(schema)
+
+        properties = schema.get('properties', {})
+        shell_schema = dict(schema, properties=dict(properties))
+        self.item_validators = {}
+        self.fast_checks = {}
+        for array_name in ('nodes', 'edges'):
+            array_schema = properties.get(array_name, {})
+            item_schema = array_schema.get('items')
+            if set(array_schema) - ANNOTATION_KEYWORDS - {'type', 'items'} or not isinstance(item_schema, dict):
+                continue  # Leave unusual array schemas to the full validator
+            shell_schema['properties'][array_name] = {'type': 'array'}
+            self.item_validators[array_name] = validator_class(item_schema)
+            self.fast_checks[array_name] = compile_fast_check(item_schema)
+
+        self.shell_validator = validator_class(shell_schema)
+
+    @classmethod
+    def from_file(cls, schema_path: str) -> 'CompiledValidator':
+        """Load and compile a schema, reusing earlier work where possible."""
+        import hashlib
+
+        path = Path(schema_path).resolve()
+        raw = path.read_bytes()
+        digest = hashlib.sha256(raw).hexdigest()
+        if cls._loaded.get(path, (None,))[0] == digest:
+            return cls._loaded[path][1]
+
+        # learning-graph-schema.json -> learning-graph-schema.cache.json
+        marker = path.with_suffix('.cache.json')
+        try:
+            schema_checked = json.loads(marker.read_text())['checked_sha256'] == digest
+        except (OSError, ValueError, KeyError):
+            schema_checked = False
+
+        compiled = cls(json.loads(raw), schema_checked)
+        if not schema_checked:
+            try:
+                marker.write_text(json.dumps({'checked_sha256': digest}))
+            except OSError:
+                pass  # Read-only checkout: just check the schema every run
+
+        cls._loaded[path] = (digest, compiled)
+        return compiled
+
+    def iter_errors(self, data, batch_size: int = 1000):
+        """
+        Yield (path, message) for every schema error in the document.
+
+        Once iteration finishes, `stats` holds the node IDs, duplicate IDs
+        and edge endpoint IDs gathered during the same pass.
+        """
+        self.stats = {'node_ids': set(), 'duplicates': set(), 'connected': set()}
+
+        if not isinstance(data, dict):
+            for error in self.shell_validator.iter_errors(data):
+                yield list(error.absolute_path), error.message
+            return
+
+        shell = {key: ([] if key in self.item_validators else value)
+                 for key, value in data.items()}
+        for error in self.shell_validator.iter_errors(shell):
+            yield list(error.absolute_path), error.message
+
+        for array_name, validator in self.item_validators.items():
+            items = data.get(array_name)
+            if not isinstance(items, list):
+                continue
+            check = self.fast_checks[array_name]
+            for start in range(0, len(items), batch_size):
+                batch = items[start:start + batch_size]
+                if check is not None:
+                    failed = [i for i, item in enumerate(batch) if not check(item)]
+                else:
+                    failed = range(len(batch))
+                for i in failed:
+                    for error in validator.iter_errors(batch[i]):
+                        yield [array_name, start + i] + list(error.absolute_path), error.message
+                self._collect_stats(array_name, batch)
+
+    def _collect_stats(self, array_name, batch):
+        # IDs of any other type (lists, objects, null) are schema errors that
+        # have already been reported, and lists and objects are not hashable
+        stats = self.stats
+        if array_name == 'nodes':
+            node_ids = stats['node_ids']
+            for node in batch:
+                node_id = node.get('id') if isinstance(node, dict) else None
+                if not isinstance(node_id, ID_TYPES):
+                    continue
+                if node_id in node_ids:
+                    stats['duplicates'].add(node_id)
+                node_ids.add(node_id)
+        else:
+            connected = stats['connected']
+            for edge in batch:
+                if not isinstance(edge, dict):
+                    continue
+                for end in (edge.get('from'), edge.get('to')):
+                    if isinstance(end, ID_TYPES):
+                        connected.add(end)
+
+
+def validate_learning_graph_fast(data_path, schema_path, data=None, compiled=None,
+                                 max_errors: int = 20):
+    """Validate with a CompiledValidator and report every error, not just the first.
+
+    Orphans, duplicate IDs and dangling edges are gathered during the same
+    pass over the nodes and edges.
+    """
+    try:
+        if compiled is None:
+            compiled = CompiledValidator.from_file(schema_path)
+        if data is None:
+            with open(data_path, 'r') as f:
+                data = json.load(f)
+    except ImportError:
+        print(f"{RED}Error: jsonschema library not found{NC}")
+        print("\nPlease install it with:")
+        print("  pip install jsonschema")
+        return False
+    except json.JSONDecodeError as e:
+        print(f"{RED}✗ File is not valid JSON: {e}{NC}")
+        return False
+    except Exception as e:
+        print(f"{RED}✗ Error loading schema or data: {e}{NC}")
+        return False
+
+    errors = list(compiled.iter_errors(data))
+    if errors:
+        print(f"{RED}✗ Validation failed with {len(errors)} error(s)!{NC}")
+        print("")
+        for path, message in errors[:max_errors]:
+            print(f"  - {' -> '.join(str(p) for p in path) or '(document)'}: {message}")
+        if len(errors) > max_errors:
+            print(f"  ... and {len(errors) - max_errors} more")
+        return False
+
+    stats = compiled.stats
+    metadata = data.get('metadata', {})
+    print(f"{GREEN}✓ Validation successful!{NC}")
+    print("")
+    print("Summary:")
+    print(f"  Title: {metadata.get('title', 'N/A')}")
+    print(f"  Creator: {metadata.get('creator', 'N/A')}")
+    print(f"  Version: {metadata.get('version', 'N/A')}")
+    print(f"  Date: {metadata.get('date', 'N/A')}")
+    print(f"  License: {metadata.get('license', 'N/A')}")
+    print(f"  Groups: {len(data.get('groups', {}))}")
+    print(f"  Nodes: {len(data.get('nodes', []))}")
+    print(f"  Edges: {len(data.get('edges', []))}")
+
+    orphans = stats['node_ids'] - stats['connected']
+    if orphans:
+        print(f"  {YELLOW}Orphaned nodes: {len(orphans)} (completely disconnected — no inbound or outbound edges){NC}")
+        if len(orphans) <= 10:
+            orphan_labels = [node['label'] for node in data['nodes'] if node['id'] in orphans]
+            print(f"    {', '.join(orphan_labels)}")
+    else:
+        print(f"  Orphaned nodes: 0")
+
+    if stats['duplicates']:
+        print(f"  {RED}Warning: Duplicate node IDs found: {stats['duplicates']}{NC}")
+
+    dangling = stats['connected'] - stats['node_ids']
+    if dangling:
+        invalid_edges = [edge for edge in data['edges']
+                         if edge['from'] in dangling or edge['to'] in dangling]
+        print(f"  {RED}Warning: Invalid edges found:{NC}")
+        for edge in invalid_edges[:5]:  # Show first 5
+            missing = edge['from'] if edge['from'] in dangling else edge['to']
+            print(f"    - Edge from {edge['from']} -> {edge['to']}: node {missing} doesn't exist")
+        if len(invalid_edges) > 5:
+            print(f"    ... and {len(invalid_edges) - 5} more")
+
+    return True
+
+
 def main():
     """Main entry point."""
-    if len(sys.argv) != 3:
+    fast = '--fast' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg != '--fast']
+    if len(args) != 2:
         print(f"{RED}Error: Wrong number of arguments{NC}")
-        print(f"Usage: {sys.argv[0]} <data-file> <schema-file>")
+        print(f"Usage: {sys.argv[0]} <data-file> <schema-file> [--fast]")
+        print("  --fast  compiled validator that reports every error in one pass")
         sys.exit(1)
 
-    data_file = sys.argv[1]
-    schema_file = sys.argv[2]
+    data_file = args[0]
+    schema_file = args[1]
 
     # Validate the learning graph
-    success = validate_learning_graph(data_file, schema_file)
+    if fast:
+        success = validate_learning_graph_fast(data_file, schema_file)
+    else:
+        success = validate_learning_graph(data_file, schema_file)
     sys.exit(0 if success else 1)
 
 
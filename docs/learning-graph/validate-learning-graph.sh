@@ -2,7 +2,7 @@
 
 # validate-learning-graph.sh
 # Validates a learning graph JSON file against the learning-graph-schema.json
-# Usage: ./validate-learning-graph.sh <path-to-learning-graph.json>
+# Usage: ./validate-learning-graph.sh <path-to-learning-graph.json> [--fast]
 
 set -e
 
@@ -47,7 +47,8 @@ echo "Schema file: $SCHEMA_FILE"
 echo ""
 
 # Run Python validation on the input file against the schema
-python3 "$SCRIPT_DIR/validate-learning-graph.py" "$INPUT_FILE" "$SCHEMA_FILE"
+# (extra arguments such as --fast are passed through)
+python3 "$SCRIPT_DIR/validate-learning-graph.py" "$INPUT_FILE" "$SCHEMA_FILE" "${@:2}"
 
 # Capture exit code
 EXIT_CODE=$?
@@ -17,6 +17,14 @@ async function loadGraph() {
         const response = await fetch('../../learning-graph/learning-graph.json');
         const data = await response.json();
 
+        // Compact files (csv-to-json.py --compact) use short keys listed in keyMap
+        if (data.keyMap) {
+            const expand = item => Object.fromEntries(
+                Object.entries(item).map(([key, value]) => [data.keyMap[key] || key, value]));
+            data.nodes = (data.nodes || []).map(expand);
+            data.edges = (data.edges || []).map(expand);
+        }
+
         allNodes = data.nodes || [];
         groups = data.groups || {};
 
@@ -65,6 +73,11 @@ function initializeNetwork() {
 
     const data = { nodes, edges };
 
+    // Positions written by csv-to-json.py --layout make the physics
+    // simulation unnecessary, so the graph is drawn immediately
+    const precomputedLayout = allNodes.length > 0 &&
+        allNodes.every(node => Number.isFinite(node.x) && Number.isFinite(node.y));
+
     // Build vis-network groups configuration from JSON groups
     const visGroups = {};
     Object.entries(groups).forEach(([groupId, groupInfo]) => {
@@ -91,10 +104,10 @@ function initializeNetwork() {
         groups: visGroups,
         layout: {
             randomSeed: 42,
-            improvedLayout: true
+            improvedLayout: !precomputedLayout
         },
         physics: {
-            enabled: true,
+            enabled: !precomputedLayout,
             solver: 'forceAtlas2Based',
             forceAtlas2Based: {
                 gravitationalConstant: -50,
@@ -139,11 +152,23 @@ function initializeNetwork() {
     network = new vis.Network(container, data, options);
 
     // Remove the loading message once the initial layout is computed.
-    network.once('stabilizationIterationsDone', () => {
+    network.once(precomputedLayout ? 'afterDrawing' : 'stabilizationIterationsDone', () => {
         const msg = document.getElementById('loading-message');
         if (msg) msg.remove();
     });
 
+    // Handle node selection
+    network.on('selectNode', function(params) {
+        if (params.nodes.length > 0) {
+            highlightNode(params.nodes[0]);
+        }
+    });
+
+    // Nodes keep their precomputed positions; dragging just moves one node
+    if (precomputedLayout) {
+        return;
+    }
+
     // Turn off physics after 5 seconds to stop spinning
     setTimeout(() => {
         network.setOptions({ physics: { enabled: false } });
@@ -164,13 +189,6 @@ function initializeNetwork() {
             }, 1000);
         }
     });
-
-    // Handle node selection
-    network.on('selectNode', function(params) {
-        if (params.nodes.length > 0) {
-            highlightNode(params.nodes[0]);
-        }
-    });
 }
 
 // Build the category legend
@@ -0,0 +1,110 @@
+"""Micro-benchmark for the social_override hook.
+
+Runs the current `on_post_page` and the previous implementation (which
+compiled both patterns on every call and scanned the whole document up to
+four times) over every page of a built site, checks that both produce the
+same HTML, and prints the timings.
+
+Usage:
+    mkdocs build
+    python plugins/benchmark_social_override.py [site_dir] [--repeat N]
+
+Every page is treated as if it declared `image:` in its frontmatter, which
+is the case where the hook does real work.
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from social_override import on_post_page  # noqa: E402
+
+
+def previous_on_post_page(html, page, config, **kwargs):
+    """The hook as it was before the patterns were precompiled."""
+    image = (page.meta or {}).get("image")
+    if not image:
+        return html
+
+    site_url = config.get("site_url") or ""
+    if not site_url:
+        return html
+
+    if image.startswith(("http://", "https://")):
+        image_url = image
+    else:
+        image_url = site_url.rstrip("/") + "/" + image.lstrip("/")
+
+    og_tag = f'<meta property="og:image" content="{image_url}">'
+    og_pattern = re.compile(
+        r'<meta\s+property="og:image"\s+content="[^"]*"[^>]*>'
+    )
+    if og_pattern.search(html):
+        html = og_pattern.sub(og_tag, html, count=1)
+    else:
+        html = html.replace("</head>", f"  {og_tag}\n</head>", 1)
+
+    tw_tag = f'<meta name="twitter:image" content="{image_url}">'
+    tw_pattern = re.compile(
+        r'<meta\s+(?:property|name)="twitter:image"\s+content="[^"]*"[^>]*>'
+    )
+    if tw_pattern.search(html):
+        html = tw_pattern.sub(tw_tag, html, count=1)
+    else:
+        html = html.replace("</head>", f"  {tw_tag}\n</head>", 1)
+
+    return html
+
+
+def time_hook(hook, pages, page, config, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        # Patterns compiled by earlier runs would otherwise hide the cost
+        re.purge()
+        start = time.perf_counter()
+        for html in pages:
+            hook(html, page, config)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    args = sys.argv[1:]
+    repeat = 5
+    if "--repeat" in args:
+        i = args.index("--repeat")
+        repeat = int(args[i + 1])
+        del args[i:i + 2]
+    site_dir = Path(args[0] if args else "site")
+
+    paths = sorted(site_dir.rglob("*.html"))
+    if not paths:
+        print(f"No built pages found in {site_dir}/ - run `mkdocs build` first")
+        sys.exit(1)
+    pages = [p.read_text(encoding="utf-8") for p in paths]
+
+    page = SimpleNamespace(meta={"image": "img/cover.png"})
+    config = {"site_url": "https://dmccreary.github.io/learning-micropython/"}
+
+    mismatches = [p for p, html in zip(paths, pages)
+                  if on_post_page(html, page, config) != previous_on_post_page(html, page, config)]
+
+    size_mb = sum(len(html) for html in pages) / 1e6
+    before = time_hook(previous_on_post_page, pages, page, config, repeat)
+    after = time_hook(on_post_page, pages, page, config, repeat)
+
+    print(f"{len(pages)} pages, {size_mb:.1f} MB of HTML (best of {repeat})")
+    print(f"  previous hook: {before * 1000:8.1f} ms  ({before / len(pages) * 1e6:6.1f} us/page)")
+    print(f"  current hook:  {after * 1000:8.1f} ms  ({after / len(pages) * 1e6:6.1f} us/page)")
+    print(f"  speedup:       {before / after:8.1f}x")
+    if mismatches:
+        print(f"\n{len(mismatches)} pages differ, e.g. {mismatches[0]}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
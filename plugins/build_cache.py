@@ -0,0 +1,245 @@
+"""MkDocs hook that reuses rendered page content between builds.
+
+Converting Markdown to HTML (with pymdownx, admonitions, arithmatex and the
+glightbox/search post-processing) is the slow part of rendering a page. This
+hook keeps a content-hash manifest in `.cache/plugin/build-cache/` so a page
+whose inputs have not changed since the previous build skips the Markdown
+conversion and reuses the HTML, table of contents and title from last time.
+
+A page's cache key covers:
+    - its Markdown source and frontmatter
+    - its URL and position in the nav (parents, previous and next page)
+    - the contents of any `--8<--` snippet files it includes
+    - a site fingerprint: markdown_extensions and their configs, the list
+      of plugins, the list of documentation files (relative links are
+      resolved against it), the MkDocs version and this hook's own source
+
+The manifest also records a hash of every rendered output page, and the
+build ends with a report of the cache hit rate and how many output pages
+actually changed.
+
+Pages are still run through the theme templates, so navigation and other
+site-wide changes always show up. Link warnings for an unchanged page are
+only printed by the build that rendered it.
+
+Set MKDOCS_BUILD_CACHE=0 to render every page, or delete
+.cache/plugin/build-cache/ to start from an empty cache.
+
+Loaded via the `hooks:` entry in mkdocs.yml, like social_override.py.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+from pathlib import Path
+
+import mkdocs
+from mkdocs.plugins import event_priority
+from mkdocs.structure.toc import AnchorLink, TableOfContents
+
+log = logging.getLogger("mkdocs.hooks.build_cache")
+
+CACHE_DIR = Path(".cache", "plugin", "build-cache")
+MANIFEST_NAME = "manifest.json"
+
+SNIPPET_PATTERN = re.compile(r'^\s*-{1,}8<-{1,}\s+["\']([^"\']+)["\']', re.MULTILINE)
+
+# Per-build state, reset in on_config at the start of every build
+_state = {}
+
+
+def _sha1(*parts):
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _toc_to_json(items):
+    return [{"title": item.title, "id": item.id, "level": item.level,
+             "children": _toc_to_json(item.children)} for item in items]
+
+
+def _toc_from_json(items):
+    links = []
+    for item in items:
+        link = AnchorLink(item["title"], item["id"], item["level"])
+        link.children = _toc_from_json(item["children"])
+        links.append(link)
+    return links
+
+
+def _nav_position(page):
+    """Titles and URLs that place the page in the nav."""
+    parents = []
+    parent = page.parent
+    while parent is not None:
+        parents.append(parent.title or "")
+        parent = parent.parent
+    neighbours = [other.url if other is not None else ""
+                  for other in (page.previous_page, page.next_page)]
+    return json.dumps([page.url, parents, neighbours])
+
+
+def _snippet_hashes(markdown, page, config):
+    """Hash every --8<-- snippet file the page includes."""
+    base_dirs = [Path(config.config_file_path or ".").parent, Path(config.docs_dir),
+                 Path(page.file.abs_src_path or ".").parent]
+    hashes = []
+    for name in SNIPPET_PATTERN.findall(markdown):
+        for base in base_dirs:
+            path = base / name
+            if path.is_file():
+                hashes.append(_sha1(name, path.read_bytes()))
+                break
+        else:
+            hashes.append(_sha1(name, "missing"))
+    return hashes
+
+
+def on_config(config, **kwargs):
+    enabled = os.environ.get("MKDOCS_BUILD_CACHE", "1") != "0"
+    cache_dir = Path(config.config_file_path or ".").parent / CACHE_DIR
+
+    manifest = {"fingerprint": None, "pages": {}, "outputs": {}}
+    manifest_path = cache_dir / MANIFEST_NAME
+    if enabled and manifest_path.exists():
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as e:
+            log.warning(f"Ignoring unreadable build cache manifest: {e}")
+
+    _state.clear()
+    _state.update({
+        "enabled": enabled,
+        "cache_dir": cache_dir,
+        "previous": manifest,
+        "pages": {},
+        "outputs": {},
+        "keys": {},
+        "hits": 0,
+        "misses": 0,
+        "unchanged_outputs": 0,
+    })
+    return config
+
+
+def on_files(files, config, **kwargs):
+    _state["sources"] = {f.src_uri for f in files.documentation_pages()}
+    _state["fingerprint"] = _sha1(
+        mkdocs.__version__,
+        Path(__file__).read_bytes(),
+        json.dumps(config.markdown_extensions, default=str),
+        json.dumps(config.mdx_configs, sort_keys=True, default=str),
+        json.dumps(list(config.plugins)),
+        json.dumps(sorted(_state["sources"])),
+        str(config.use_directory_urls),
+    )
+    if _state["fingerprint"] != _state["previous"].get("fingerprint"):
+        _state["previous"]["pages"] = {}
+    return files
+
+
+@event_priority(-100)
+def on_page_markdown(markdown, page, config, files, **kwargs):
+    if not _state.get("enabled"):
+        return markdown
+
+    src = page.file.src_uri
+    key = _sha1(
+        markdown,
+        json.dumps(page.meta, sort_keys=True, default=str),
+        _nav_position(page),
+        *_snippet_hashes(markdown, page, config),
+    )
+    _state["keys"][src] = key
+
+    entry = _state["previous"]["pages"].get(src)
+    content_path = _state["cache_dir"] / "pages" / f"{key}.html"
+    if entry and entry["key"] == key and content_path.exists():
+        _state["hits"] += 1
+        _state["pages"][src] = entry
+        # Nothing left to convert; on_page_content puts the cached HTML back
+        return ""
+
+    _state["misses"] += 1
+    return markdown
+
+
+@event_priority(-100)
+def on_page_content(html, page, config, files, **kwargs):
+    if not _state.get("enabled"):
+        return html
+
+    src = page.file.src_uri
+    key = _state["keys"][src]
+    content_path = _state["cache_dir"] / "pages" / f"{key}.html"
+
+    if src in _state["pages"]:
+        entry = _state["pages"][src]
+        page.toc = TableOfContents(_toc_from_json(entry["toc"]))
+        page._title_from_render = entry["title"]
+        page.present_anchor_ids = set(entry["anchors"])
+        return content_path.read_text(encoding="utf-8")
+
+    content_path.parent.mkdir(parents=True, exist_ok=True)
+    content_path.write_text(html, encoding="utf-8")
+    _state["pages"][src] = {
+        "key": key,
+        "toc": _toc_to_json(page.toc),
+        "title": getattr(page, "_title_from_render", None),
+        "anchors": sorted(page.present_anchor_ids or ()),
+    }
+    return html
+
+
+@event_priority(-100)
+def on_post_page(output, page, config, **kwargs):
+    if not _state.get("enabled"):
+        return output
+
+    digest = _sha1(output)
+    src = page.file.src_uri
+    _state["outputs"][src] = digest
+    if _state["previous"].get("outputs", {}).get(src) == digest:
+        _state["unchanged_outputs"] += 1
+    return output
+
+
+def on_post_build(config, **kwargs):
+    if not _state.get("enabled"):
+        return
+
+    # Keep entries for pages that were not rendered this time (mkdocs --dirty)
+    pages = {src: entry for src, entry in _state["previous"]["pages"].items()
+             if src in _state["sources"]}
+    pages.update(_state["pages"])
+    outputs = {src: digest for src, digest in _state["previous"].get("outputs", {}).items()
+               if src in _state["sources"]}
+    outputs.update(_state["outputs"])
+
+    cache_dir = _state["cache_dir"]
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    manifest = {
+        "fingerprint": _state["fingerprint"],
+        "pages": pages,
+        "outputs": outputs,
+    }
+    (cache_dir / MANIFEST_NAME).write_text(json.dumps(manifest), encoding="utf-8")
+
+    # Drop cached HTML that no page refers to any more
+    live = {entry["key"] for entry in pages.values()}
+    for path in (cache_dir / "pages").glob("*.html"):
+        if path.stem not in live:
+            path.unlink()
+
+    total = _state["hits"] + _state["misses"]
+    if total:
+        log.info(
+            f"Build cache: {_state['hits']}/{total} pages reused "
+            f"({_state['hits'] / total:.1%} hit rate), {_state['misses']} rendered, "
+            f"{len(_state['outputs']) - _state['unchanged_outputs']} output pages changed"
+        )
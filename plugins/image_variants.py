@@ -0,0 +1,263 @@
+"""MkDocs hook that serves resized, responsive variants of large doc images.
+
+Many images under docs/ (the posters in particular) are multi-megabyte
+PNGs that were being sent at full size to every reader. For every PNG, JPEG
+or static GIF larger than MIN_BYTES this hook generates:
+    - WebP copies at each of WIDTHS that is smaller than the image, plus one
+      at the original width
+    - PNG (or JPEG) copies at the same smaller widths, for browsers without
+      WebP support
+
+and rewrites matching `<img>` tags in the rendered pages to
+
+    <picture>
+      <source type="image/webp" srcset="x-480w.webp 480w, ..." sizes="...">
+      <img src="x.png" srcset="x-480w.png 480w, ..., x.png 2400w" sizes="..."
+           width="2400" height="1600" ...>
+    </picture>
+
+so each reader downloads the smallest image that fills their screen. The
+`src` attribute, and therefore the glightbox full-size view, still points
+at the original file.
+
+Variants are generated across a process pool and cached in
+`.cache/plugin/image-variants/<sha1 of the source image>/`, so an image is
+only processed again when its bytes (or WIDTHS/quality settings) change.
+
+Requires Pillow (installed with mkdocs-material[imaging]); without it the
+hook does nothing. Set MKDOCS_IMAGE_VARIANTS=0 to turn it off.
+
+Loaded via the `hooks:` entry in mkdocs.yml, like social_override.py.
+"""
+
+import hashlib
+import importlib
+import json
+import logging
+import os
+import posixpath
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from urllib.parse import unquote
+
+from mkdocs.plugins import event_priority
+from mkdocs.structure.files import File
+
+log = logging.getLogger("mkdocs.hooks.image_variants")
+
+CACHE_DIR = Path(".cache", "plugin", "image-variants")
+META_NAME = "meta.json"
+
+WIDTHS = (480, 960, 1600)
+WEBP_QUALITY = 80
+JPEG_QUALITY = 85
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif"}
+MIN_BYTES = 100_000  # smaller images are served as they are
+CONTENT_WIDTH = 960  # widest the Material content column gets, in CSS pixels
+
+# Part of every cache key, so changing a setting regenerates the variants
+SETTINGS = json.dumps([WIDTHS, WEBP_QUALITY, JPEG_QUALITY, 1])
+
+IMG_PATTERN = re.compile(r"<img\b[^>]*>", re.IGNORECASE)
+ATTR_PATTERN = re.compile(r'\s(src|srcset|width|height)="([^"]*)"', re.IGNORECASE)
+
+# Per-build state, reset in on_config at the start of every build
+_state = {}
+
+
+def make_variants(src_path, out_dir):
+    """Write the resized variants of one image into out_dir.
+
+    Runs in a worker process. Returns the metadata that is also saved as
+    out_dir/meta.json; "variants" is empty for images that are skipped.
+    """
+    from PIL import Image
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    meta = {"variants": []}
+
+    with Image.open(src_path) as image:
+        width, height = image.size
+        meta.update(width=width, height=height)
+
+        if not getattr(image, "is_animated", False):
+            fallback = "jpg" if image.format == "JPEG" else "png"
+            has_alpha = "A" in image.getbands() or "transparency" in image.info
+            image = image.convert("RGBA" if has_alpha else "RGB")
+
+            for w in [w for w in WIDTHS if w < width] + [width]:
+                resized = image
+                if w < width:
+                    resized = image.resize((w, max(1, round(height * w / width))),
+                                           Image.LANCZOS)
+                    if fallback == "jpg":
+                        resized.save(out_dir / f"{w}.jpg", "JPEG",
+                                     quality=JPEG_QUALITY, optimize=True)
+                    else:
+                        resized.save(out_dir / f"{w}.png", "PNG")
+                resized.save(out_dir / f"{w}.webp", "WEBP", quality=WEBP_QUALITY, method=4)
+                meta["variants"].append(w)
+            meta["fallback"] = fallback
+
+    (out_dir / META_NAME).write_text(json.dumps(meta), encoding="utf-8")
+    return meta
+
+
+def _file_digest(path):
+    digest = hashlib.sha1(SETTINGS.encode("utf-8"))
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _process_pool_worker():
+    """make_variants, imported so that worker processes can unpickle it.
+
+    MkDocs imports hooks under their file path, which is not an importable
+    module name in a child process.
+    """
+    plugin_dir = str(Path(__file__).resolve().parent)
+    if plugin_dir not in sys.path:
+        sys.path.insert(0, plugin_dir)
+    return importlib.import_module(Path(__file__).stem).make_variants
+
+
+def on_config(config, **kwargs):
+    enabled = os.environ.get("MKDOCS_IMAGE_VARIANTS", "1") != "0"
+    if enabled:
+        try:
+            import PIL  # noqa: F401
+        except ImportError:
+            log.info("Pillow is not installed; serving images without resized variants")
+            enabled = False
+
+    _state.clear()
+    _state.update({
+        "enabled": enabled,
+        "cache_dir": Path(config.config_file_path or ".").parent / CACHE_DIR,
+        "images": {},
+    })
+    return config
+
+
+def on_files(files, config, **kwargs):
+    if not _state.get("enabled"):
+        return files
+
+    start = time.perf_counter()
+    cache_dir = _state["cache_dir"]
+    images = [f for f in files
+              if posixpath.splitext(f.src_uri)[1].lower() in IMAGE_SUFFIXES
+              and f.abs_src_path and os.path.getsize(f.abs_src_path) >= MIN_BYTES]
+    digests = {f.src_uri: _file_digest(f.abs_src_path) for f in images}
+
+    metas = {}
+    todo = []
+    for f in images:
+        meta_path = cache_dir / digests[f.src_uri] / META_NAME
+        if meta_path.exists():
+            metas[f.src_uri] = json.loads(meta_path.read_text(encoding="utf-8"))
+        else:
+            todo.append(f)
+
+    if todo:
+        worker = _process_pool_worker()
+        with ProcessPoolExecutor() as pool:
+            futures = {pool.submit(worker, f.abs_src_path,
+                                   str(cache_dir / digests[f.src_uri])): f for f in todo}
+            for future in as_completed(futures):
+                f = futures[future]
+                try:
+                    metas[f.src_uri] = future.result()
+                except Exception as e:
+                    log.warning(f"Could not create variants of {f.src_uri}: {e}")
+
+    original_bytes = variant_bytes = 0
+    for f in images:
+        meta = metas.get(f.src_uri)
+        if not meta or not meta["variants"]:
+            continue
+        out_dir = cache_dir / digests[f.src_uri]
+        stem, _ = posixpath.splitext(f.dest_uri)
+        for w in meta["variants"]:
+            suffixes = ["webp"] if w == meta["width"] else ["webp", meta["fallback"]]
+            for suffix in suffixes:
+                files.append(File.generated(config, f"{stem}-{w}w.{suffix}",
+                                            abs_src_path=str(out_dir / f"{w}.{suffix}")))
+        _state["images"][f.dest_uri] = meta
+
+        # What a desktop reader with a full-width content column downloads
+        typical = min((w for w in meta["variants"] if w >= CONTENT_WIDTH), default=meta["width"])
+        original_bytes += os.path.getsize(f.abs_src_path)
+        variant_bytes += (out_dir / f"{typical}.webp").stat().st_size
+
+    _state["digests"] = set(digests.values())
+    if _state["images"]:
+        log.info(
+            f"Image variants: {len(_state['images'])} of {len(images)} large images resized, "
+            f"{len(todo)} processed, {len(images) - len(todo)} reused from cache "
+            f"({time.perf_counter() - start:.1f} s); at {CONTENT_WIDTH}px readers download "
+            f"{variant_bytes / 1e6:.1f} MB instead of {original_bytes / 1e6:.1f} MB"
+        )
+    return files
+
+
+def _picture(tag, page_dir):
+    """Wrap one <img> tag in a <picture> with srcset, or return it unchanged."""
+    attrs = {name.lower(): value for name, value in ATTR_PATTERN.findall(tag)}
+    src = attrs.get("src", "")
+    if "srcset" in attrs or not src or src.startswith(("/", "data:")) or "://" in src:
+        return tag
+
+    uri = posixpath.normpath(posixpath.join(page_dir, unquote(src.split("#")[0])))
+    meta = _state["images"].get(uri)
+    if meta is None:
+        return tag
+
+    stem = posixpath.splitext(src)[0]
+    full_width = meta["width"]
+    webp = ", ".join(f"{stem}-{w}w.webp {w}w" for w in meta["variants"])
+    fallback = ", ".join(f"{stem}-{w}w.{meta['fallback']} {w}w"
+                         for w in meta["variants"] if w < full_width)
+    fallback += f"{', ' if fallback else ''}{src} {full_width}w"
+
+    display = attrs.get("width", "")
+    display_width = min(int(display) if display.isdigit() else full_width, CONTENT_WIDTH)
+    sizes = f"(max-width: {display_width}px) 100vw, {display_width}px"
+
+    extra = f' srcset="{fallback}" sizes="{sizes}"'
+    if "width" not in attrs and "height" not in attrs:
+        extra += f' width="{full_width}" height="{meta["height"]}"'
+    end = -2 if tag.endswith("/>") else -1
+    img = tag[:end].rstrip() + extra + tag[end:]
+    return (f'<picture><source type="image/webp" srcset="{webp}" sizes="{sizes}">'
+            f'{img}</picture>')
+
+
+# Runs after build_cache.py restores cached page HTML, so the srcset always
+# matches the current images
+@event_priority(-200)
+def on_page_content(html, page, config, files, **kwargs):
+    if not _state.get("images"):
+        return html
+
+    dest_dir = posixpath.dirname(page.file.dest_uri)
+    return IMG_PATTERN.sub(lambda match: _picture(match.group(0), dest_dir), html)
+
+
+def on_post_build(config, **kwargs):
+    if not _state.get("enabled"):
+        return
+
+    # Drop variants of images that were changed or deleted
+    cache_dir = _state["cache_dir"]
+    if cache_dir.exists():
+        for path in cache_dir.iterdir():
+            if path.is_dir() and path.name not in _state.get("digests", ()):
+                shutil.rmtree(path, ignore_errors=True)
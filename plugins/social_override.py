@@ -19,6 +19,36 @@ called `social_override` or a top-level module called `plugins`.
 
 import re
 
+# Compiled once at import time. Both tags are matched by one pattern so the
+# head is scanned a single time; the `kind` group tells them apart.
+IMAGE_META_PATTERN = re.compile(
+    r'<meta\s+(?P<kind>property="og:image"|(?:property|name)="twitter:image")'
+    r'\s+content="[^"]*"[^>]*>'
+)
+
+HEAD_END = "</head>"
+
+
+def rewrite_head(head, og_tag, tw_tag):
+    """Replace the first og:image and twitter:image tags in `head`.
+
+    Tags that are missing are appended to the end of `head`.
+    """
+    replaced = {}
+
+    def replace(match):
+        tag = og_tag if "og:image" in match.group("kind") else tw_tag
+        if tag in replaced:
+            return match.group(0)
+        replaced[tag] = True
+        return tag
+
+    head = IMAGE_META_PATTERN.sub(replace, head)
+    for tag in (og_tag, tw_tag):
+        if tag not in replaced:
+            head += f"  {tag}\n"
+    return head
+
 
 def on_post_page(html, page, config, **kwargs):
     image = (page.meta or {}).get("image")
@@ -35,21 +65,10 @@ def on_post_page(html, page, config, **kwargs):
         image_url = site_url.rstrip("/") + "/" + image.lstrip("/")
 
     og_tag = f'<meta property="og:image" content="{image_url}">'
-    og_pattern = re.compile(
-        r'<meta\s+property="og:image"\s+content="[^"]*"[^>]*>'
-    )
-    if og_pattern.search(html):
-        html = og_pattern.sub(og_tag, html, count=1)
-    else:
-        html = html.replace("</head>", f"  {og_tag}\n</head>", 1)
-
     tw_tag = f'<meta name="twitter:image" content="{image_url}">'
-    tw_pattern = re.compile(
-        r'<meta\s+(?:property|name)="twitter:image"\s+content="[^"]*"[^>]*>'
-    )
-    if tw_pattern.search(html):
-        html = tw_pattern.sub(tw_tag, html, count=1)
-    else:
-        html = html.replace("</head>", f"  {tw_tag}\n</head>", 1)
 
-    return html
+    # Only the <head> is scanned; the (much larger) body is passed through
+    head_end = html.find(HEAD_END)
+    if head_end == -1:
+        return html
+    return rewrite_head(html[:head_end], og_tag, tw_tag) + html[head_end:]
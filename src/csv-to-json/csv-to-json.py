@@ -1,32 +1,42 @@
 import csv
 import json
 
-def csv_to_visjs_json(csv_filename, json_filename):
-    nodes = []
-    edges = []
-    categories = {}
+# Short keys used by the compact output, as in docs/learning-graph/csv-to-json.py.
+# The reverse mapping is written into the file as "keyMap" so the graph viewer
+# can expand them to vis.js names.
+COMPACT_KEYS = {
+    'id': 'i',
+    'label': 'l',
+    'group': 'g',
+    'from': 'f',
+    'to': 't',
+}
 
-    # Read the CSV file
+def read_rows(csv_filename, report_errors=True):
+    """Yield (node, edges) for each valid CSV row without keeping earlier rows."""
     with open(csv_filename, 'r', newline='', encoding='utf-8') as csvfile:
         reader = csv.DictReader(csvfile)
-        
+
         for row in reader:
             # Extract node information
             try:
                 concept_id = int(row['ConceptID'])
             except ValueError:
-                print(f"Invalid ID '{row['ID']}' skipped.")
+                if report_errors:
+                    print(f"Invalid ID '{row['ConceptID']}' skipped.")
                 continue  # Skip rows with invalid ID
 
             concept_name = row['ConceptLabel'].strip()
             if not concept_name:
-                print(f"Empty Concept Name for ID {concept_id} skipped.")
+                if report_errors:
+                    print(f"Empty Concept Name for ID {concept_id} skipped.")
                 continue  # Skip nodes without a name
 
             try:
                 category_id = int(row['TaxonomyID'])
             except ValueError:
-                print(f"Invalid Category ID '{row['Category ID']}' for ID {concept_id} skipped.")
+                if report_errors:
+                    print(f"Invalid Category ID '{row['TaxonomyID']}' for ID {concept_id} skipped.")
                 continue  # Skip rows with invalid Category ID
 
             # Create node object
@@ -35,9 +45,9 @@ def csv_to_visjs_json(csv_filename, json_filename):
                 'label': concept_name,
                 'group': category_id
             }
-            nodes.append(node)
 
             # Process Dependencies to create edges
+            edges = []
             dependency_list = row['Dependencies']
             if dependency_list:
                 dependencies = dependency_list.split('|')
@@ -52,25 +62,66 @@ def csv_to_visjs_json(csv_filename, json_filename):
                             }
                             edges.append(edge)
                         except ValueError:
-                            print(f"Invalid DependencyID '{dep}' for ID {concept_id} skipped.")
+                            if report_errors:
+                                print(f"Invalid DependencyID '{dep}' for ID {concept_id} skipped.")
                             continue  # Skip invalid DependencyIDs
 
-    # If not using separate groups, omit the 'groups' key
-    data = {
-        'nodes': nodes,
-        'edges': edges
-    }
+            yield node, edges
+
+def write_array(jsonfile, items, indent):
+    """Write a JSON array one item at a time."""
+    separator = ','
+    item_pad = '\n' + ' ' * (2 * indent) if indent else ''
+    jsonfile.write('[')
+    empty = True
+    for item in items:
+        text = json.dumps(item, indent=indent, separators=(',', ': ') if indent else (',', ':'))
+        if indent:
+            text = text.replace('\n', item_pad)
+        jsonfile.write(('' if empty else separator) + item_pad + text)
+        empty = False
+    if not empty and indent:
+        jsonfile.write('\n' + ' ' * indent)
+    jsonfile.write(']')
+
+def shorten_keys(item):
+    """Rename the keys of a node or edge to their COMPACT_KEYS short names."""
+    return {COMPACT_KEYS.get(key, key): value for key, value in item.items()}
+
+def csv_to_visjs_json(csv_filename, json_filename, compact=False):
+    """Stream the CSV into vis.js JSON.
 
-    # Write the JSON output
+    Nodes and edges are written as each row is read (the CSV is read once
+    for nodes and once for edges), so memory use stays the same no matter
+    how large the graph is. compact=True drops all indentation, writes the
+    short COMPACT_KEYS names and adds the "keyMap" to expand them.
+    """
+    indent = None if compact else 4
+    newline = '' if compact else '\n'
+    pad = '' if compact else ' ' * indent
+    colon = ':' if compact else ': '
+    keys = shorten_keys if compact else dict
+
+    # If not using separate groups, omit the 'groups' key
     with open(json_filename, 'w', encoding='utf-8') as jsonfile:
-        json.dump(data, jsonfile, indent=4)
+        jsonfile.write('{' + newline + pad + '"nodes"' + colon)
+        write_array(jsonfile, (keys(node) for node, _ in read_rows(csv_filename)), indent)
+        jsonfile.write(',' + newline + pad + '"edges"' + colon)
+        write_array(jsonfile, (keys(edge) for _, edges in read_rows(csv_filename, report_errors=False)
+                               for edge in edges), indent)
+        if compact:
+            key_map = {short: key for key, short in COMPACT_KEYS.items()}
+            jsonfile.write(',"keyMap":' + json.dumps(key_map, separators=(',', ':')))
+        jsonfile.write(newline + '}')
 
     print(f"Successfully converted '{csv_filename}' to '{json_filename}'.")
 
 if __name__ == "__main__":
+    import sys
+
     # Define input and output file names
     input_csv = 'learning-micropython.csv'
     output_json = 'learning-micropython.json'
-    
-    # Convert CSV to JSON
-    csv_to_visjs_json(input_csv, output_json)
+
+    # Convert CSV to JSON (pass --compact for a minified file with short keys)
+    csv_to_visjs_json(input_csv, output_json, compact='--compact' in sys.argv)
@@ -25,6 +25,12 @@ SET_CHARGE_PUMP = const(0x8D)
 
 # Subclassing FrameBuffer provides support for graphics primitives
 # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
+#
+# The drawing methods below also record which columns of each 8 pixel page
+# changed, and show() sends only those instead of the whole buffer. Drawing
+# straight into self.buffer bypasses this; call mark_dirty() for that area
+# (or with no arguments for the whole screen). fill() and scroll() change
+# every page, so erase moving sprites with fill_rect() to keep updates small.
 class SSD1306(framebuf.FrameBuffer):
     def __init__(self, width, height, external_vcc):
         self.width = width
@@ -32,6 +38,10 @@ class SSD1306(framebuf.FrameBuffer):
         self.external_vcc = external_vcc
         self.pages = self.height // 8
         self.buffer = bytearray(self.pages * self.width)
+        self.view = memoryview(self.buffer)
+        # Changed columns per page: dirty_x0 <= x < dirty_x1, empty when equal
+        self.dirty_x0 = bytearray(self.pages)
+        self.dirty_x1 = bytearray(self.pages)
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.init_display()
 
@@ -89,20 +99,155 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_COM_OUT_DIR | ((rotate & 1) << 3))
         self.write_cmd(SET_SEG_REMAP | (rotate & 1))
 
-    def show(self):
-        x0 = 0
-        x1 = self.width - 1
-        if self.width == 64:
-            # displays with width of 64 pixels are shifted by 32
-            x0 += 32
-            x1 += 32
+    def mark_dirty(self, x=0, y=0, w=None, h=None):
+        """Mark a rectangle as changed so the next show() sends it (default: everything)."""
+        if w is None:
+            w = self.width - x
+        if h is None:
+            h = self.height - y
+        x0 = max(x, 0)
+        x1 = min(x + w, self.width)
+        y0 = max(y, 0)
+        y1 = min(y + h, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        dirty_x0 = self.dirty_x0
+        dirty_x1 = self.dirty_x1
+        for page in range(y0 >> 3, ((y1 - 1) >> 3) + 1):
+            if dirty_x0[page] == dirty_x1[page]:
+                dirty_x0[page] = x0
+                dirty_x1[page] = x1
+            else:
+                if x0 < dirty_x0[page]:
+                    dirty_x0[page] = x0
+                if x1 > dirty_x1[page]:
+                    dirty_x1[page] = x1
+
+    def show(self, full=False):
+        """Send the changed part of the buffer, or all of it with full=True."""
+        if full:
+            self.mark_dirty()
+        dirty_x0 = self.dirty_x0
+        dirty_x1 = self.dirty_x1
+        page = 0
+        while page < self.pages:
+            if dirty_x0[page] == dirty_x1[page]:
+                page += 1
+                continue
+            # Send a run of dirty pages as one window spanning their columns
+            first = page
+            x0 = dirty_x0[page]
+            x1 = dirty_x1[page]
+            page += 1
+            while page < self.pages and dirty_x0[page] != dirty_x1[page]:
+                x0 = min(x0, dirty_x0[page])
+                x1 = max(x1, dirty_x1[page])
+                page += 1
+            self.write_window(first, page - 1, x0, x1)
+        for page in range(self.pages):
+            dirty_x0[page] = 0
+            dirty_x1[page] = 0
+
+    def write_window(self, page0, page1, x0, x1):
+        """Send columns x0..x1-1 of pages page0..page1."""
+        offset = 32 if self.width == 64 else 0  # 64 pixel wide displays are shifted by 32
         self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
+        self.write_cmd(x0 + offset)
+        self.write_cmd(x1 - 1 + offset)
         self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        self.write_cmd(page0)
+        self.write_cmd(page1)
+        width = self.width
+        if x0 == 0 and x1 == width:
+            self.write_data(self.view[page0 * width:(page1 + 1) * width])
+            return
+        # The display fills the column window page by page, so send each page's slice
+        for page in range(page0, page1 + 1):
+            start = page * width
+            self.write_data(self.view[start + x0:start + x1])
+
+    # Drawing methods: draw, then record the area they can have touched
+
+    def fill(self, c):
+        super().fill(c)
+        self.mark_dirty()
+
+    def pixel(self, x, y, c=None):
+        if c is None:
+            return super().pixel(x, y)
+        super().pixel(x, y, c)
+        # Inline mark_dirty() as pixel() is often called in tight loops
+        if 0 <= x < self.width and 0 <= y < self.height:
+            page = y >> 3
+            if self.dirty_x0[page] == self.dirty_x1[page]:
+                self.dirty_x0[page] = x
+                self.dirty_x1[page] = x + 1
+            elif x < self.dirty_x0[page]:
+                self.dirty_x0[page] = x
+            elif x >= self.dirty_x1[page]:
+                self.dirty_x1[page] = x + 1
+
+    def hline(self, x, y, w, c):
+        super().hline(x, y, w, c)
+        self.mark_dirty(x, y, w, 1)
+
+    def vline(self, x, y, h, c):
+        super().vline(x, y, h, c)
+        self.mark_dirty(x, y, 1, h)
+
+    def line(self, x1, y1, x2, y2, c):
+        super().line(x1, y1, x2, y2, c)
+        self.mark_dirty(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
+
+    def rect(self, x, y, w, h, c, *fill):
+        super().rect(x, y, w, h, c, *fill)
+        self.mark_dirty(x, y, w, h)
+
+    def fill_rect(self, x, y, w, h, c):
+        super().fill_rect(x, y, w, h, c)
+        self.mark_dirty(x, y, w, h)
+
+    def ellipse(self, x, y, xr, yr, c, *args):
+        super().ellipse(x, y, xr, yr, c, *args)
+        self.mark_dirty(x - xr, y - yr, 2 * xr + 1, 2 * yr + 1)
+
+    def poly(self, x, y, coords, c, *fill):
+        super().poly(x, y, coords, c, *fill)
+        if len(coords) < 2:
+            return
+        # No step slices here: MicroPython arrays only support step 1
+        x0 = x1 = coords[0]
+        y0 = y1 = coords[1]
+        for i in range(2, len(coords) - 1, 2):
+            px = coords[i]
+            py = coords[i + 1]
+            if px < x0:
+                x0 = px
+            elif px > x1:
+                x1 = px
+            if py < y0:
+                y0 = py
+            elif py > y1:
+                y1 = py
+        self.mark_dirty(x + x0, y + y0, x1 - x0 + 1, y1 - y0 + 1)
+
+    def text(self, s, x, y, c=1):
+        super().text(s, x, y, c)
+        self.mark_dirty(x, y, 8 * len(s), 8)
+
+    def scroll(self, xstep, ystep):
+        super().scroll(xstep, ystep)
+        self.mark_dirty()
+
+    def blit(self, fbuf, x, y, *args):
+        super().blit(fbuf, x, y, *args)
+        if isinstance(fbuf, tuple):     # (buffer, width, height, format[, stride])
+            self.mark_dirty(x, y, fbuf[1], fbuf[2])
+        elif hasattr(fbuf, 'width'):
+            self.mark_dirty(x, y, fbuf.width, fbuf.height)
+        else:
+            # A plain FrameBuffer does not expose its size
+            self.mark_dirty()
 
 
 class SSD1306_I2C(SSD1306):
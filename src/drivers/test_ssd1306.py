@@ -0,0 +1,186 @@
+# Host tests for ssd1306.py (CPython):  python3 -m pytest test_ssd1306.py
+#
+# FakeI2C stands in for the bus and for the controller behind it. It decodes
+# the command stream, writes data bytes into its own copy of the display RAM
+# with the same column/page window wrapping as the SSD1306, and counts the
+# bytes each show() puts on the wire.
+
+import array
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+# CPython framebuf, micropython and utime modules
+sys.path.insert(0, os.path.join(HERE, '..', 'tools', 'host'))
+
+import ssd1306
+
+# Commands followed by argument bytes
+COMMAND_ARGS = {0x20: 1, 0x21: 2, 0x22: 2, 0x81: 1, 0xA8: 1, 0xD3: 1,
+                0xDA: 1, 0xD5: 1, 0xD9: 1, 0xDB: 1, 0x8D: 1}
+
+
+class FakeI2C:
+    def __init__(self, width=128, height=64):
+        # The controller always has 128 columns; 64 pixel panels show 32-95
+        self.width = width
+        self.height = height
+        self.offset = 32 if width == 64 else 0
+        self.ram = bytearray(128 * height // 8)
+        self.pending = []       # Command and arguments being collected
+        self.col = (0, 127)
+        self.page = (0, height // 8 - 1)
+        self.x = 0
+        self.y = 0
+        self.bytes_sent = 0
+
+    def writeto(self, addr, buf):
+        self.bytes_sent += 1 + len(buf)     # Address byte plus payload
+        assert buf[0] == 0x80
+        self.command(buf[1])
+
+    def writevto(self, addr, bufs):
+        self.bytes_sent += 1 + sum(len(b) for b in bufs)
+        assert bytes(bufs[0]) == b"\x40"
+        for b in bytes(bufs[1]):
+            self.data(b)
+
+    def command(self, byte):
+        self.pending.append(byte)
+        if len(self.pending) <= COMMAND_ARGS.get(self.pending[0], 0):
+            return
+        cmd, args = self.pending[0], self.pending[1:]
+        self.pending = []
+        if cmd == 0x21:
+            self.col = (args[0], args[1])
+            self.x = args[0]
+        elif cmd == 0x22:
+            self.page = (args[0], args[1])
+            self.y = args[0]
+
+    def data(self, byte):
+        self.ram[self.y * 128 + self.x] = byte
+        self.x += 1
+        if self.x > self.col[1]:
+            self.x = self.col[0]
+            self.y += 1
+            if self.y > self.page[1]:
+                self.y = self.page[0]
+
+    def visible(self):
+        """The part of the display RAM the panel shows, laid out like the driver's buffer."""
+        out = bytearray()
+        for page in range(self.height // 8):
+            start = page * 128 + self.offset
+            out += self.ram[start:start + self.width]
+        return out
+
+
+def make_display(width=128, height=64):
+    bus = FakeI2C(width, height)
+    oled = ssd1306.SSD1306_I2C(width, height, bus)
+    return oled, bus
+
+
+def frame_bytes(oled, bus):
+    bus.bytes_sent = 0
+    oled.show()
+    assert bus.visible() == oled.buffer
+    return bus.bytes_sent
+
+
+def test_full_frame_then_nothing():
+    oled, bus = make_display()
+    oled.fill(0)
+    oled.rect(0, 0, 128, 64, 1)
+    full = frame_bytes(oled, bus)
+    assert full > 1024
+    # Nothing drawn since the last show()
+    assert frame_bytes(oled, bus) == 0
+
+
+def test_score_change_sends_a_small_window():
+    oled, bus = make_display()
+    oled.text("12", 44, 5, 1)
+    oled.vline(64, 0, 64, 1)
+    frame_bytes(oled, bus)
+
+    oled.fill_rect(44, 5, 16, 8, 0)
+    oled.text("13", 44, 5, 1)
+    sent = frame_bytes(oled, bus)
+    # Rows 5-12 cross pages 0 and 1: 2 pages x 16 columns plus commands
+    assert sent < 100
+
+
+def test_moving_ball_only_sends_its_columns():
+    oled, bus = make_display()
+    frame_bytes(oled, bus)
+    x, y = 10, 20
+    sizes = []
+    for _ in range(20):
+        oled.fill_rect(x, y, 3, 3, 0)
+        x += 2
+        y += 1
+        oled.fill_rect(x, y, 3, 3, 1)
+        sizes.append(frame_bytes(oled, bus))
+    assert max(sizes) < 120
+
+
+def test_pixels_lines_and_explicit_marks():
+    oled, bus = make_display()
+    frame_bytes(oled, bus)
+    oled.pixel(127, 63, 1)
+    oled.pixel(0, 0, 1)
+    oled.hline(3, 30, 50, 1)
+    assert frame_bytes(oled, bus) < 400
+
+    # Writes straight into the buffer need mark_dirty()
+    oled.buffer[3 * 128 + 70] = 0xFF
+    oled.mark_dirty(70, 24, 1, 8)
+    frame_bytes(oled, bus)
+
+    oled.buffer[5 * 128 + 7] = 0x0F
+    oled.mark_dirty()
+    assert frame_bytes(oled, bus) > 1024
+
+
+class MicroPythonArray(array.array):
+    """array('h') that refuses step slices, as MicroPython's does."""
+
+    def __getitem__(self, index):
+        if isinstance(index, slice) and index.step not in (None, 1):
+            raise NotImplementedError("only slices with step=1 (aka None) are supported")
+        return super().__getitem__(index)
+
+
+def test_poly_marks_its_bounding_box():
+    oled, bus = make_display()
+    frame_bytes(oled, bus)
+    face = MicroPythonArray('h', [0, 0, 20, -6, 30, 10, 12, 18, -4, 9])
+    oled.poly(60, 20, face, 1, True)
+    # Columns 56-90, rows 14-38 (pages 1-4)
+    sent = frame_bytes(oled, bus)
+    assert 0 < sent < 4 * 35 + 40
+    oled.poly(60, 20, face, 0)
+    assert 0 < frame_bytes(oled, bus) < 4 * 35 + 40
+
+
+def test_drawing_off_screen_is_clipped():
+    oled, bus = make_display()
+    frame_bytes(oled, bus)
+    oled.fill_rect(-10, -10, 5, 5, 1)
+    oled.fill_rect(130, 70, 5, 5, 1)
+    assert frame_bytes(oled, bus) == 0
+    oled.fill_rect(120, 60, 20, 20, 1)
+    assert 0 < frame_bytes(oled, bus) < 60
+
+
+def test_narrow_display_offset_and_full_show():
+    oled, bus = make_display(64, 48)
+    oled.pixel(5, 5, 1)
+    bus.bytes_sent = 0
+    oled.show(full=True)
+    assert bus.col == (32, 95)
+    assert bus.visible() == oled.buffer
+    assert bus.bytes_sent > 64 * 6
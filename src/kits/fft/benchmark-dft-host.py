@@ -0,0 +1,117 @@
+# Benchmark the NumPy host DFT (lib/dfthost.py) against the pure Python
+# iterative_fft() from faster-fft.py
+# Runs on a PC with CPython and NumPy:  python3 benchmark-dft-host.py
+#
+# faster-fft.py sets up the I2S microphone and OLED when it is imported, so the
+# FFT tables and iterative_fft() are pulled out of its source and run without
+# the hardware code. Both transforms are checked against each other before
+# they are timed.
+
+import array
+import ast
+import math
+import os
+import random
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, 'lib'))
+
+from dfthost import DFT, FORWARD, POLAR, DB
+
+SIZES = (256, 512, 1024, 2048)
+RUNS = 20
+
+# The only top-level code run from faster-fft.py: iterative_fft() and the
+# tables it reads. Everything else (I2S, display, band mapping) is skipped.
+FFT_FUNCTIONS = {'bit_reverse', 'iterative_fft'}
+FFT_TABLES = {'bits', 'bit_reverse_table', 'twiddle_factors_real', 'twiddle_factors_imag'}
+HOST_MODULES = {'array', 'math'}
+
+
+def assigned_names(node):
+    """Names a statement assigns to, including arrays it stores items into."""
+    names = set()
+    for n in ast.walk(node):
+        if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store):
+            names.add(n.id)
+        elif isinstance(n, ast.Subscript) and isinstance(n.ctx, ast.Store) \
+                and isinstance(n.value, ast.Name):
+            names.add(n.value.id)
+    return names
+
+
+def load_iterative_fft(fft_size):
+    """Run the table setup and iterative_fft() from faster-fft.py for fft_size."""
+    with open(os.path.join(HERE, 'faster-fft.py')) as f:
+        tree = ast.parse(f.read())
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            if all(alias.name in HOST_MODULES for alias in node.names):
+                body.append(node)
+        elif isinstance(node, ast.FunctionDef):
+            if node.name in FFT_FUNCTIONS:
+                body.append(node)
+        elif isinstance(node, (ast.Assign, ast.For)):
+            if assigned_names(node) & FFT_TABLES:
+                body.append(node)
+    namespace = {'FFT_SIZE': fft_size}
+    exec(compile(ast.Module(body=body, type_ignores=[]), 'faster-fft.py', 'exec'), namespace)
+    return namespace['iterative_fft']
+
+
+def best_time(func, runs=RUNS):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    random.seed(1)
+    print(f"{'N':>6} | {'iterative_fft (ms)':>18} | {'DFT FORWARD (ms)':>16} | {'DFT DB (ms)':>11} | {'speedup':>8} | {'max error':>9}")
+    print('-' * 86)
+    for n in SIZES:
+        iterative_fft = load_iterative_fft(n)
+        samples = [math.sin(2 * math.pi * 37 * i / n) + 0.1 * random.uniform(-1, 1)
+                   for i in range(n)]
+
+        # Same input through both; the host DFT is unscaled to match
+        real = array.array('f', samples)
+        imag = array.array('f', [0] * n)
+        iterative_fft(real, imag)
+        dft = DFT(n)
+        dft.scale = 1.0
+        dft.re[:] = samples
+        dft.run(FORWARD)
+        error = max(max(abs(a - b) for a, b in zip(real, dft.re)),
+                    max(abs(a - b) for a, b in zip(imag, dft.im)))
+
+        def python_fft():
+            iterative_fft(array.array('f', samples), array.array('f', [0] * n))
+
+        def host_fft(conversion):
+            def run():
+                dft.re[:] = samples
+                dft.run(conversion)
+            return run
+
+        t_python = best_time(python_fft, runs=5)
+        t_forward = best_time(host_fft(FORWARD))
+        t_db = best_time(host_fft(DB))
+        print(f"{n:>6} | {t_python * 1000:>18.2f} | {t_forward * 1000:>16.3f} | {t_db * 1000:>11.3f} "
+              f"| {t_python / t_forward:>7.0f}x | {error:>9.2e}")
+
+    # POLAR sanity check: a full scale sine puts magnitude 0.5 in its bin
+    dft = DFT(512)
+    dft.re[:] = [math.sin(2 * math.pi * 64 * i / 512) for i in range(512)]
+    dft.run(POLAR)
+    print(f"\nPOLAR check: bin 64 magnitude {dft.re[64]:.4f} (expected 0.5000)")
+
+
+if __name__ == '__main__':
+    main()
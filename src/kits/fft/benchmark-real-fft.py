@@ -0,0 +1,113 @@
+# Check and time real_fft() against iterative_fft() on a PC
+# Runs with CPython:  python3 benchmark-real-fft.py
+#
+# real_fft() transforms N real samples with an N/2 point FFT. For each
+# analyzer that has it (faster-fft.py and wide-fft/main.py) this script pulls
+# the FFT tables and functions out of the source without the I2S/display
+# setup, checks that every bin from real_fft() matches the full complex
+# iterative_fft() and compares the time per frame.
+
+import array
+import ast
+import math
+import os
+import random
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS = (
+    os.path.join(HERE, 'faster-fft.py'),
+    os.path.join(HERE, '..', 'wide-fft', 'main.py'),
+)
+SIZES = (256, 512, 1024)
+HOST_MODULES = {'array', 'math', 'struct', 'time'}
+
+# The only top-level code run from each script: the FFT functions and the
+# tables they read. Everything else (I2S, display, band mapping) is skipped.
+FFT_FUNCTIONS = {'bit_reverse', 'iterative_fft', 'real_fft'}
+FFT_TABLES = {'bits', 'bit_reverse_table', 'twiddle_factors_real', 'twiddle_factors_imag'}
+
+
+def assigned_names(node):
+    """Names a statement assigns to, including arrays it stores items into."""
+    names = set()
+    for n in ast.walk(node):
+        if isinstance(n, ast.Name) and isinstance(n.ctx, ast.Store):
+            names.add(n.id)
+        elif isinstance(n, ast.Subscript) and isinstance(n.ctx, ast.Store) \
+                and isinstance(n.value, ast.Name):
+            names.add(n.value.id)
+    return names
+
+
+def load_fft_functions(path, fft_size):
+    """Run the table setup and FFT function definitions of an analyzer script."""
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            if all(alias.name in HOST_MODULES for alias in node.names):
+                body.append(node)
+        elif isinstance(node, ast.FunctionDef):
+            if node.name in FFT_FUNCTIONS:
+                body.append(node)
+        elif isinstance(node, (ast.Assign, ast.For)):
+            if assigned_names(node) & FFT_TABLES:
+                body.append(node)
+    namespace = {'FFT_SIZE': fft_size}
+    exec(compile(ast.Module(body=body, type_ignores=[]), path, 'exec'), namespace)
+    return namespace
+
+
+def best_time(func, runs=5):
+    best = float('inf')
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def max_bin_error(real, imag, packed):
+    """Largest difference between full complex bins and packed real_fft() bins."""
+    n = len(real)
+    error = max(abs(packed[0] - real[0]), abs(imag[0]), abs(packed[1] - real[n // 2]))
+    for k in range(1, n // 2):
+        error = max(error, abs(packed[2 * k] - real[k]), abs(packed[2 * k + 1] - imag[k]))
+    return error
+
+
+def main():
+    random.seed(1)
+    failed = False
+    for path in SCRIPTS:
+        print(os.path.relpath(path, HERE))
+        print(f"{'N':>6} | {'iterative_fft (ms)':>18} | {'real_fft (ms)':>13} | {'speedup':>7} | {'rel. error':>10}")
+        print('-' * 68)
+        for n in SIZES:
+            fns = load_fft_functions(path, n)
+            samples = [4000 * math.sin(2 * math.pi * 37.3 * i / n) + random.uniform(-500, 500)
+                       for i in range(n)]
+
+            real = array.array('f', samples)
+            imag = array.array('f', [0] * n)
+            fns['iterative_fft'](real, imag)
+            packed = fns['real_fft'](array.array('f', samples))
+
+            peak = max(math.sqrt(r * r + i * i) for r, i in zip(real, imag))
+            error = max_bin_error(real, imag, packed) / peak
+            failed = failed or error > 1e-5
+
+            t_full = best_time(lambda: fns['iterative_fft'](array.array('f', samples),
+                                                            array.array('f', [0] * n)))
+            t_real = best_time(lambda: fns['real_fft'](array.array('f', samples)))
+            print(f"{n:>6} | {t_full * 1000:>18.2f} | {t_real * 1000:>13.2f} "
+                  f"| {t_full / t_real:>6.2f}x | {error:>10.1e}")
+        print()
+
+    print("FAILED: real_fft differs from iterative_fft" if failed else "real_fft matches iterative_fft")
+
+
+if __name__ == '__main__':
+    main()
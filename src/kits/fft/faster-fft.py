@@ -6,6 +6,8 @@ import math
 import struct
 import time
 import array
+from bands import BandMapper
+from smoothing import SpectrumSmoother
 
 # OLED Display configuration
 SCL = Pin(2)  # SPI Clock
@@ -46,6 +48,21 @@ audio_in = I2S(
 # FFT size (must be a power of 2)
 FFT_SIZE = 512
 
+# Real microphone samples can be transformed with an FFT of half the size
+# (see real_fft), which roughly halves the time and memory per frame
+USE_REAL_FFT = True
+
+# Display bars, spaced evenly in log(frequency) from BAND_MIN_FREQUENCY to
+# the Nyquist frequency ('mel' is the other choice)
+NUM_BINS = 64
+BAND_MIN_FREQUENCY = 100
+BAND_SCALE = 'log'
+band_mapper = BandMapper(SAMPLE_RATE, FFT_SIZE, NUM_BINS, BAND_MIN_FREQUENCY, scale=BAND_SCALE)
+display_bins = array.array('f', [0] * NUM_BINS)
+
+# Bars rise quickly and sink smoothly, with peak markers that hold then fall
+smoother = SpectrumSmoother(NUM_BINS)
+
 # Precompute the Hanning window coefficients
 hanning_window = array.array('f', [0] * FFT_SIZE)
 for i in range(FFT_SIZE):
@@ -72,8 +89,12 @@ for i in range(FFT_SIZE // 2):
     twiddle_factors_real[i] = math.cos(angle)
     twiddle_factors_imag[i] = math.sin(angle)
 
-def capture_audio_samples():
-    """Capture audio samples for FFT processing"""
+def capture_audio_samples(real_only=False):
+    """Capture audio samples for FFT processing
+
+    Returns (real, imag) arrays for iterative_fft(), or with real_only
+    just the windowed samples for real_fft().
+    """
     # For 32-bit samples, we need 4 bytes per sample
     NUM_SAMPLE_BYTES = FFT_SIZE * 4
     
@@ -93,6 +114,11 @@ def capture_audio_samples():
     # Convert to float array and apply windowing function
     # Reuse the same arrays to avoid memory allocation
     real = array.array('f', [0] * len(samples))
+    if real_only:
+        for i in range(len(samples)):
+            real[i] = (samples[i] >> 8) * hanning_window[i]
+        return real
+
     imag = array.array('f', [0] * len(samples))
     
     for i in range(len(samples)):
@@ -145,6 +171,90 @@ def iterative_fft(real, imag):
     
     return (real, imag)
 
+def real_fft(data):
+    """Compute the spectrum of N real samples in-place with an N/2 point FFT
+
+    The samples are treated as N/2 complex values (even samples real, odd
+    samples imaginary), transformed with an N/2 point FFT that reuses the
+    N point bit-reversal and twiddle tables, and then split into the
+    spectrum of the real signal. No imaginary array is needed.
+
+    On return data holds bins 0..N/2-1 as interleaved (real, imag) pairs,
+    except data[1], which holds the real-valued Nyquist bin N/2 (bin 0 is
+    always real). Bin k equals real[k] + j*imag[k] from iterative_fft().
+    """
+    n = len(data)
+    assert n == FFT_SIZE, "FFT size must match precomputed tables"
+    half = n // 2
+
+    # Bit-reverse reordering of the complex pairs. For i < N/2 the N/2 point
+    # reversal is the N point table entry shifted right by one bit.
+    for i in range(half):
+        j = bit_reverse_table[i] >> 1
+        if i < j:
+            a = 2 * i
+            b = 2 * j
+            data[a], data[b] = data[b], data[a]
+            data[a + 1], data[b + 1] = data[b + 1], data[a + 1]
+
+    # Cooley-Tukey iterative FFT of size N/2. Twiddle k of the N/2 point
+    # transform is twiddle 2k of the N point table, so the index is the
+    # same j * (n // m) as in iterative_fft().
+    m = 2
+    while m <= half:
+        m2 = m // 2
+        step = n // m
+        for k in range(0, half, m):
+            for j in range(m2):
+                twiddle_idx = j * step
+                wr = twiddle_factors_real[twiddle_idx]
+                wi = twiddle_factors_imag[twiddle_idx]
+
+                idx1 = 2 * (k + j)
+                idx2 = idx1 + m
+
+                tr = data[idx2] * wr - data[idx2 + 1] * wi
+                ti = data[idx2] * wi + data[idx2 + 1] * wr
+
+                data[idx2] = data[idx1] - tr
+                data[idx2 + 1] = data[idx1 + 1] - ti
+                data[idx1] = data[idx1] + tr
+                data[idx1 + 1] = data[idx1 + 1] + ti
+        m *= 2
+
+    # Split step: bins k and N/2-k come from complex bins k and N/2-k
+    #   E = (Z[k] + conj(Z[N/2-k])) / 2     spectrum of the even samples
+    #   O = -j (Z[k] - conj(Z[N/2-k])) / 2  spectrum of the odd samples
+    #   X[k] = E + W^k O,  X[N/2-k] = conj(E - W^k O)
+    zr = data[0]
+    zi = data[1]
+    data[0] = zr + zi           # DC
+    data[1] = zr - zi           # Nyquist
+    for k in range(1, half // 2 + 1):
+        a = 2 * k
+        b = n - a
+        zr = data[a]
+        zi = data[a + 1]
+        yr = data[b]
+        yi = data[b + 1]
+
+        er = 0.5 * (zr + yr)
+        ei = 0.5 * (zi - yi)
+        o_r = 0.5 * (zi + yi)
+        o_i = 0.5 * (yr - zr)
+
+        wr = twiddle_factors_real[k]
+        wi = twiddle_factors_imag[k]
+        tr = o_r * wr - o_i * wi
+        ti = o_r * wi + o_i * wr
+
+        data[a] = er + tr
+        data[a + 1] = ei + ti
+        data[b] = er - tr
+        data[b + 1] = ti - ei
+
+    return data
+
 def calculate_magnitudes(real, imag):
     """Calculate magnitude spectrum from complex FFT result"""
     # Only need the first half due to symmetry for real input
@@ -162,36 +272,35 @@ def calculate_magnitudes(real, imag):
     
     return mags
 
+def calculate_real_magnitudes(data):
+    """Calculate magnitude spectrum from the packed real_fft() result"""
+    mags = array.array('f', [0] * (FFT_SIZE // 2))
+    mags[0] = abs(data[0])  # DC bin is real; data[1] holds the Nyquist bin
+
+    # Same fast approximation as calculate_magnitudes()
+    for i in range(1, FFT_SIZE // 2):
+        re_abs = abs(data[2 * i])
+        im_abs = abs(data[2 * i + 1])
+        if re_abs > im_abs:
+            mags[i] = re_abs + 0.4 * im_abs
+        else:
+            mags[i] = im_abs + 0.4 * re_abs
+
+    return mags
+
 def draw_spectrum(magnitudes):
     """Draw the frequency spectrum on the OLED display"""
     # Clear the display
     oled.fill(0)
     
-    # Number of frequency bins to display
-    num_bins = 64
+    # Combine frequency bins into the display bars (tables built at startup)
+    band_mapper.aggregate(magnitudes, display_bins)
+    smoother.update(display_bins)
+    levels = smoother.level
+    peaks = smoother.peaks
     
-    # Combine frequency bins to fit display (use precomputed indexes)
-    display_bins = array.array('f', [0] * num_bins)
-    bin_width = len(magnitudes) // num_bins
-    
-    # Simple averaging of bins
-    for i in range(num_bins):
-        start_idx = i * bin_width
-        end_idx = min((i + 1) * bin_width, len(magnitudes))
-        if start_idx >= len(magnitudes):
-            break
-            
-        # Fast averaging
-        bin_sum = 0
-        for j in range(start_idx, end_idx):
-            bin_sum += magnitudes[j]
-        display_bins[i] = bin_sum / (end_idx - start_idx)
-    
-    # Find maximum value for scaling (avoid division by zero)
-    max_magnitude = 1
-    for mag in display_bins:
-        if mag > max_magnitude:
-            max_magnitude = mag
+    # Scale to the highest peak marker (avoid division by zero)
+    max_magnitude = max(1, smoother.loudest())
     
     # Use full display height
     display_height = 62  # Leave a little margin at the top
@@ -199,18 +308,21 @@ def draw_spectrum(magnitudes):
     scaling_factor = 0.5  # Adjust scaling to distribute bars
     
     # Draw the spectrum - each bin takes 2 pixels width
-    for i in range(len(display_bins)):
+    for i in range(NUM_BINS):
         # Apply sqrt scaling for more balanced distribution
-        normalized = display_bins[i] / max_magnitude
+        normalized = levels[i] / max_magnitude
         # Use math.sqrt since we can't avoid it in MicroPython
         height = int(math.sqrt(normalized) * display_height * scaling_factor)
         
         # Draw vertical bar
         x = i * 2  # Each bar is 2 pixels wide
-        for y in range(baseline, baseline - height, -1):
-            if y >= 0:  # Check bounds
-                oled.pixel(x, y, 1)
-                oled.pixel(x + 1, y, 1)  # Make bars 2 pixels wide
+        if height > 0:
+            oled.fill_rect(x, baseline - height, 2, height, 1)
+        
+        # Peak marker above the bar
+        peak = int(math.sqrt(peaks[i] / max_magnitude) * display_height * scaling_factor)
+        if peak > height:
+            oled.hline(x, baseline - peak, 2, 1)
     
     # Draw baseline
     oled.hline(0, baseline, 128, 1)
@@ -228,6 +340,13 @@ try:
     
     # Main processing loop
     while True:
+        if USE_REAL_FFT:
+            samples = capture_audio_samples(real_only=True)
+            if samples:
+                real_fft(samples)
+                draw_spectrum(calculate_real_magnitudes(samples))
+            continue
+
         # Capture audio samples
         samples = capture_audio_samples()
         
@@ -0,0 +1,104 @@
+# bands.py Map FFT bins to display bars on a log or mel frequency scale
+# With linear bins each bar covers the same number of Hz, so on a 64 bar
+# display of 0-8 kHz the whole bass and voice range (below 1 kHz) gets 8 bars
+# and the rest show hiss. Ears hear pitch logarithmically, so this module
+# spaces the bars evenly in log(frequency) or in mels instead.
+#
+# BandMapper does all the index and width maths once in the constructor:
+# - the band edges are converted to fractional FFT bin positions
+# - every bin that a band overlaps gets a weight (its share of the band), so
+#   the weights of a band add up to 1 and the bar is the weighted mean of its
+#   bins. Low bands narrower than one bin get a share of that bin instead of
+#   coming out empty.
+# - the weights are stored in one flat array('f'), with starts[b] giving the
+#   first weight and first[b] the first bin of band b
+#
+# aggregate() is then a single pass over the weights with no division and no
+# allocation:
+#
+#   mapper = BandMapper(SAMPLE_RATE, FFT_SIZE, 64, 100, 8000)
+#   bars = array.array('f', [0] * 64)
+#   mapper.aggregate(magnitudes, bars)
+
+import array
+import math
+
+LOG = 'log'
+MEL = 'mel'
+
+
+def hz_to_mel(f):
+    return 2595 * math.log10(1 + f / 700)
+
+
+def mel_to_hz(m):
+    return 700 * (10 ** (m / 2595) - 1)
+
+
+class BandMapper:
+    def __init__(self, sample_rate, fft_size, num_bands, min_freq=None, max_freq=None, scale=LOG):
+        bin_hz = sample_rate / fft_size
+        nyquist = sample_rate / 2
+        min_freq = bin_hz if min_freq is None else max(min_freq, bin_hz / 2)
+        max_freq = nyquist if max_freq is None else min(max_freq, nyquist)
+        assert min_freq < max_freq, "Minimum frequency must be below the maximum"
+        self.sample_rate = sample_rate
+        self.fft_size = fft_size
+        self.num_bands = num_bands
+
+        # Band edges in Hz, evenly spaced on the chosen scale
+        if scale == LOG:
+            lo = math.log(min_freq)
+            step = (math.log(max_freq) - lo) / num_bands
+            edges = [math.exp(lo + i * step) for i in range(num_bands + 1)]
+        elif scale == MEL:
+            lo = hz_to_mel(min_freq)
+            step = (hz_to_mel(max_freq) - lo) / num_bands
+            edges = [mel_to_hz(lo + i * step) for i in range(num_bands + 1)]
+        else:
+            raise ValueError("scale must be 'log' or 'mel'")
+        self.edges = array.array('f', edges)
+
+        # Bin k is centred on k * bin_hz, so it covers positions k - 0.5 to
+        # k + 0.5. Magnitude arrays hold bins 0 to fft_size/2 - 1.
+        last_bin = fft_size // 2 - 1
+        self.starts = array.array('H', [0] * (num_bands + 1))
+        self.first = array.array('H', [0] * num_bands)
+        weights = []
+        for band in range(num_bands):
+            a = edges[band] / bin_hz
+            b = edges[band + 1] / bin_hz
+            k = min(int(a + 0.5), last_bin)
+            self.first[band] = k
+            self.starts[band] = len(weights)
+            overlaps = []
+            while True:
+                overlaps.append(max(0.0, min(b, k + 0.5) - max(a, k - 0.5)))
+                k += 1
+                if k > last_bin or k - 0.5 >= b:
+                    break
+            total = sum(overlaps)
+            for overlap in overlaps:
+                weights.append(overlap / total if total > 0 else 1 / len(overlaps))
+        self.starts[num_bands] = len(weights)
+        self.weights = array.array('f', weights)
+
+    def centre(self, band):
+        """Geometric centre frequency of a band in Hz, for labels."""
+        return math.sqrt(self.edges[band] * self.edges[band + 1])
+
+    def aggregate(self, magnitudes, out):
+        """Weighted mean of magnitudes for each band, written into out."""
+        starts = self.starts
+        first = self.first
+        weights = self.weights
+        start = 0
+        for band in range(self.num_bands):
+            end = starts[band + 1]
+            k = first[band]
+            total = 0.0
+            for j in range(start, end):
+                total += magnitudes[k] * weights[j]
+                k += 1
+            out[band] = total
+            start = end
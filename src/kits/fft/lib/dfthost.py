@@ -0,0 +1,102 @@
+# dfthost.py Host (CPython + NumPy) version of the DFT class in dftclass.py
+# The DFT class in dftclass.py needs the Thumb-2 assembler in dft.py, window.py
+# and polar.py, so it only runs on a board. This module has the same interface
+# and the same results, computed with NumPy, so spectrum code can be tested and
+# benchmarked on a PC or in CI:
+#
+#   try:
+#       from dftclass import DFT, FORWARD, POLAR, DB
+#   except ImportError:
+#       from dfthost import DFT, FORWARD, POLAR, DB
+#
+# Behaviour copied from the assembler version:
+# - Forward transforms zero the imaginary data, then (if a window function was
+#   given) subtract the mean from the real data and multiply by the window.
+# - Forward transforms are multiplied by scale (default 1/length). Reverse
+#   transforms are not scaled.
+# - POLAR converts the first length/2 bins: re holds the magnitude and im the
+#   phase in radians (math.atan2(im, re)).
+# - DB also converts the magnitudes to 20*log10(mag) - dboffset, or -80.0 for
+#   empty bins.
+# - run() returns the transform time in microseconds.
+#
+# re and im are preallocated float32 NumPy arrays of the given length. A popfunc
+# can fill them by index (dft.re[i] = x) or all at once (dft.re[:] = samples).
+
+import math
+import time
+
+import numpy as np
+
+PYBOARD_DBOFFSET = 59
+
+REVERSE = 0     # Inverse transform (frequency to time domain)
+FORWARD = 1     # Forward transform
+POLAR   = 3     # bit 2: Polar conversion
+DB      = 7     # bit 3: Polar with dB conversion
+
+# numpy.fft accepts out= from NumPy 2.0, which avoids a new result array per run
+_FFT_OUT = tuple(int(v) for v in np.__version__.split('.')[:2]) >= (2, 0)
+
+
+class DFT(object):
+    def __init__(self, length, popfunc=None, winfunc=None):
+        bits = round(math.log(length)/math.log(2))
+        assert 2**bits == length, "Length must be an integer power of two"
+        self.dboffset = 0               # Offset for dB calculation
+        self._length = length
+        self.popfunc = popfunc          # Function to acquire data
+        self.re = np.zeros(length, dtype=np.float32)
+        self.im = np.zeros(length, dtype=np.float32)
+        if winfunc is not None:  # If a window function is provided, create and populate the array
+            self.windata = np.array([winfunc(x, length) for x in range(length)], dtype=np.float32)
+        else:
+            self.windata = None
+        self._scale = 1.0/length        # Default scaling multiply by 1/length
+        self._work = np.zeros(length, dtype=np.complex128)  # Transform buffer
+
+    @property
+    def scale(self):
+        return self._scale
+
+    @scale.setter
+    def scale(self, value):             # Allow user to override default
+        self._scale = value
+
+    @property
+    def length(self):
+        return self._length  # Read only
+
+    def run(self, conversion):
+        if self.popfunc is not None:
+            self.popfunc(self)          # Populate the data (for fwd transfers, just the real data)
+        if conversion != REVERSE:       # Forward transform: real data assumed
+            self.im[:] = 0
+            if self.windata is not None:  # Remove DC then apply the window function
+                self.re -= self.re.mean(dtype=np.float32)
+                self.re *= self.windata
+        start = time.perf_counter_ns()
+        work = self._work
+        work.real = self.re
+        work.imag = self.im
+        if conversion & FORWARD:
+            result = np.fft.fft(work, out=work) if _FFT_OUT else np.fft.fft(work)
+            result *= self._scale
+        else:
+            # numpy's ifft divides by length; the assembler reverse transform does not
+            result = np.fft.ifft(work, out=work) if _FFT_OUT else np.fft.ifft(work)
+            result *= self._length
+        self.re[:] = result.real
+        self.im[:] = result.imag
+        delta = (time.perf_counter_ns() - start) // 1000
+        if (conversion & POLAR) == POLAR: # Ignore complex conjugates, convert 1st half of arrays
+            half = self._length//2
+            first = result[:half]
+            self.re[:half] = np.abs(first)
+            self.im[:half] = np.angle(first)
+            if conversion == DB:        # Ignore conjugates: convert 1st half only
+                mags = self.re[:half]
+                with np.errstate(divide='ignore'):
+                    db = 20*np.log10(mags) - self.dboffset
+                self.re[:half] = np.where(mags <= 0.0, -80.0, db)
+        return delta
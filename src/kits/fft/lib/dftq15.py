@@ -0,0 +1,220 @@
+# dftq15.py Q15 fixed-point FFT for boards without an FPU
+# The assembler FFT in dft.py uses VFP float instructions, so it needs a
+# Cortex-M4F or M7 (Pyboard, Pico 2). On an RP2040 (Cortex-M0+) every float
+# operation is a software routine and every float is a heap object. This
+# version uses only integers:
+# - re and im are int16 arrays of Q15 values (-32768..32767)
+# - twiddle factors and window coefficients are precomputed Q15 integers,
+#   limited to -32767..32767 so no product of two values reaches 2**30
+# - every intermediate value stays below 2**30, so it is a MicroPython small
+#   int and never allocated. That is why each product is rounded to Q15 on
+#   its own instead of summing two 30-bit products first.
+#
+# Block floating point: before each stage the largest |re| or |im| is found. A
+# butterfly can grow a value by at most 1 + sqrt(2), so the stage shifts its
+# outputs right by just enough bits (0, 1 or 2) to stay in range. The shifts are
+# added to exponent, and the true result is re[k] * 2**exponent. Quiet inputs
+# keep all their bits, while a fixed 1/2 per stage would lose log2(length) bits.
+#
+# Results that still fall outside Q15 (only possible through rounding) are
+# clamped and counted in overflows.
+#
+# The interface follows the DFT class in dftclass.py:
+#
+#   from dftq15 import DFTQ15, FORWARD
+#   dft = DFTQ15(512, winfunc=hanning)
+#   dft.re[:] = samples        # Q15 integers, e.g. 24-bit INMP441 samples >> 8
+#   dft.run(FORWARD)
+#   bin_k = dft.re[k] * 2 ** dft.exponent
+#
+# Forward transforms zero the imaginary data and, if a window function was
+# given, subtract the mean and apply the window. Neither direction is
+# scaled apart from the block exponent. test_dftq15.py measures the SNR
+# against a float DFT on a PC.
+
+import array
+import math
+import time
+
+REVERSE = 0     # Inverse transform (frequency to time domain)
+FORWARD = 1     # Forward transform
+
+Q15_ONE = 32767
+Q15_MIN = -32768
+Q15_ROUND = 1 << 14
+
+# Largest magnitude a stage can take without a shift, and with one bit of
+# shift: 32767 / (1 + sqrt(2)) and twice that
+NO_SHIFT_LIMIT = 13572
+ONE_SHIFT_LIMIT = 27145
+
+try:
+    _ticks_us = time.ticks_us
+    _ticks_diff = time.ticks_diff
+except AttributeError:          # CPython
+    def _ticks_us():
+        return time.perf_counter_ns() // 1000
+
+    def _ticks_diff(end, start):
+        return end - start
+
+
+class DFTQ15(object):
+    def __init__(self, length, popfunc=None, winfunc=None):
+        bits = round(math.log(length)/math.log(2))
+        assert 2**bits == length, "Length must be an integer power of two"
+        self._length = length
+        self.bits = bits
+        self.popfunc = popfunc          # Function to acquire data
+        self.re = array.array('h', [0] * length)
+        self.im = array.array('h', [0] * length)
+        self.exponent = 0               # Results are re/im * 2**exponent
+        self.overflows = 0              # Clamped values in the last run
+        if winfunc is not None:         # Window coefficients in Q15
+            self.windata = array.array('h', [
+                max(-Q15_ONE, min(Q15_ONE, round(winfunc(x, length) * 32768)))
+                for x in range(length)])
+        else:
+            self.windata = None
+
+        self.bitrev = array.array('H', [0] * length)
+        for i in range(length):
+            rev = 0
+            n = i
+            for _ in range(bits):
+                rev = (rev << 1) | (n & 1)
+                n >>= 1
+            self.bitrev[i] = rev
+
+        # cos and -sin of 2*pi*k/length; the reverse transform negates sin.
+        # Clamped to +-Q15_ONE: -32768 times a -32768 sample would be 2**30
+        half = length // 2
+        self.cos = array.array('h', [max(-Q15_ONE, min(Q15_ONE, round(32768 * math.cos(2 * math.pi * k / length))))
+                                     for k in range(half)])
+        self.sin = array.array('h', [max(-Q15_ONE, min(Q15_ONE, round(-32768 * math.sin(2 * math.pi * k / length))))
+                                     for k in range(half)])
+
+    @property
+    def length(self):
+        return self._length  # Read only
+
+    def run(self, conversion):
+        if self.popfunc is not None:
+            self.popfunc(self)          # Populate the data (for fwd transfers, just the real data)
+        if conversion != REVERSE:       # Forward transform: real data assumed
+            im = self.im
+            for i in range(self._length):
+                im[i] = 0
+            if self.windata is not None:
+                self.winapply()
+        start = _ticks_us()
+        self.fft(conversion == REVERSE)
+        return _ticks_diff(_ticks_us(), start)
+
+    def winapply(self):
+        """Subtract the mean from re and multiply by the Q15 window."""
+        re = self.re
+        win = self.windata
+        n = self._length
+        total = 0
+        for i in range(n):
+            total += re[i]
+        mean = total // n
+        for i in range(n):
+            v = re[i] - mean
+            # v can reach 65535 after removing the mean
+            if v > Q15_ONE:
+                v = Q15_ONE
+            elif v < Q15_MIN:
+                v = Q15_MIN
+            re[i] = (v * win[i] + Q15_ROUND) >> 15
+
+    def stage_shift(self):
+        """Bits to shift the next stage right by so no butterfly overflows."""
+        re = self.re
+        im = self.im
+        peak = 0
+        for i in range(self._length):
+            v = re[i]
+            if v < 0:
+                v = -v
+            if v > peak:
+                peak = v
+            v = im[i]
+            if v < 0:
+                v = -v
+            if v > peak:
+                peak = v
+        if peak <= NO_SHIFT_LIMIT:
+            return 0
+        if peak <= ONE_SHIFT_LIMIT:
+            return 1
+        return 2
+
+    def fft(self, reverse=False):
+        """In-place radix-2 FFT of re/im with a block exponent per stage."""
+        n = self._length
+        re = self.re
+        im = self.im
+        bitrev = self.bitrev
+        cos = self.cos
+        sin = self.sin
+        sign = -1 if reverse else 1
+        exponent = 0
+        overflows = 0
+
+        for i in range(n):
+            j = bitrev[i]
+            if i < j:
+                t = re[i]
+                re[i] = re[j]
+                re[j] = t
+                t = im[i]
+                im[i] = im[j]
+                im[j] = t
+
+        m = 2
+        while m <= n:
+            m2 = m >> 1
+            step = n // m
+            shift = self.stage_shift()
+            exponent += shift
+            half = (1 << shift) >> 1    # Rounding for the shift
+            for k in range(0, n, m):
+                w = 0
+                for idx1 in range(k, k + m2):
+                    idx2 = idx1 + m2
+                    wr = cos[w]
+                    wi = sign * sin[w]
+                    w += step
+                    xr = re[idx2]
+                    xi = im[idx2]
+                    # Each product is below 2**30, the sum of two may not be
+                    tr = ((xr * wr + Q15_ROUND) >> 15) - ((xi * wi + Q15_ROUND) >> 15)
+                    ti = ((xr * wi + Q15_ROUND) >> 15) + ((xi * wr + Q15_ROUND) >> 15)
+                    ar = re[idx1]
+                    ai = im[idx1]
+                    v = (ar + tr + half) >> shift
+                    if v > Q15_ONE or v < Q15_MIN:
+                        v = Q15_ONE if v > 0 else Q15_MIN
+                        overflows += 1
+                    re[idx1] = v
+                    v = (ai + ti + half) >> shift
+                    if v > Q15_ONE or v < Q15_MIN:
+                        v = Q15_ONE if v > 0 else Q15_MIN
+                        overflows += 1
+                    im[idx1] = v
+                    v = (ar - tr + half) >> shift
+                    if v > Q15_ONE or v < Q15_MIN:
+                        v = Q15_ONE if v > 0 else Q15_MIN
+                        overflows += 1
+                    re[idx2] = v
+                    v = (ai - ti + half) >> shift
+                    if v > Q15_ONE or v < Q15_MIN:
+                        v = Q15_ONE if v > 0 else Q15_MIN
+                        overflows += 1
+                    im[idx2] = v
+            m <<= 1
+
+        self.exponent = exponent
+        self.overflows = overflows
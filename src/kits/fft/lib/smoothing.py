@@ -0,0 +1,103 @@
+# smoothing.py Temporal smoothing, peak hold and noise floor for spectrum bars
+# Raw FFT bars jump around from frame to frame. SpectrumSmoother keeps state
+# for each bar in preallocated array('f') buffers and updates all of it in
+# one loop per frame:
+# - floor: a noise floor estimate that drops to a quieter value at once and
+#   rises towards louder ones slowly (floor_rise per frame), so it follows
+#   background hum and hiss but not music. With subtract_floor=True it is
+#   removed from the input before smoothing.
+# - level: exponential smoothing with separate factors for rising (attack)
+#   and falling (release) values, so bars jump up quickly and sink gently
+# - peaks: peak hold markers that stay put for hold frames, then fall by the
+#   fraction fall of their height each frame
+#
+# The same object works with any bar count, so the SSD1306 (64 bars) and
+# SSD1322 analyzers share it:
+#
+#   smoother = SpectrumSmoother(NUM_BINS)
+#   band_mapper.aggregate(magnitudes, display_bins)
+#   smoother.update(display_bins)
+#   draw bars from smoother.level and markers from smoother.peaks
+
+import array
+
+
+class SpectrumSmoother:
+    def __init__(self, size, attack=0.6, release=0.25, hold=12, fall=0.08,
+                 floor_rise=0.01, subtract_floor=False):
+        self.size = size
+        self.attack = attack            # Fraction of a rise applied per frame
+        self.release = release          # Fraction of a fall applied per frame
+        self.hold = hold                # Frames a peak marker stays put
+        self.fall = fall                # Fraction of its height a peak drops per frame
+        self.floor_rise = floor_rise    # Fraction the floor moves up per frame
+        self.subtract_floor = subtract_floor
+        self.level = array.array('f', [0] * size)
+        self.peaks = array.array('f', [0] * size)
+        self.floor = array.array('f', [0] * size)
+        self.holds = array.array('H', [0] * size)
+        self.started = False
+
+    def reset(self):
+        """Forget all history; the next frame sets the floor and levels."""
+        for i in range(self.size):
+            self.level[i] = 0
+            self.peaks[i] = 0
+            self.holds[i] = 0
+        self.started = False
+
+    def update(self, values):
+        """Fold one frame of bar values into level, peaks and floor."""
+        level = self.level
+        peaks = self.peaks
+        floor = self.floor
+        holds = self.holds
+        attack = self.attack
+        release = self.release
+        hold = self.hold
+        keep = 1 - self.fall
+        floor_rise = self.floor_rise
+        subtract = self.subtract_floor
+        if not self.started:
+            # Start the floor at the first frame instead of at zero
+            for i in range(self.size):
+                floor[i] = values[i]
+            self.started = True
+
+        for i in range(self.size):
+            v = values[i]
+
+            f = floor[i]
+            if v < f:
+                f = v
+            else:
+                f += (v - f) * floor_rise
+            floor[i] = f
+            if subtract:
+                v = v - f if v > f else 0.0
+
+            s = level[i]
+            if v > s:
+                s += (v - s) * attack
+            else:
+                s += (v - s) * release
+            level[i] = s
+
+            p = peaks[i]
+            if s >= p:
+                peaks[i] = s
+                holds[i] = hold
+            elif holds[i]:
+                holds[i] -= 1
+            else:
+                p *= keep
+                peaks[i] = p if p > s else s
+
+    def loudest(self):
+        """Largest peak marker, for scaling bars and markers together."""
+        peaks = self.peaks
+        top = 0.0
+        for i in range(self.size):
+            if peaks[i] > top:
+                top = peaks[i]
+        return top
@@ -0,0 +1,307 @@
+# spectrum.py Allocation-free spectrum pipeline for the INMP441 analyzers
+#
+# faster-fft.py allocates a bytearray, a struct.unpack() tuple and two float
+# arrays for every frame, then more arrays for the magnitudes and display bins.
+# The garbage collector has to clean all of that up, and its pauses show up as
+# stutter on the display.
+#
+# SpectrumPipeline allocates every buffer once in its constructor:
+# - a ring of raw I2S frame buffers, each with a memoryview that readinto() fills
+# - integer re/im arrays for the FFT, plus window, twiddle and bit-reverse tables
+# - arrays for the magnitudes, the averaged display bins and the bar heights
+#
+# The maths is done with integers that stay below 2**30, so they are MicroPython
+# small ints and never allocated (floats are heap objects on the rp2 and esp32
+# ports, so float code can never be allocation free there):
+# - the top SAMPLE_BITS bits of each 24-bit INMP441 sample are decoded straight
+#   from the frame bytes
+# - the Hann window and twiddle factors are fixed point with WINDOW_BITS and
+#   TWIDDLE_BITS fractional bits
+# - each FFT stage is scaled by 1/2 so values never grow
+# - magnitudes use the same max + 0.4*min approximation as faster-fft.py
+#
+# Frames can overlap (a short-time Fourier transform): with hop set below
+# fft_size each capture() reads only hop new samples, and process() slides them
+# into a history of the last fft_size samples before windowing. A hop of
+# fft_size // 4 (75% overlap) gives four spectra per FFT length of audio, so
+# transients show up sooner without losing frequency resolution. average=K
+# then takes the mean of the last K spectra (Welch's method), which smooths
+# the bars without the lag of a longer FFT.
+#
+# On a board the guarantee can be checked with micropython.heap_lock():
+#
+#   pipeline.capture()
+#   micropython.heap_lock()
+#   pipeline.process()      # raises MemoryError if anything is allocated
+#   micropython.heap_unlock()
+#
+# test_spectrum.py checks it on a PC with a fake I2S source.
+
+import array
+import math
+
+SAMPLE_BITS = 18     # Bits kept from each 24-bit sample
+WINDOW_BITS = 12     # Hann window is scaled by 2**WINDOW_BITS
+TWIDDLE_BITS = 12    # Twiddle factors are scaled by 2**TWIDDLE_BITS
+RATIO_BITS = 10      # Resolution of bin / peak when computing bar heights
+
+
+class SpectrumPipeline:
+    def __init__(self, audio_in, fft_size=512, num_bins=64, bar_height=62,
+                 max_bin=None, frames=2, hop=None, average=1):
+        bits = round(math.log(fft_size) / math.log(2))
+        assert 2 ** bits == fft_size, "FFT size must be a power of two"
+        hop = fft_size if hop is None else hop
+        assert 0 < hop <= fft_size, "Hop must be between 1 and the FFT size"
+        assert average >= 1, "Average needs at least one spectrum"
+        self.audio_in = audio_in
+        self.fft_size = fft_size
+        self.bits = bits
+        self.num_bins = num_bins
+        self.bar_height = bar_height
+        self.hop = hop
+
+        # Ring of raw frames of hop samples each: capture() fills the slot at
+        # head, process() consumes the oldest of the count waiting frames
+        self.frame_bytes = hop * 4
+        self.ring = [bytearray(self.frame_bytes) for _ in range(frames)]
+        self.views = [memoryview(buf) for buf in self.ring]
+        self.head = 0
+        self.count = 0
+
+        # Last fft_size decoded samples as a circular buffer; the oldest one
+        # is at pos
+        self.history = array.array('i', [0] * fft_size)
+        self.pos = 0
+
+        self.re = array.array('i', [0] * fft_size)
+        self.im = array.array('i', [0] * fft_size)
+
+        scale = 1 << WINDOW_BITS
+        self.window = array.array('i', [
+            int(scale * 0.5 * (1 - math.cos(2 * math.pi * i / (fft_size - 1))))
+            for i in range(fft_size)])
+
+        self.bitrev = array.array('H', [0] * fft_size)
+        for i in range(fft_size):
+            rev = 0
+            n = i
+            for _ in range(bits):
+                rev = (rev << 1) | (n & 1)
+                n >>= 1
+            self.bitrev[i] = rev
+
+        scale = 1 << TWIDDLE_BITS
+        self.cos = array.array('i', [round(scale * math.cos(2 * math.pi * i / fft_size))
+                                     for i in range(fft_size // 2)])
+        self.sin = array.array('i', [round(-scale * math.sin(2 * math.pi * i / fft_size))
+                                     for i in range(fft_size // 2)])
+
+        # Display bins average the magnitudes between consecutive edges
+        half = fft_size // 2
+        max_bin = half if max_bin is None else min(max_bin, half)
+        self.mags = array.array('i', [0] * half)
+
+        # Welch averaging keeps the last few spectra and their running sum
+        self.average = average
+        if average > 1:
+            self.spectra = [array.array('i', [0] * half) for _ in range(average)]
+            self.totals = array.array('i', [0] * half)
+            self.spectrum = 0
+        self.bins = array.array('i', [0] * num_bins)
+        self.edges = array.array('H', [max(1, i * max_bin // num_bins) for i in range(num_bins + 1)])
+        self.edges[0] = 1   # Skip the DC bin
+        self.heights = bytearray(num_bins)
+
+        # Bar height h is reached once bin/peak >= (h/bar_height)**2, the same
+        # square root scaling as draw_spectrum() in faster-fft.py
+        one = 1 << RATIO_BITS
+        self.thresholds = array.array('H', [h * h * one // (bar_height * bar_height)
+                                            for h in range(bar_height + 1)])
+
+    def capture(self):
+        """Read one frame from I2S into the next ring slot. Returns True on success."""
+        view = self.views[self.head]
+        got = self.audio_in.readinto(view)
+        if got <= 0:
+            return False
+        while got < self.frame_bytes:
+            # Only a non-blocking I2S returns part of a frame; the slice is
+            # the one allocation on this path
+            more = self.audio_in.readinto(view[got:])
+            if more <= 0:
+                return False
+            got += more
+        self.head = (self.head + 1) % len(self.ring)
+        if self.count < len(self.ring):
+            self.count += 1
+        return True
+
+    def process(self):
+        """Turn the oldest captured frame into heights. Returns False if none is waiting."""
+        if self.count == 0:
+            return False
+        slot = (self.head - self.count) % len(self.ring)
+        self.count -= 1
+        self.decode(self.ring[slot])
+        self.load_window()
+        self.fft()
+        self.magnitudes()
+        self.average_bins()
+        self.bar_heights()
+        return True
+
+    def decode(self, frame):
+        """Samples from little-endian 32-bit I2S words into the history, replacing the oldest."""
+        history = self.history
+        n = self.fft_size
+        pos = self.pos
+        sign = 1 << (SAMPLE_BITS - 1)
+        full = 1 << SAMPLE_BITS
+        for i in range(self.hop):
+            b = 4 * i
+            # Top 18 bits of the 24-bit sample in bytes 3 (MSB), 2 and 1
+            s = (frame[b + 3] << 10) | (frame[b + 2] << 2) | (frame[b + 1] >> 6)
+            if s >= sign:
+                s -= full
+            history[pos] = s
+            pos += 1
+            if pos == n:
+                pos = 0
+        self.pos = pos
+
+    def load_window(self):
+        """Windowed history, oldest sample first, into re and zero im."""
+        re = self.re
+        im = self.im
+        window = self.window
+        history = self.history
+        n = self.fft_size
+        # The history wraps at pos, so copy it in two runs
+        start = self.pos
+        for i in range(n - start):
+            re[i] = (history[start + i] * window[i]) >> WINDOW_BITS
+            im[i] = 0
+        offset = n - start
+        for i in range(start):
+            re[offset + i] = (history[i] * window[offset + i]) >> WINDOW_BITS
+            im[offset + i] = 0
+
+    def fft(self):
+        """In-place integer radix-2 FFT of re/im, scaled by 1/2 per stage."""
+        n = self.fft_size
+        re = self.re
+        im = self.im
+        bitrev = self.bitrev
+        cos = self.cos
+        sin = self.sin
+
+        for i in range(n):
+            j = bitrev[i]
+            if i < j:
+                t = re[i]
+                re[i] = re[j]
+                re[j] = t
+                t = im[i]
+                im[i] = im[j]
+                im[j] = t
+
+        m = 2
+        while m <= n:
+            m2 = m >> 1
+            step = n // m
+            for k in range(0, n, m):
+                w = 0
+                for idx1 in range(k, k + m2):
+                    idx2 = idx1 + m2
+                    wr = cos[w]
+                    wi = sin[w]
+                    w += step
+                    xr = re[idx2]
+                    xi = im[idx2]
+                    tr = (xr * wr - xi * wi) >> TWIDDLE_BITS
+                    ti = (xr * wi + xi * wr) >> TWIDDLE_BITS
+                    ar = re[idx1]
+                    ai = im[idx1]
+                    re[idx2] = (ar - tr) >> 1
+                    im[idx2] = (ai - ti) >> 1
+                    re[idx1] = (ar + tr) >> 1
+                    im[idx1] = (ai + ti) >> 1
+            m <<= 1
+
+    def magnitudes(self):
+        """|X[k]| for the first half of the spectrum, about max + 0.4*min."""
+        re = self.re
+        im = self.im
+        mags = self.mags
+        for i in range(len(mags)):
+            a = re[i]
+            if a < 0:
+                a = -a
+            b = im[i]
+            if b < 0:
+                b = -b
+            if a > b:
+                mags[i] = a + ((b * 13) >> 5)
+            else:
+                mags[i] = b + ((a * 13) >> 5)
+        if self.average > 1:
+            self.welch_average()
+
+    def welch_average(self):
+        """Replace mags with the mean of the last `average` spectra."""
+        mags = self.mags
+        totals = self.totals
+        oldest = self.spectra[self.spectrum]
+        count = self.average
+        for i in range(len(mags)):
+            m = mags[i]
+            t = totals[i] + m - oldest[i]
+            totals[i] = t
+            oldest[i] = m
+            mags[i] = t // count
+        self.spectrum = (self.spectrum + 1) % count
+
+    def average_bins(self):
+        """Average the magnitudes into num_bins display bins."""
+        mags = self.mags
+        bins = self.bins
+        edges = self.edges
+        for i in range(self.num_bins):
+            start = edges[i]
+            end = edges[i + 1]
+            if end <= start:
+                bins[i] = mags[start]
+                continue
+            total = 0
+            for j in range(start, end):
+                total += mags[j]
+            bins[i] = total // (end - start)
+
+    def bar_heights(self):
+        """Square-root scaled bar heights (0..bar_height) relative to the loudest bin."""
+        bins = self.bins
+        heights = self.heights
+        thresholds = self.thresholds
+        top = self.bar_height
+        peak = 1
+        for i in range(self.num_bins):
+            if bins[i] > peak:
+                peak = bins[i]
+        for i in range(self.num_bins):
+            ratio = (bins[i] << RATIO_BITS) // peak
+            h = 0
+            while h < top and thresholds[h + 1] <= ratio:
+                h += 1
+            heights[i] = h
+
+    def peak_bin(self, start_bin=3, end_bin=None):
+        """FFT bin with the largest magnitude, skipping the DC end of the spectrum."""
+        mags = self.mags
+        if end_bin is None or end_bin > len(mags):
+            end_bin = len(mags)
+        best = start_bin
+        for i in range(start_bin, end_bin):
+            if mags[i] > mags[best]:
+                best = i
+        return best
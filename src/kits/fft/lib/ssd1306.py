@@ -133,6 +133,7 @@ class SSD1306_SPI(SSD1306):
         self.dc = dc
         self.res = res
         self.cs = cs
+        self.cmd = bytearray(1)  # Reused by write_cmd() so commands don't allocate
         import time
 
         self.res(1)
@@ -147,7 +148,8 @@ class SSD1306_SPI(SSD1306):
         self.cs(1)
         self.dc(0)
         self.cs(0)
-        self.spi.write(bytearray([cmd]))
+        self.cmd[0] = cmd
+        self.spi.write(self.cmd)
         self.cs(1)
 
     def write_data(self, buf):
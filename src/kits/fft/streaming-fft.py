@@ -0,0 +1,111 @@
+# Streaming Sound Spectrum Analyzer - no allocations in the main loop
+# Same wiring and display as faster-fft.py, but every buffer is allocated once
+# by SpectrumPipeline (lib/spectrum.py) so the garbage collector never has to
+# pause the display
+from machine import I2S, Pin, SPI
+import ssd1306
+import gc
+import micropython
+import time
+from spectrum import SpectrumPipeline
+
+# OLED Display configuration
+SCL = Pin(2)  # SPI Clock
+SDA = Pin(3)  # SPI Data
+RES = Pin(4)  # Reset
+DC = Pin(5)   # Data/Command
+CS = Pin(6)   # Chip Select
+
+# Initialize SPI and OLED
+spi = SPI(0, sck=SCL, mosi=SDA)
+oled = ssd1306.SSD1306_SPI(128, 64, spi, DC, RES, CS)
+
+# I2S Microphone configuration
+SCK_PIN = 10  # Serial Clock
+WS_PIN = 11   # Word Select
+SD_PIN = 12   # Serial Data
+
+# I2S configuration parameters
+I2S_ID = 0
+SAMPLE_SIZE_IN_BITS = 32
+FORMAT = I2S.MONO
+SAMPLE_RATE = 16000
+BUFFER_LENGTH_IN_BYTES = 40000
+
+# Initialize I2S for microphone
+audio_in = I2S(
+    I2S_ID,
+    sck=Pin(SCK_PIN),
+    ws=Pin(WS_PIN),
+    sd=Pin(SD_PIN),
+    mode=I2S.RX,
+    bits=SAMPLE_SIZE_IN_BITS,
+    format=FORMAT,
+    rate=SAMPLE_RATE,
+    ibuf=BUFFER_LENGTH_IN_BYTES,
+)
+
+# FFT size (must be a power of 2)
+FFT_SIZE = 512
+
+# New samples per spectrum: FFT_SIZE // 2 is 50% overlap, FFT_SIZE // 4 is 75%.
+# Smaller hops update the display more often for the same frequency resolution
+HOP = FFT_SIZE // 4
+
+# Number of recent spectra averaged together (Welch's method), 1 for none
+AVERAGE = 2
+
+# Set to True to have MicroPython raise MemoryError if the loop ever allocates
+CHECK_ALLOCATIONS = False
+
+BASELINE = 63       # Bottom row of the display
+NUM_BINS = 64       # Each bar is 2 pixels wide
+
+# Bars reach half the display, like draw_spectrum() in faster-fft.py
+pipeline = SpectrumPipeline(audio_in, FFT_SIZE, num_bins=NUM_BINS, bar_height=31,
+                            hop=HOP, average=AVERAGE)
+
+
+def draw_spectrum(heights):
+    """Draw the bar heights from the pipeline as 2 pixel wide bars"""
+    oled.fill(0)
+    for i in range(NUM_BINS):
+        h = heights[i]
+        if h:
+            oled.fill_rect(i * 2, BASELINE - h, 2, h, 1)
+    oled.hline(0, BASELINE, 128, 1)
+    oled.show()
+
+
+try:
+    print("Streaming Sound Spectrum Analyzer")
+    print("Press Ctrl+C to stop")
+
+    # Start the loop with a clean heap so no collection is due mid-frame
+    gc.collect()
+    frames = 0
+    start = time.ticks_ms()
+
+    while True:
+        if not pipeline.capture():
+            continue
+        if CHECK_ALLOCATIONS:
+            micropython.heap_lock()
+        pipeline.process()
+        draw_spectrum(pipeline.heights)
+        if CHECK_ALLOCATIONS:
+            micropython.heap_unlock()
+
+        frames += 1
+        if frames == 100:
+            elapsed = time.ticks_diff(time.ticks_ms(), start)
+            print("FPS:", 100000 // elapsed, "peak Hz:", pipeline.peak_bin() * SAMPLE_RATE // FFT_SIZE)
+            frames = 0
+            start = time.ticks_ms()
+
+except KeyboardInterrupt:
+    print("Monitoring stopped")
+finally:
+    # Clean up
+    audio_in.deinit()
+    print("Program terminated")
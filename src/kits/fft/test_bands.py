@@ -0,0 +1,69 @@
+# Host tests for lib/bands.py (CPython):  python3 -m pytest test_bands.py
+
+import array
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lib'))
+
+from bands import BandMapper, LOG, MEL, hz_to_mel
+
+SAMPLE_RATE = 16000
+FFT_SIZE = 512
+
+
+def band_weights(mapper, band):
+    return mapper.weights[mapper.starts[band]:mapper.starts[band + 1]]
+
+
+def test_edges_are_evenly_spaced_on_the_scale():
+    log = BandMapper(SAMPLE_RATE, FFT_SIZE, 32, 100, 8000, LOG)
+    ratios = [log.edges[i + 1] / log.edges[i] for i in range(32)]
+    assert max(ratios) - min(ratios) < 1e-4
+    assert abs(log.edges[0] - 100) < 0.01 and abs(log.edges[32] - 8000) < 0.5
+
+    mel = BandMapper(SAMPLE_RATE, FFT_SIZE, 32, 100, 8000, MEL)
+    steps = [hz_to_mel(mel.edges[i + 1]) - hz_to_mel(mel.edges[i]) for i in range(32)]
+    assert max(steps) - min(steps) < 1e-2
+
+
+def test_every_band_is_a_weighted_mean():
+    for scale in (LOG, MEL):
+        mapper = BandMapper(SAMPLE_RATE, FFT_SIZE, 64, 60, scale=scale)
+        for band in range(64):
+            weights = band_weights(mapper, band)
+            assert len(weights) > 0
+            assert abs(sum(weights) - 1) < 1e-5
+        # A flat spectrum gives flat bars
+        out = array.array('f', [0] * 64)
+        mapper.aggregate(array.array('f', [3.0] * (FFT_SIZE // 2)), out)
+        assert all(abs(v - 3.0) < 1e-4 for v in out)
+
+
+def test_aggregate_matches_bin_overlaps():
+    mapper = BandMapper(SAMPLE_RATE, FFT_SIZE, 48, 100, 6000)
+    bin_hz = SAMPLE_RATE / FFT_SIZE
+    mags = array.array('f', [math.sin(k) ** 2 * 100 + k for k in range(FFT_SIZE // 2)])
+    out = array.array('f', [0] * 48)
+    mapper.aggregate(mags, out)
+    for band in range(48):
+        # Integrate the piecewise constant spectrum over the band
+        a = mapper.edges[band] / bin_hz
+        b = mapper.edges[band + 1] / bin_hz
+        total = 0.0
+        for k in range(FFT_SIZE // 2):
+            total += mags[k] * max(0.0, min(b, k + 0.5) - max(a, k - 0.5))
+        assert abs(out[band] - total / (b - a)) < 1e-3 * max(mags)
+
+
+def test_low_bands_share_a_bin():
+    # Bands narrower than a bin still see that bin instead of being empty
+    mapper = BandMapper(SAMPLE_RATE, FFT_SIZE, 64, 40, 8000)
+    mags = array.array('f', [0.0] * (FFT_SIZE // 2))
+    mags[2] = 10.0      # 62.5 Hz
+    out = array.array('f', [0] * 64)
+    mapper.aggregate(mags, out)
+    lit = [band for band in range(64) if out[band] > 0]
+    assert len(lit) > 1
+    assert all(mapper.first[band] <= 2 for band in lit)
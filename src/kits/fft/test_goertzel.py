@@ -0,0 +1,80 @@
+# Host tests for lib/goertzel.py (CPython):  python3 -m pytest test_goertzel.py
+
+import cmath
+import math
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lib'))
+
+from goertzel import GoertzelBank, DTMF_FREQUENCIES, DTMF_KEYS, dtmf_key, note_frequencies
+
+SAMPLE_RATE = 8000
+
+
+def tones(freqs, count, amplitude=1000.0, noise=0.0, seed=1):
+    rng = random.Random(seed)
+    return [sum(amplitude * math.sin(2 * math.pi * f * i / SAMPLE_RATE) for f in freqs)
+            + rng.uniform(-noise, noise) for i in range(count)]
+
+
+def test_magnitudes_match_dft_at_target():
+    block = 205
+    freqs = (697, 1000, 1633, 3000)
+    samples = tones((1000,), block)
+    bank = GoertzelBank(freqs, SAMPLE_RATE, block)
+    assert bank.update(samples)
+    for f, mag in zip(freqs, bank.mags):
+        expected = abs(sum(x * cmath.exp(-2j * math.pi * f * n / SAMPLE_RATE)
+                           for n, x in enumerate(samples)))
+        assert abs(mag - expected) < 1e-3 * block * 1000
+
+
+def test_blocks_of_any_size_give_the_same_result():
+    samples = tones((852, 1477), 205)
+    whole = GoertzelBank(DTMF_FREQUENCIES, SAMPLE_RATE)
+    assert whole.update(samples)
+    expected = list(whole.mags)
+
+    chunked = GoertzelBank(DTMF_FREQUENCIES, SAMPLE_RATE)
+    finished = [chunked.update(samples, i, min(i + 32, 205)) for i in range(0, 205, 32)]
+    assert finished == [False] * 6 + [True]
+    assert all(abs(a - b) < 1e-6 * max(expected) for a, b in zip(chunked.mags, expected))
+
+
+def test_detects_every_dtmf_key():
+    for row, keys in enumerate(DTMF_KEYS):
+        for col, key in enumerate(keys):
+            low, high = DTMF_FREQUENCIES[row], DTMF_FREQUENCIES[4 + col]
+            bank = GoertzelBank(DTMF_FREQUENCIES, SAMPLE_RATE)
+            assert bank.update(tones((low, high), 205, noise=300))
+            assert dtmf_key(bank.mags, threshold=10000) == key
+
+
+def test_rejects_single_tone_and_silence():
+    bank = GoertzelBank(DTMF_FREQUENCIES, SAMPLE_RATE)
+    bank.update(tones((770,), 205))
+    assert dtmf_key(bank.mags, threshold=10000) is None
+    bank.update(tones((), 205, noise=50))
+    assert dtmf_key(bank.mags, threshold=10000) is None
+
+
+def test_note_peak():
+    notes = note_frequencies(-9, 12)     # C4 to B4
+    bank = GoertzelBank(notes, SAMPLE_RATE, block_size=800)
+    bank.update(tones((notes[7],), 800))   # G4
+    assert bank.peak_bin() == 7
+    assert abs(bank.peak_frequency() - 392.0) < 0.1
+
+
+def test_update_carries_samples_into_the_next_block():
+    samples = tones((941, 1336), 410)
+    bank = GoertzelBank(DTMF_FREQUENCIES, SAMPLE_RATE)
+    assert bank.update(samples, 0, 300)
+    assert bank.count == 95
+    assert bank.update(samples, 300, 410)
+
+    second = GoertzelBank(DTMF_FREQUENCIES, SAMPLE_RATE)
+    second.update(samples, 205, 410)
+    assert all(abs(a - b) < 1e-3 for a, b in zip(bank.mags, second.mags))
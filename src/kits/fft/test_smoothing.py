@@ -0,0 +1,57 @@
+# Host tests for lib/smoothing.py (CPython):  python3 -m pytest test_smoothing.py
+
+import array
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lib'))
+
+from smoothing import SpectrumSmoother
+
+
+def frame(*values):
+    return array.array('f', values)
+
+
+def test_rises_faster_than_it_falls():
+    smoother = SpectrumSmoother(1, attack=0.5, release=0.25)
+    smoother.update(frame(0))
+    smoother.update(frame(100))
+    assert abs(smoother.level[0] - 50) < 1e-4
+    smoother.update(frame(0))
+    assert abs(smoother.level[0] - 37.5) < 1e-4
+
+
+def test_peak_holds_then_falls():
+    smoother = SpectrumSmoother(1, attack=1.0, release=1.0, hold=3, fall=0.5)
+    smoother.update(frame(0))
+    smoother.update(frame(80))
+    heights = []
+    for _ in range(6):
+        smoother.update(frame(10))
+        heights.append(smoother.peaks[0])
+    assert heights[:3] == [80, 80, 80]
+    assert heights[3:] == [40, 20, 10]     # Never below the level
+
+
+def test_noise_floor_follows_the_quiet_parts():
+    smoother = SpectrumSmoother(2, floor_rise=0.05, subtract_floor=True, attack=1.0, release=1.0)
+    for _ in range(50):
+        smoother.update(frame(5, 5))
+    assert abs(smoother.floor[0] - 5) < 1e-4
+    # A short loud burst barely moves the floor, and the level is above it
+    smoother.update(frame(105, 5))
+    assert smoother.floor[0] < 15
+    assert smoother.level[0] > 90
+    assert smoother.level[1] == 0
+    # A drop lowers the floor at once
+    smoother.update(frame(1, 1))
+    assert smoother.floor[0] == 1
+
+
+def test_loudest_and_reset():
+    smoother = SpectrumSmoother(3)
+    smoother.update(frame(1, 9, 4))
+    assert smoother.loudest() == smoother.peaks[1]
+    smoother.reset()
+    assert smoother.loudest() == 0
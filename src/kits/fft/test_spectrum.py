@@ -0,0 +1,175 @@
+# Host tests for lib/spectrum.py (CPython):  python3 -m pytest test_spectrum.py
+#
+# A fake I2S source plays precomputed INMP441-style frames (24-bit samples
+# left aligned in little-endian 32-bit words) into the pipeline's buffers.
+
+import cmath
+import math
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lib'))
+
+from spectrum import SpectrumPipeline
+
+SAMPLE_RATE = 16000
+
+
+def i2s_frame(samples):
+    """Pack 24-bit samples into the bytes an INMP441 sends as 32-bit words."""
+    frame = bytearray()
+    for s in samples:
+        frame += ((int(s) & 0xFFFFFF) << 8).to_bytes(4, 'little')
+    return bytes(frame)
+
+
+def tone(freq, fft_size, amplitude=2 ** 21, phase=0.0):
+    return [amplitude * math.sin(2 * math.pi * freq * i / SAMPLE_RATE + phase)
+            for i in range(fft_size)]
+
+
+class FakeI2S:
+    """readinto() copies the next precomputed frame into the caller's buffer."""
+
+    def __init__(self, frames, chunk=None):
+        self.frames = frames
+        self.index = 0
+        self.chunk = chunk      # Bytes per call, to imitate non-blocking reads
+        self.offset = 0
+
+    def readinto(self, buf):
+        frame = self.frames[self.index]
+        if self.chunk is None:
+            buf[:] = frame
+            self.index = (self.index + 1) % len(self.frames)
+            return len(frame)
+        n = min(self.chunk, len(frame) - self.offset, len(buf))
+        buf[:n] = frame[self.offset:self.offset + n]
+        self.offset += n
+        if self.offset == len(frame):
+            self.offset = 0
+            self.index = (self.index + 1) % len(self.frames)
+        return n
+
+
+def run_frames(pipeline, count):
+    for _ in range(count):
+        assert pipeline.capture()
+        assert pipeline.process()
+
+
+def test_peak_bin_matches_tone():
+    fft_size = 512
+    freq = 40 * SAMPLE_RATE / fft_size      # Exactly bin 40
+    pipeline = SpectrumPipeline(FakeI2S([i2s_frame(tone(freq, fft_size))]), fft_size)
+    run_frames(pipeline, 1)
+    assert pipeline.peak_bin() == 40
+    assert max(pipeline.heights) == pipeline.bar_height
+
+
+def test_magnitudes_match_float_dft():
+    fft_size = 128
+    samples = [a + b for a, b in zip(tone(1000, fft_size), tone(3100, fft_size, 2 ** 19, 1.0))]
+    pipeline = SpectrumPipeline(FakeI2S([i2s_frame(samples)]), fft_size)
+    run_frames(pipeline, 1)
+
+    # Reference: windowed float DFT of the same 18-bit samples, scaled by 1/N
+    window = [0.5 * (1 - math.cos(2 * math.pi * i / (fft_size - 1))) for i in range(fft_size)]
+    x = [(int(s) >> 6) * w for s, w in zip(samples, window)]
+    peak = 0
+    errors = []
+    for k in range(fft_size // 2):
+        X = sum(x[n] * cmath.exp(-2j * math.pi * k * n / fft_size) for n in range(fft_size)) / fft_size
+        a, b = abs(X.real), abs(X.imag)
+        expected = max(a, b) + 0.4 * min(a, b)
+        peak = max(peak, expected)
+        errors.append(abs(pipeline.mags[k] - expected))
+    # Fixed point rounding stays well under 1% of the loudest bin
+    assert max(errors) < 0.01 * peak
+
+
+def test_partial_reads_assemble_a_frame():
+    fft_size = 256
+    frame = i2s_frame(tone(2000, fft_size))
+    whole = SpectrumPipeline(FakeI2S([frame]), fft_size)
+    chunked = SpectrumPipeline(FakeI2S([frame], chunk=100), fft_size)
+    run_frames(whole, 1)
+    run_frames(chunked, 1)
+    assert list(whole.mags) == list(chunked.mags)
+
+
+def test_ring_keeps_frames_until_processed():
+    fft_size = 256
+    frames = [i2s_frame(tone(f, fft_size)) for f in (1000, 2000, 3000)]
+    pipeline = SpectrumPipeline(FakeI2S(frames), fft_size, frames=3)
+    for _ in range(3):
+        assert pipeline.capture()
+    peaks = []
+    while pipeline.process():
+        peaks.append(pipeline.peak_bin() * SAMPLE_RATE // fft_size)
+    assert peaks == [1000, 2000, 3000]
+
+
+def test_overlapping_frames_match_the_same_window():
+    fft_size = 256
+    hop = fft_size // 4
+    samples = tone(700, 3 * fft_size)
+    hops = [i2s_frame(samples[i:i + hop]) for i in range(0, len(samples), hop)]
+    stft = SpectrumPipeline(FakeI2S(hops), fft_size, hop=hop)
+    run_frames(stft, 4)
+    for start in range(hop, 2 * fft_size, hop):
+        run_frames(stft, 1)
+        # The history now holds samples[start:start + fft_size]
+        window = SpectrumPipeline(FakeI2S([i2s_frame(samples[start:start + fft_size])]), fft_size)
+        run_frames(window, 1)
+        assert list(stft.mags) == list(window.mags)
+
+
+def test_welch_average_is_mean_of_recent_spectra():
+    fft_size = 256
+    frames = [i2s_frame(tone(f, fft_size)) for f in (1000, 2000, 3000)]
+    single = []
+    for frame in frames:
+        pipeline = SpectrumPipeline(FakeI2S([frame]), fft_size)
+        run_frames(pipeline, 1)
+        single.append(list(pipeline.mags))
+
+    welch = SpectrumPipeline(FakeI2S(frames), fft_size, average=2)
+    run_frames(welch, 3)
+    assert list(welch.mags) == [(a + b) // 2 for a, b in zip(single[1], single[2])]
+
+
+def steady_state_memory(fft_size, frames=24, **options):
+    """(bytes kept, peak bytes in use) over `frames` frames after a warm up."""
+    hop = options.get('hop', fft_size)
+    sources = [i2s_frame(tone(f, hop)) for f in (440, 1000, 2500)]
+    pipeline = SpectrumPipeline(FakeI2S(sources), fft_size, **options)
+    # Warm up and measure whole multiples of fft_size samples so the history
+    # position ends at 0, not a freshly boxed CPython int
+    run_frames(pipeline, 3 * (fft_size // hop))
+
+    tracemalloc.start()
+    try:
+        run_frames(pipeline, frames)
+        kept, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return kept, peak
+
+
+def test_steady_state_allocates_nothing():
+    kept, peak = steady_state_memory(1024)
+
+    # Nothing is kept between frames
+    assert kept == 0
+    # CPython boxes every int above 256 while a loop runs (MicroPython keeps
+    # them as small ints), so a few hundred bytes of those are in use at any
+    # moment. A single 1024 sample frame buffer alone would be 4 KB.
+    assert peak < 1024
+
+
+def test_overlapping_welch_mode_allocates_nothing():
+    kept, peak = steady_state_memory(1024, hop=256, average=4)
+    assert kept == 0
+    assert peak < 1024
@@ -0,0 +1,122 @@
+# Tone Detector - DTMF keys or musical notes without a full FFT
+# Same INMP441 microphone and SSD1306 OLED wiring as faster-fft.py. A Goertzel
+# filter bank (lib/goertzel.py) measures only the frequencies of interest, so
+# each block costs BLOCK_SIZE * (number of tones) multiply-adds instead of a
+# 512 point FFT
+from machine import I2S, Pin, SPI
+import ssd1306
+import array
+from goertzel import GoertzelBank, DTMF_FREQUENCIES, dtmf_key, note_frequencies
+
+# OLED Display configuration
+SCL = Pin(2)  # SPI Clock
+SDA = Pin(3)  # SPI Data
+RES = Pin(4)  # Reset
+DC = Pin(5)   # Data/Command
+CS = Pin(6)   # Chip Select
+
+# Initialize SPI and OLED
+spi = SPI(0, sck=SCL, mosi=SDA)
+oled = ssd1306.SSD1306_SPI(128, 64, spi, DC, RES, CS)
+
+# I2S Microphone configuration
+SCK_PIN = 10  # Serial Clock
+WS_PIN = 11   # Word Select
+SD_PIN = 12   # Serial Data
+
+# I2S configuration parameters
+I2S_ID = 0
+SAMPLE_SIZE_IN_BITS = 32
+FORMAT = I2S.MONO
+SAMPLE_RATE = 8000
+BUFFER_LENGTH_IN_BYTES = 40000
+
+# Initialize I2S for microphone
+audio_in = I2S(
+    I2S_ID,
+    sck=Pin(SCK_PIN),
+    ws=Pin(WS_PIN),
+    sd=Pin(SD_PIN),
+    mode=I2S.RX,
+    bits=SAMPLE_SIZE_IN_BITS,
+    format=FORMAT,
+    rate=SAMPLE_RATE,
+    ibuf=BUFFER_LENGTH_IN_BYTES,
+)
+
+# "dtmf" for phone keypad tones, "notes" for C4 to B4
+MODE = "dtmf"
+
+# Samples per measurement: 205 at 8 kHz resolves tones about 39 Hz apart
+BLOCK_SIZE = 205 if MODE == "dtmf" else 800
+
+# Magnitudes below this are treated as silence
+THRESHOLD = 200000
+
+NOTE_NAMES = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
+
+if MODE == "dtmf":
+    bank = GoertzelBank(DTMF_FREQUENCIES, SAMPLE_RATE, BLOCK_SIZE)
+else:
+    bank = GoertzelBank(note_frequencies(-9, 12), SAMPLE_RATE, BLOCK_SIZE)
+
+# Raw I2S words and decoded samples, allocated once
+READ_SAMPLES = 64
+raw = bytearray(READ_SAMPLES * 4)
+samples = array.array('i', [0] * READ_SAMPLES)
+
+
+def read_samples():
+    """Read up to READ_SAMPLES 24-bit samples. Returns how many were read"""
+    count = audio_in.readinto(raw) // 4
+    for i in range(count):
+        b = 4 * i
+        s = (raw[b + 3] << 16) | (raw[b + 2] << 8) | raw[b + 1]
+        if s >= 0x800000:
+            s -= 0x1000000
+        samples[i] = s
+    return count
+
+
+def draw(label):
+    """Show the detected key or note and one bar per target frequency"""
+    oled.fill(0)
+    oled.text(label, 0, 0, 1)
+    mags = bank.mags
+    top = 1
+    for m in mags:
+        if m > top:
+            top = m
+    width = 128 // len(mags)
+    for i in range(len(mags)):
+        h = int(mags[i] * 50 / top)
+        oled.fill_rect(i * width + 1, 63 - h, width - 2, h, 1)
+    oled.show()
+
+
+try:
+    print("Tone Detector ({})".format(MODE))
+    print("Press Ctrl+C to stop")
+
+    while True:
+        count = read_samples()
+        if count == 0 or not bank.update(samples, 0, count):
+            continue
+
+        if MODE == "dtmf":
+            key = dtmf_key(bank.mags, THRESHOLD)
+            label = "Key: {}".format(key) if key else "Key: -"
+        else:
+            peak = bank.peak_bin()
+            if bank.mags[peak] > THRESHOLD:
+                label = "Note: {}4".format(NOTE_NAMES[peak])
+            else:
+                label = "Note: -"
+        draw(label)
+
+except KeyboardInterrupt:
+    print("Monitoring stopped")
+finally:
+    # Clean up
+    audio_in.deinit()
+    print("Program terminated")
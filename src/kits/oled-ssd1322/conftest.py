@@ -0,0 +1,118 @@
+# Shared pytest setup for the host tests of lib/ssd1322.py (CPython).
+#
+# FakeSPI stands in for the bus and for the controller behind it. It follows
+# the D/C pin to split commands from data, writes display data into its own
+# copy of the 480x128 GS4 RAM with the same column/row window wrapping as
+# the SSD1322, and counts the bytes and address windows each present() uses.
+# Tests get a Display on it from the make_display fixture.
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, 'lib'))
+# CPython framebuf, micropython and utime modules
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'tools', 'host'))
+
+
+def load_driver():
+    """Load lib/ssd1322.py as oled_ssd1322.
+
+    The wide-fft kit has a different driver with the same file name, so a
+    plain import would share one module between the two kits' tests.
+    """
+    spec = importlib.util.spec_from_file_location(
+        'oled_ssd1322', os.path.join(HERE, 'lib', 'ssd1322.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+ssd1322 = load_driver()
+ssd1322.sleep_ms = lambda ms: None
+
+SET_COLUMN_ADDRESS = 0x15
+SET_ROW_ADDRESS = 0x75
+WRITE_RAM = 0x5C
+COLUMN_OFFSET = 28
+
+
+class Pin:
+    OUT = 1
+
+    def __init__(self):
+        self.value = 0
+
+    def init(self, mode, value=0):
+        self.value = value
+
+    def __call__(self, value=None):
+        if value is not None:
+            self.value = value
+        return self.value
+
+
+class FakeSPI:
+    def __init__(self, dc):
+        self.dc = dc
+        self.ram = bytearray(240 * 128)  # 120 column addresses of 2 bytes
+        self.command = None
+        self.args = []
+        self.cols = (0, 119)
+        self.rows = (0, 127)
+        self.col = 0
+        self.row = 0
+        self.half = 0
+        self.bytes_sent = 0
+        self.windows = 0
+
+    def write(self, data):
+        self.bytes_sent += len(data)
+        if not self.dc():
+            self.command = data[0]
+            self.args = []
+            if self.command == WRITE_RAM:
+                self.windows += 1
+                self.col = self.cols[0]
+                self.row = self.rows[0]
+                self.half = 0
+            return
+        for byte in bytes(data):
+            if self.command == WRITE_RAM:
+                self.ram[self.row * 240 + self.col * 2 + self.half] = byte
+                self.half ^= 1
+                if not self.half:
+                    self.col += 1
+                    if self.col > self.cols[1]:
+                        self.col = self.cols[0]
+                        self.row += 1
+                        if self.row > self.rows[1]:
+                            self.row = self.rows[0]
+                continue
+            self.args.append(byte)
+            if len(self.args) == 2 and self.command == SET_COLUMN_ADDRESS:
+                self.cols = tuple(self.args)
+            elif len(self.args) == 2 and self.command == SET_ROW_ADDRESS:
+                self.rows = tuple(self.args)
+
+    def visible(self, width=256, height=64):
+        """The part of the display RAM the panel shows, laid out like gs4_buf."""
+        out = bytearray()
+        for row in range(height):
+            start = row * 240 + COLUMN_OFFSET * 2
+            out += self.ram[start:start + width // 2]
+        return out
+
+
+@pytest.fixture
+def make_display():
+    """Factory for (Display, FakeSPI) pairs, so a test can make several."""
+    def make():
+        dc = Pin()
+        spi = FakeSPI(dc)
+        display = ssd1322.Display(spi, Pin(), dc, Pin())
+        return display, spi
+    return make
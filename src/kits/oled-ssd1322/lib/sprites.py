@@ -0,0 +1,266 @@
+"""Rotate and invert bitmaps a byte at a time, and cache loaded sprites.
+
+The Display bitmap loaders used to rotate images with two FrameBuffer
+method calls per pixel. The functions here build the rotated image
+straight into a new buffer instead, so it can be drawn with one blit:
+
+- 180 degrees reverses the byte order, fixing up each byte with a lookup
+  table (SWAP_NIBBLES for GS4, REVERSE_BITS for mono rows)
+- 90 and 270 degrees transpose the image. GS4 output bytes are built from
+  two source bytes with masks; mono pixels are set bit by bit, skipping
+  empty source bytes
+- inversion is an XOR applied to each output byte as it is written
+
+All rotations are clockwise and match the per-pixel versions they
+replace. Images with an odd width or height in GS4 are handled one nibble
+at a time.
+
+SpriteCache keeps the results keyed by (path, format, w, h, rotate,
+invert) up to a byte limit, dropping the least recently used first.
+Display also uses one for the strings draw_text renders.
+"""
+from framebuf import GS8, MONO_HMSB, GS4_HMSB  # type: ignore
+
+
+def _reverse_bits(b):
+    r = 0
+    for _ in range(8):
+        r = (r << 1) | (b & 1)
+        b >>= 1
+    return r
+
+
+SWAP_NIBBLES = bytes([((b << 4) | (b >> 4)) & 0xFF for b in range(256)])
+REVERSE_BITS = bytes([_reverse_bits(b) for b in range(256)])
+
+
+def buffer_size(w, h, format):
+    """Bytes needed for a w x h image in a FrameBuffer format."""
+    if format == GS4_HMSB:
+        return (w * h + 1) // 2
+    if format == MONO_HMSB:
+        return ((w + 7) // 8) * h
+    if format == GS8:
+        return w * h
+    raise ValueError('Unsupported format {0}.'.format(format))
+
+
+def transform(src, w, h, format, rotate=0, invert=False):
+    """Rotate and/or invert an image into a new buffer.
+
+    Args:
+        src (buffer): Image bytes in the given format.
+        w, h (int): Image size.
+        format (int): GS4_HMSB, MONO_HMSB or GS8.
+        rotate (int): 0, 90, 180 or 270 (clockwise).
+        invert (bool): Invert the pixels.
+    Returns:
+        (bytearray, width, height): The new image and its size.
+    """
+    if rotate not in (0, 90, 180, 270):
+        raise ValueError('Invalid rotation {0}.'.format(rotate))
+    if format == GS4_HMSB:
+        return rotate_gs4(src, w, h, rotate, invert)
+    if format == MONO_HMSB:
+        return rotate_mono(src, w, h, rotate, invert)
+    if format == GS8:
+        return rotate_gs8(src, w, h, rotate, invert)
+    raise ValueError('Unsupported format {0}.'.format(format))
+
+
+def _invert_copy(src, size, flip):
+    dst = bytearray(size)
+    for i in range(size):
+        dst[i] = src[i] ^ flip
+    return dst
+
+
+def rotate_gs4(src, w, h, rotate, invert=False):
+    """GS4_HMSB version of transform()."""
+    size = (w * h + 1) // 2
+    flip = 0xFF if invert else 0
+    if rotate == 0:
+        return _invert_copy(src, size, flip), w, h
+
+    dst = bytearray(size)
+    if rotate == 180 and not (w * h) & 1:
+        # Pixel order reversed: byte order reversed, nibbles swapped
+        swap = SWAP_NIBBLES
+        last = size - 1
+        for i in range(size):
+            dst[last - i] = swap[src[i]] ^ flip
+        return dst, w, h
+
+    if rotate != 180 and not (w & 1 or h & 1):
+        # Each output row is a source column. An output byte holds two
+        # source rows, both in the same nibble of their bytes.
+        half = w >> 1
+        j = 0
+        for dy in range(w):
+            if rotate == 90:
+                sx = dy
+                i = (h - 1) * half + (sx >> 1)  # Bottom row upwards
+                step = -half
+            else:
+                sx = w - 1 - dy
+                i = sx >> 1  # Top row downwards
+                step = half
+            step2 = step + step
+            if sx & 1:
+                for _ in range(h >> 1):
+                    dst[j] = (((src[i] << 4) & 0xF0) | (src[i + step] & 0x0F)) ^ flip
+                    i += step2
+                    j += 1
+            else:
+                for _ in range(h >> 1):
+                    dst[j] = ((src[i] & 0xF0) | (src[i + step] >> 4)) ^ flip
+                    i += step2
+                    j += 1
+        return dst, h, w
+
+    # Odd sizes: pixels straddle bytes, go one nibble at a time
+    dw, dh = (w, h) if rotate == 180 else (h, w)
+    flip &= 0x0F
+    q = 0
+    for dy in range(dh):
+        for dx in range(dw):
+            if rotate == 90:
+                p = dy + (h - 1 - dx) * w
+            elif rotate == 180:
+                p = (w - 1 - dx) + (h - 1 - dy) * w
+            else:
+                p = (w - 1 - dy) + dx * w
+            v = ((src[p >> 1] >> (0 if p & 1 else 4)) & 0x0F) ^ flip
+            if q & 1:
+                dst[q >> 1] |= v
+            else:
+                dst[q >> 1] = v << 4
+            q += 1
+    return dst, dw, dh
+
+
+def rotate_mono(src, w, h, rotate, invert=False):
+    """MONO_HMSB version of transform(). Rows are padded to whole bytes."""
+    stride = (w + 7) >> 3
+    flip = 0xFF if invert else 0
+    if rotate == 0:
+        return _invert_copy(src, stride * h, flip), w, h
+
+    if rotate == 180:
+        # Each row is the mirror of another: bytes in reverse order with
+        # their bits reversed, shifted back by the padding bits
+        dst = bytearray(stride * h)
+        pad = stride * 8 - w
+        rev = REVERSE_BITS
+        for y in range(h):
+            s = (h - y) * stride - 1  # Last byte of source row h - 1 - y
+            d = y * stride
+            if not pad:
+                for k in range(stride):
+                    dst[d + k] = rev[src[s - k]] ^ flip
+                continue
+            for k in range(stride):
+                b = rev[src[s - k]] >> pad
+                if k + 1 < stride:
+                    b |= (rev[src[s - k - 1]] << (8 - pad)) & 0xFF
+                dst[d + k] = b ^ flip
+        return dst, w, h
+
+    # 90 or 270: source row sy becomes output column dx
+    dstride = (h + 7) >> 3
+    size = dstride * w
+    dst = bytearray(size)
+    for sy in range(h):
+        dx = h - 1 - sy if rotate == 90 else sy
+        byte = dx >> 3
+        bit = 1 << (dx & 7)
+        row = sy * stride
+        for g in range(stride):
+            b = src[row + g]
+            sx = g << 3
+            while b and sx < w:
+                if b & 1:
+                    dy = sx if rotate == 90 else w - 1 - sx
+                    dst[dy * dstride + byte] |= bit
+                b >>= 1
+                sx += 1
+    if invert:
+        for i in range(size):
+            dst[i] ^= 0xFF
+    return dst, h, w
+
+
+def rotate_gs8(src, w, h, rotate, invert=False):
+    """GS8 version of transform()."""
+    size = w * h
+    flip = 0xFF if invert else 0
+    if rotate == 0:
+        return _invert_copy(src, size, flip), w, h
+    dst = bytearray(size)
+    if rotate == 180:
+        last = size - 1
+        for i in range(size):
+            dst[last - i] = src[i] ^ flip
+        return dst, w, h
+    j = 0
+    for dy in range(w):
+        if rotate == 90:
+            i = (h - 1) * w + dy
+            step = -w
+        else:
+            i = w - 1 - dy
+            step = w
+        for _ in range(h):
+            dst[j] = src[i] ^ flip
+            i += step
+            j += 1
+    return dst, h, w
+
+
+class SpriteCache(object):
+    """Least recently used cache of sprites (or rendered text) with a byte limit."""
+
+    def __init__(self, max_bytes=4096):
+        """Constructor for SpriteCache.
+
+        Args:
+            max_bytes (int): Total buffer bytes to keep (0 disables caching).
+        """
+        self.max_bytes = max_bytes
+        self.entries = {}  # key: (value, size)
+        self.order = []  # Keys, least recently used first
+        self.used = 0
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        """Drop all cached sprites."""
+        self.entries = {}
+        self.order = []
+        self.used = 0
+
+    def get(self, key):
+        """Cached value for key, or None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        if self.order[-1] != key:
+            self.order.remove(key)
+            self.order.append(key)
+        return entry[0]
+
+    def put(self, key, value, size):
+        """Cache value, which holds size bytes, evicting older sprites to fit."""
+        if key in self.entries:
+            self.used -= self.entries.pop(key)[1]
+            self.order.remove(key)
+        if size > self.max_bytes:
+            return
+        while self.used + size > self.max_bytes:
+            oldest = self.order.pop(0)
+            self.used -= self.entries.pop(oldest)[1]
+        self.entries[key] = (value, size)
+        self.order.append(key)
+        self.used += size
@@ -4,12 +4,16 @@ from micropython import const  # type: ignore
 from framebuf import FrameBuffer, GS8, MONO_HMSB, GS4_HMSB  # type: ignore
 from utime import sleep_ms  # type: ignore
 from mono_palette import MonoPalette
+from sprites import SpriteCache, buffer_size, transform
 
 
 class Display(object):
     """Serial interface for monochrome OLED display.
 
     Note:  All coordinates are zero based.
+        The drawing methods record which rows and columns they change and
+        present() sends only those. Call mark_dirty() after drawing on
+        gs4_fb or gs4_buf directly.
     """
 
     # Command constants from display datasheet
@@ -61,12 +65,19 @@ class Display(object):
     COMMANDS_LOCK = const(0x16)
     COMMANDS_UNLOCK = const(0x12)
 
+    # Estimated cost of an address window and of each extra SPI write for
+    # a row of a narrower window, in bytes of transfer time. present()
+    # merges damage when sending the extra pixels is cheaper.
+    WINDOW_COST = const(96)
+    ROW_COST = const(16)
+
     # Column and row maximums
     # NOTE: Unsure if addresses vary among displays
     COLUMN_ADDRESS = const(0x77)
     ROW_ADDRESS = const(0x7F)
 
-    def __init__(self, spi, cs, dc, rst, width=256, height=64):
+    def __init__(self, spi, cs, dc, rst, width=256, height=64,
+                 sprite_cache_bytes=4096, text_cache_bytes=2048):
         """Constructor for Display.
 
         Args:
@@ -76,6 +87,10 @@ class Display(object):
             rst (Class Pin):  Reset pin
             width (Optional int): Screen width (default 256)
             height (Optional int): Screen height (default 64)
+            sprite_cache_bytes (Optional int): Memory for loaded bitmaps
+                (default 4096, 0 to disable)
+            text_cache_bytes (Optional int): Memory for rendered strings
+                (default 2048, 0 to disable)
         """
         self.spi = spi
         self.cs = cs
@@ -87,10 +102,20 @@ class Display(object):
         self.buffer_length = self.byte_width * height
         # Buffer
         self.gs4_buf = bytearray(self.buffer_length)
+        self.view = memoryview(self.gs4_buf)
         # Frame Buffer
         self.gs4_fb = FrameBuffer(self.gs4_buf, width, height, GS4_HMSB)
+        # Changed column addresses (4 pixels each) per row:
+        # dirty_c0 <= address < dirty_c1, empty when equal
+        self.columns = -(-width // 4)
+        self.dirty_c0 = bytearray(height)
+        self.dirty_c1 = bytearray(height)
         # Init palette for mono to GS4 blit
         self.palette = MonoPalette()
+        # Loaded bitmaps by (path, format, w, h, rotate, invert)
+        self.sprites = SpriteCache(sprite_cache_bytes)
+        # Rendered strings by (text, font, rotate, spacing)
+        self.text_cache = SpriteCache(text_cache_bytes)
         self.clear_buffers()
         # Initialize GPIO pins
         self.cs.init(self.cs.OUT, value=1)
@@ -165,6 +190,7 @@ class Display(object):
             gs (int): Grayscale 0=Black to 15=White (default grayscale table)
         """
         self.gs4_fb.fill(gs)
+        self.mark_dirty()
 
     def draw_bitmap_GS4(self, path, x, y, w, h, invert=False, rotate=0):
         """Load GS4_HMSB bitmap from disc and draw to screen.
@@ -178,52 +204,11 @@ class Display(object):
             invert (bool): True = invert image, False (Default) = normal image.
             rotate(int): 0, 90, 180, 270
         Notes:
-            w x h cannot exceed 2048
+            Rotated and inverted images are kept in the sprite cache.
         """
-        array_size = w * h
-        with open(path, "rb") as f:
-            buf = bytearray(f.read(array_size))
-            fb = FrameBuffer(buf, w, h, GS4_HMSB)
-            if rotate == 0 and invert is False:
-                self.gs4_fb.blit(fb, x, y)
-            elif rotate == 0:  # 0 degrees
-                for y1 in range(h):
-                    for x1 in range(w):
-                        self.gs4_fb.pixel(x1 + x, y1 + y,
-                                          15 - fb.pixel(x1, y1))
-            elif rotate == 90:  # 90 degrees
-                for y1 in range(h):
-                    for x1 in range(w):
-                        if invert is True:
-                            self.gs4_fb.pixel(y1 + x, x1 + y,
-                                              15 - fb.pixel(x1, (h - 1) - y1))
-                        else:
-                            self.gs4_fb.pixel(y1 + x, x1 + y,
-                                              fb.pixel(x1, (h - 1) - y1))
-            elif rotate == 180:  # 180 degrees
-                for y1 in range(h):
-                    for x1 in range(w):
-                        if invert is True:
-                            self.gs4_fb.pixel(x1 + x, y1 + y,
-                                              15 - fb.pixel((w - 1) - x1,
-                                                            (h - 1) - y1))
-                        else:
-                            self.gs4_fb.pixel(x1 + x, y1 + y,
-                                              fb.pixel((w - 1) - x1,
-                                                       (h - 1) - y1))
-            elif rotate == 270:  # 270 degrees
-                for y1 in range(h):
-                    for x1 in range(w):
-                        if invert is True:
-                            self.gs4_fb.pixel(y1 + x, x1 + y,
-                                              15 - fb.pixel((w - 1) - x1, y1))
-                        else:
-                            self.gs4_fb.pixel(y1 + x, x1 + y,
-                                              fb.pixel((w - 1) - x1, y1))
-
-            # Clean up because this function can use a lot of memory
-            del fb
-            del buf
+        fb, w, h = self.read_bitmap(path, w, h, GS4_HMSB, invert, rotate)
+        self.gs4_fb.blit(fb, x, y)
+        self.mark_dirty(x, y, w, h)
 
     def draw_bitmap_mono(self, path, x, y, w, h, invert=False,
                          gs=15, rotate=0):
@@ -239,46 +224,17 @@ class Display(object):
             gs (int): Grayscale 0=Black to 15=White (default grayscale table)
             rotate(int): 0, 90, 180, 270
         Notes:
-            w x h cannot exceed 2048
+            Rotated images are kept in the sprite cache.
         """
-        GSMAP = ((0, 15), (15, 0))
-        array_size = w * h
-        with open(path, "rb") as f:
-            buf = bytearray(f.read(array_size))
-            fb = FrameBuffer(buf, w, h, MONO_HMSB)
-
-            if rotate == 0:  # 0 degrees (can you blit for better speed)
-                if invert:
-                    self.palette.bg(gs)
-                    self.palette.fg(0)
-                else:
-                    self.palette.bg(0)
-                    self.palette.fg(gs)
-                self.gs4_fb.blit(fb, x, y, -1, self.palette)
-            elif rotate == 90:  # 90 degrees
-                for y1 in range(h):
-                    for x1 in range(w):
-                        self.gs4_fb.pixel(y1 + x, x1 + y,
-                                          GSMAP[fb.pixel(x1,
-                                                         (h - 1) - y1)]
-                                               [invert])
-            elif rotate == 180:  # 180 degrees
-                for y1 in range(h):
-                    for x1 in range(w):
-                        self.gs4_fb.pixel(x1 + x, y1 + y,
-                                          GSMAP[fb.pixel((w - 1) - x1,
-                                                         (h - 1) - y1)]
-                                               [invert])
-            elif rotate == 270:  # 270 degrees
-                for y1 in range(h):
-                    for x1 in range(w):
-                        self.gs4_fb.pixel(y1 + x, x1 + y,
-                                          GSMAP[fb.pixel((w - 1) - x1,
-                                                         y1)]
-                                               [invert])
-            # Clean up because this function can use a lot of memory
-            del fb
-            del buf
+        fb, w, h = self.read_bitmap(path, w, h, MONO_HMSB, False, rotate)
+        if invert:
+            self.palette.bg(gs)
+            self.palette.fg(0)
+        else:
+            self.palette.bg(0)
+            self.palette.fg(gs)
+        self.gs4_fb.blit(fb, x, y, -1, self.palette)
+        self.mark_dirty(x, y, w, h)
 
     def draw_bitmap_raw(self, path, x, y, w, h, invert=False, rotate=0):
         """Load raw bitmap from disc and draw to screen.
@@ -292,37 +248,11 @@ class Display(object):
             invert (bool): True = invert image, False (Default) = normal image.
             rotate(int): 0, 90, 180, 270
         Notes:
-            w x h cannot exceed 2048
+            Rotated and inverted images are kept in the sprite cache.
         """
-        if rotate == 90 or rotate == 270:
-            w, h = h, w  # Swap width & height if landscape
-
-        buf_size = w * h
-        with open(path, "rb") as f:
-            if rotate == 0:
-                buf = bytearray(f.read(buf_size))
-            elif rotate == 90:
-                buf = bytearray(buf_size)
-                for x1 in range(w - 1, -1, -1):
-                    for y1 in range(h):
-                        index = (w * y1) + x1
-                        buf[index] = f.read(1)[0]
-            elif rotate == 180:
-                buf = bytearray(buf_size)
-                for index in range(buf_size - 1, -1, -1):
-                    buf[index] = f.read(1)[0]
-            elif rotate == 270:
-                buf = bytearray(buf_size)
-                for x1 in range(1, w + 1):
-                    for y1 in range(h - 1, -1, -1):
-                        index = (w * y1) + x1 - 1
-                        buf[index] = f.read(1)[0]
-            if invert:
-                for i, _ in enumerate(buf):
-                    buf[i] ^= 0xFF
-
-            fbuf = FrameBuffer(buf, w, h, GS8)
-            self.gs4_fb.blit(fbuf, x, y)
+        fb, w, h = self.read_bitmap(path, w, h, GS8, invert, rotate)
+        self.gs4_fb.blit(fb, x, y)
+        self.mark_dirty(x, y, w, h)
 
     def draw_circle(self, x0, y0, r, gs=15):
         """Draw a circle.
@@ -430,6 +360,7 @@ class Display(object):
         if self.is_off_grid(x, y, x + w - 1, y):
             return
         self.gs4_fb.hline(x, y, w, gs)
+        self.mark_dirty(x, y, w, 1)
 
     def draw_letter(self, x, y, letter, font,
                     invert=False, gs=15, rotate=False):
@@ -461,6 +392,7 @@ class Display(object):
             self.palette.bg(0)
             self.palette.fg(gs)
         self.gs4_fb.blit(fb, x, y, -1, self.palette)
+        self.mark_dirty(x, y, w, h)
 
         return w, h
 
@@ -489,6 +421,8 @@ class Display(object):
                             max(x1, x2), max(y1, y2)):
             return
         self.gs4_fb.line(x1, y1, x2, y2, gs)
+        self.mark_dirty(min(x1, x2), min(y1, y2),
+                        abs(x2 - x1) + 1, abs(y2 - y1) + 1)
 
     def draw_lines(self, coords, gs=15):
         """Draw multiple lines.
@@ -516,6 +450,15 @@ class Display(object):
         if self.is_off_grid(x, y, x, y):
             return
         self.gs4_fb.pixel(x, y, gs)
+        # mark_dirty() for one pixel, inlined for circles and curves
+        c = x >> 2
+        if self.dirty_c0[y] == self.dirty_c1[y]:
+            self.dirty_c0[y] = c
+            self.dirty_c1[y] = c + 1
+        elif c < self.dirty_c0[y]:
+            self.dirty_c0[y] = c
+        elif c >= self.dirty_c1[y]:
+            self.dirty_c1[y] = c + 1
 
     def draw_polygon(self, sides, x0, y0, r, gs=15, rotate=0):
         """Draw an n-sided regular polygon.
@@ -552,6 +495,7 @@ class Display(object):
             gs (int): Grayscale 0=Black to 15=White (default grayscale table)
         """
         self.gs4_fb.rect(x, y, w, h, gs)
+        self.mark_dirty(x, y, w, h)
 
     def draw_sprite(self, fb, x, y, w, h, invert=False, gs=15):
         """Draw a sprite.
@@ -576,9 +520,10 @@ class Display(object):
             self.palette.bg(0)
             self.palette.fg(gs)
         self.gs4_fb.blit(fb, x, y, -1, self.palette)
+        self.mark_dirty(x, y, w, h)
 
     def draw_text(self, x, y, text, font, invert=False, gs=15,
-                  rotate=0, spacing=1):
+                  rotate=0, spacing=1, cache=True):
         """Draw text.
 
         Args:
@@ -590,43 +535,34 @@ class Display(object):
             invert (bool): Invert color
             rotate (int): Rotation of letter
             spacing (int): Pixels between letters (default: 1)
+            cache (bool): Keep the rendered string for the next call
+                (default True). Use False for text that changes every frame.
+        Note:
+            The string is rendered once into a mono FrameBuffer (see
+            render_text) and drawn with one blit. gs and invert are applied
+            by the palette, so a cached string serves every color.
         """
-        GSMAP = (0, gs)
-        for letter in text:
-            # Get letter array and letter dimensions
-            w, h = self.draw_letter(x, y, letter, font, invert, gs, rotate)
-            # Stop on error
-            if w == 0 or h == 0:
-                return
-            if rotate == 0:
-                # Fill in spacing
-                if spacing:
-                    self.fill_rectangle(x + w, y, spacing, h, GSMAP[invert])
-                # Position x for next letter
-                x += (w + spacing)
-            elif rotate == 90:
-                # Fill in spacing
-                if spacing:
-                    self.fill_rectangle(x, y + h, w, spacing, GSMAP[invert])
-                # Position y for next letter
-                y += (h + spacing)
-            elif rotate == 180:
-                # Fill in spacing
-                if spacing:
-                    self.fill_rectangle(x - w - spacing, y, spacing, h,
-                                        GSMAP[invert])
-                # Position x for next letter
-                x -= (w + spacing)
-            elif rotate == 270:
-                # Fill in spacing
-                if spacing:
-                    self.fill_rectangle(x, y - h - spacing, w, spacing,
-                                        GSMAP[invert])
-                # Position y for next letter
-                y -= (h + spacing)
-            else:
-                print("Invalid rotation.")
+        if rotate not in (0, 90, 180, 270):
+            print("Invalid rotation.")
+            return
+        key = (text, font, rotate, spacing)
+        rendered = self.text_cache.get(key) if cache else None
+        if rendered is None:
+            rendered = self.render_text(text, font, rotate, spacing)
+            if rendered is None:
                 return
+            if cache:
+                self.text_cache.put(key, rendered,
+                                    ((rendered[1] + 7) >> 3) * rendered[2])
+        fb, w, h, dx, dy = rendered
+        if invert:
+            self.palette.bg(gs)
+            self.palette.fg(0)
+        else:
+            self.palette.bg(0)
+            self.palette.fg(gs)
+        self.gs4_fb.blit(fb, x + dx, y + dy, -1, self.palette)
+        self.mark_dirty(x + dx, y + dy, w, h)
 
     def draw_text8x8(self, x, y, text, gs=15):
         """Draw text using built-in MicroPython 8x8 bit font.
@@ -641,6 +577,7 @@ class Display(object):
         if self.is_off_grid(x, y, x + 8, y + 8):
             return
         self.gs4_fb.text(text, x, y, gs)
+        self.mark_dirty(x, y, 8 * len(text), 8)
 
     def draw_vline(self, x, y, h, gs=15):
         """Draw a vertical line.
@@ -655,6 +592,7 @@ class Display(object):
         if self.is_off_grid(x, y, x, y + h):
             return
         self.gs4_fb.vline(x, y, h, gs)
+        self.mark_dirty(x, y, 1, h)
 
     def fill_circle(self, x0, y0, r, gs=15):
         """Draw a filled circle.
@@ -749,6 +687,7 @@ class Display(object):
         if self.is_off_grid(x, y, x + w - 1, y + h - 1):
             return
         self.gs4_fb.fill_rect(x, y, w, h, gs)
+        self.mark_dirty(x, y, w, h)
 
     def fill_polygon(self, sides, x0, y0, r, gs=15, rotate=0):
         """Draw a filled n-sided regular polygon.
@@ -869,66 +808,192 @@ class Display(object):
             invert (bool): True = invert image, False (Default) = normal image.
             rotate(int): 0, 90, 180, 270
         Notes:
-            w x h cannot exceed 2048
+            Sprites come from the sprite cache when loaded before, so
+            callers share them and should not draw on them.
         """
-        array_size = w * h
-        with open(path, "rb") as f:
-            buf = bytearray(f.read(array_size))
-            fb = FrameBuffer(buf, w, h, MONO_HMSB)
-
-            if rotate == 0 and invert is True:  # 0 degrees
-                fb2 = FrameBuffer(bytearray(array_size), w, h, MONO_HMSB)
-                for y1 in range(h):
-                    for x1 in range(w):
-                        fb2.pixel(x1, y1, fb.pixel(x1, y1) ^ 0x01)
-                fb = fb2
-            elif rotate == 90:  # 90 degrees
-                byte_width = (w - 1) // 8 + 1
-                adj_size = h * byte_width
-                fb2 = FrameBuffer(bytearray(adj_size), h, w, MONO_HMSB)
-                for y1 in range(h):
-                    for x1 in range(w):
-                        if invert is True:
-                            fb2.pixel(y1, x1,
-                                      fb.pixel(x1, (h - 1) - y1) ^ 0x01)
-                        else:
-                            fb2.pixel(y1, x1, fb.pixel(x1, (h - 1) - y1))
-                fb = fb2
-            elif rotate == 180:  # 180 degrees
-                fb2 = FrameBuffer(bytearray(array_size), w, h, MONO_HMSB)
-                for y1 in range(h):
-                    for x1 in range(w):
-                        if invert is True:
-                            fb2.pixel(x1, y1, fb.pixel((w - 1) - x1,
-                                                       (h - 1) - y1) ^ 0x01)
-                        else:
-                            fb2.pixel(x1, y1,
-                                      fb.pixel((w - 1) - x1, (h - 1) - y1))
-                fb = fb2
-            elif rotate == 270:  # 270 degrees
-                byte_width = (w - 1) // 8 + 1
-                adj_size = h * byte_width
-                fb2 = FrameBuffer(bytearray(adj_size), h, w, MONO_HMSB)
-                for y1 in range(h):
-                    for x1 in range(w):
-                        if invert is True:
-                            fb2.pixel(y1, x1,
-                                      fb.pixel((w - 1) - x1, y1) ^ 0x01)
-                        else:
-                            fb2.pixel(y1, x1, fb.pixel((w - 1) - x1, y1))
-                fb = fb2
-
-            return fb
-
-    def present(self):
+        return self.read_bitmap(path, w, h, MONO_HMSB, invert, rotate)[0]
+
+    def mark_dirty(self, x=0, y=0, w=None, h=None):
+        """Mark a rectangle as changed so the next present() sends it.
+
+        Args:
+            x, y (Optional int): Starting position (default 0, 0).
+            w, h (Optional int): Size (default: to the edge of the screen).
+        """
+        if w is None:
+            w = self.width - x
+        if h is None:
+            h = self.height - y
+        x0 = max(x, 0)
+        x1 = min(x + w, self.width)
+        y0 = max(y, 0)
+        y1 = min(y + h, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        c0 = x0 >> 2  # 4 pixels per column address
+        c1 = (x1 + 3) >> 2
+        dirty_c0 = self.dirty_c0
+        dirty_c1 = self.dirty_c1
+        for row in range(y0, y1):
+            if dirty_c0[row] == dirty_c1[row]:
+                dirty_c0[row] = c0
+                dirty_c1[row] = c1
+            else:
+                if c0 < dirty_c0[row]:
+                    dirty_c0[row] = c0
+                if c1 > dirty_c1[row]:
+                    dirty_c1[row] = c1
+
+    def present(self, region=None, full=False):
         """Present image to display.
+
+        Sends only the rows and columns drawn since the last call. Rows
+        are merged into one address window while the extra pixels cost
+        less than another window (WINDOW_COST, ROW_COST).
+
+        Args:
+            region (Optional tuple): (x, y, w, h) to send instead of the
+                tracked changes; changes outside it stay pending.
+            full (bool): True sends the whole buffer (default False).
         """
-        x0 = 0
-        x1 = self.width // 4 - 1  # 2 bytes per address, 2 pixels per byte
-        y0 = 0
-        y1 = self.height - 1
-        self.set_address(x0, y0, x1, y1)
-        self.write_data(self.gs4_buf)
+        dirty_c0 = self.dirty_c0
+        dirty_c1 = self.dirty_c1
+        if region is not None:
+            x, y, w, h = region
+            x0 = max(x, 0)
+            x1 = min(x + w, self.width)
+            y0 = max(y, 0)
+            y1 = min(y + h, self.height)
+            if x0 >= x1 or y0 >= y1:
+                return
+            c0 = x0 >> 2
+            c1 = (x1 + 3) >> 2
+            self.write_window(c0, y0, c1, y1)
+            for row in range(y0, y1):
+                if c0 <= dirty_c0[row] and dirty_c1[row] <= c1:
+                    dirty_c0[row] = dirty_c1[row] = 0
+            return
+        if full:
+            self.mark_dirty()
+
+        columns = self.columns
+        window_cost = self.WINDOW_COST
+        row_cost = self.ROW_COST
+        top = -1  # Window being built: rows top to bottom - 1
+        bottom = c0 = c1 = cost = 0
+        for row in range(self.height):
+            a = dirty_c0[row]
+            b = dirty_c1[row]
+            if a == b:
+                continue
+            dirty_c0[row] = dirty_c1[row] = 0
+            row_bytes = (b - a) * 2 + (0 if b - a == columns else row_cost)
+            if top >= 0:
+                # Grow the window to this row (and any clean rows between)
+                # or send it and start a new one, whichever is cheaper
+                m0 = min(a, c0)
+                m1 = max(b, c1)
+                merged = (row + 1 - top) * (
+                    (m1 - m0) * 2 + (0 if m1 - m0 == columns else row_cost))
+                if merged <= cost + row_bytes + window_cost:
+                    bottom = row + 1
+                    c0 = m0
+                    c1 = m1
+                    cost = merged
+                    continue
+                self.write_window(c0, top, c1, bottom)
+            top = row
+            bottom = row + 1
+            c0 = a
+            c1 = b
+            cost = row_bytes
+        if top >= 0:
+            self.write_window(c0, top, c1, bottom)
+
+    def read_bitmap(self, path, w, h, format, invert=False, rotate=0):
+        """Load a bitmap from disc, rotated and inverted, via the sprite cache.
+
+        Args:
+            path (string): Image file path.
+            w (int): Width of image.
+            h (int): Height of image.
+            format (int): GS4_HMSB, MONO_HMSB or GS8.
+            invert (bool): True = invert image, False (Default) = normal image.
+            rotate(int): 0, 90, 180, 270
+        Returns:
+            (FrameBuffer, int, int): Image and its width and height after
+                rotation.
+        """
+        # The same file read as another format or size is another sprite
+        key = (path, format, w, h, rotate, invert)
+        bitmap = self.sprites.get(key)
+        if bitmap is not None:
+            return bitmap
+        size = buffer_size(w, h, format)
+        with open(path, "rb") as f:
+            buf = bytearray(size)
+            f.readinto(buf)
+        if rotate or invert:
+            buf, w, h = transform(buf, w, h, format, rotate, invert)
+        bitmap = (FrameBuffer(buf, w, h, format), w, h)
+        self.sprites.put(key, bitmap, len(buf))
+        return bitmap
+
+    def render_text(self, text, font, rotate=0, spacing=1):
+        """Render a string into a new MONO_HMSB FrameBuffer.
+
+        Letters are laid out as draw_letter would place them one by one,
+        with blank spacing after each. Set pixels are letter pixels.
+
+        Args:
+            text (string): Text to render.
+            font (XglcdFont object): Font.
+            rotate (int): Rotation of letter
+            spacing (int): Pixels between letters (default: 1)
+        Returns:
+            (FrameBuffer, int, int, int, int): Image, its width and height,
+                and its offset from the text position (180 and 270 degree
+                text extends left and up), or None if nothing was rendered.
+        """
+        # Measure first: the font may reuse one buffer for every letter
+        width = height = count = 0
+        for letter in text:
+            fb, w, h = font.get_letter(letter, rotate=rotate)
+            # Stop on error
+            if w == 0 or h == 0:
+                break
+            count += 1
+            if rotate == 0 or rotate == 180:
+                width += w + spacing
+                height = max(height, h)
+            else:
+                width = max(width, w)
+                height += h + spacing
+        if count == 0:
+            return None
+
+        buf = bytearray(((width + 7) >> 3) * height)
+        out = FrameBuffer(buf, width, height, MONO_HMSB)
+        pos = 0
+        for i in range(count):
+            fb, w, h = font.get_letter(text[i], rotate=rotate)
+            if rotate == 0:
+                out.blit(fb, pos, 0)
+                pos += w + spacing
+            elif rotate == 90:
+                out.blit(fb, 0, pos)
+                pos += h + spacing
+            elif rotate == 180:
+                pos += w
+                out.blit(fb, width - pos, 0)
+                pos += spacing
+            else:
+                pos += h
+                out.blit(fb, 0, height - pos)
+                pos += spacing
+        return (out, width, height,
+                -width if rotate == 180 else 0,
+                -height if rotate == 270 else 0)
 
     def reset(self):
         """Perform reset."""
@@ -1040,4 +1105,29 @@ class Display(object):
         self.dc(1)
         self.cs(0)
         self.spi.write(data)
+        self.cs(1)
+
+    def write_window(self, c0, y0, c1, y1):
+        """Write part of the buffer to the same part of the display.
+
+        Args:
+            c0, c1 (int): Column addresses (4 pixels each), c0 <= c < c1.
+            y0, y1 (int): Rows, y0 <= y < y1.
+        """
+        self.set_address(c0, y0, c1 - 1, y1 - 1)
+        byte_width = self.byte_width
+        view = self.view
+        if c0 == 0 and c1 == self.columns:
+            # Whole rows are contiguous in the buffer
+            self.write_data(view[y0 * byte_width:y1 * byte_width])
+            return
+        # The display wraps to the next row at c1, so send row pieces back
+        # to back in one transfer
+        start = y0 * byte_width + c0 * 2
+        length = (c1 - c0) * 2
+        self.dc(1)
+        self.cs(0)
+        for _ in range(y1 - y0):
+            self.spi.write(view[start:start + length])
+            start += byte_width
         self.cs(1)
\ No newline at end of file
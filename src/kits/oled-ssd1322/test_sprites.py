@@ -0,0 +1,139 @@
+# Host tests for lib/sprites.py (CPython):  python3 -m pytest test_sprites.py
+# Every rotation is checked pixel by pixel against the per-pixel loops the
+# Display loaders used before, on the framebuf emulator from tools/host.
+
+import os
+import random
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, 'lib'))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'tools', 'host'))
+
+from framebuf import FrameBuffer, GS8, MONO_HMSB, GS4_HMSB
+import sprites
+
+TOP = {GS4_HMSB: 15, MONO_HMSB: 1, GS8: 255}
+SIZES = [(8, 8), (16, 6), (5, 3), (7, 10), (12, 9), (1, 4)]
+
+
+def random_image(w, h, format, seed):
+    rng = random.Random(seed)
+    buf = bytearray(rng.getrandbits(8) for _ in range(sprites.buffer_size(w, h, format)))
+    return buf
+
+
+def reference(src, w, h, format, rotate, invert):
+    """Pixels of the rotated image, computed one pixel at a time."""
+    fb = FrameBuffer(src, w, h, format)
+    top = TOP[format]
+    dw, dh = (h, w) if rotate in (90, 270) else (w, h)
+    out = {}
+    for dy in range(dh):
+        for dx in range(dw):
+            if rotate == 0:
+                v = fb.pixel(dx, dy)
+            elif rotate == 90:
+                v = fb.pixel(dy, h - 1 - dx)
+            elif rotate == 180:
+                v = fb.pixel(w - 1 - dx, h - 1 - dy)
+            else:
+                v = fb.pixel(w - 1 - dy, dx)
+            out[dx, dy] = top - v if invert else v
+    return out, dw, dh
+
+
+@pytest.mark.parametrize("format", [GS4_HMSB, MONO_HMSB, GS8])
+@pytest.mark.parametrize("rotate", [0, 90, 180, 270])
+@pytest.mark.parametrize("invert", [False, True])
+def test_transform_matches_per_pixel(format, rotate, invert):
+    for n, (w, h) in enumerate(SIZES):
+        src = random_image(w, h, format, n)
+        buf, dw, dh = sprites.transform(src, w, h, format, rotate, invert)
+        expected, ew, eh = reference(src, w, h, format, rotate, invert)
+        assert (dw, dh) == (ew, eh)
+        assert len(buf) == sprites.buffer_size(dw, dh, format)
+        fb = FrameBuffer(buf, dw, dh, format)
+        got = {(x, y): fb.pixel(x, y) for y in range(dh) for x in range(dw)}
+        assert got == expected, (w, h)
+
+
+def test_tables_and_errors():
+    assert sprites.SWAP_NIBBLES[0x1F] == 0xF1
+    assert sprites.REVERSE_BITS[0x01] == 0x80
+    assert sprites.REVERSE_BITS[0b00110101] == 0b10101100
+    with pytest.raises(ValueError):
+        sprites.transform(bytearray(8), 4, 4, GS4_HMSB, 45)
+
+
+def test_cache_evicts_least_recently_used():
+    cache = sprites.SpriteCache(100)
+    cache.put('a', 1, 40)
+    cache.put('b', 2, 40)
+    assert cache.get('a') == 1      # b is now the oldest
+    cache.put('c', 3, 40)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert cache.used == 80
+    cache.put('huge', 4, 200)       # Bigger than the cache: not kept
+    assert cache.get('huge') is None and cache.used == 80
+    cache.put('a', 5, 10)
+    assert cache.get('a') == 5 and cache.used == 50
+    assert cache.hits == 4 and cache.misses == 2
+
+
+def test_display_loaders_rotate_and_cache(make_display, tmp_path):
+    display, spi = make_display()
+    mono = tmp_path / "arrow.mono"
+    mono.write_bytes(bytes(random_image(12, 9, MONO_HMSB, 7)))
+    display.draw_bitmap_mono(str(mono), 10, 5, 12, 9, rotate=90)
+    expected, dw, dh = reference(mono.read_bytes(), 12, 9, MONO_HMSB, 90, False)
+    assert all(display.gs4_fb.pixel(10 + x, 5 + y) == 15 * v for (x, y), v in expected.items())
+
+    # The second draw comes from the cache, inverted through the palette
+    display.draw_bitmap_mono(str(mono), 10, 5, 12, 9, invert=True, gs=9, rotate=90)
+    assert display.sprites.hits == 1
+    assert all(display.gs4_fb.pixel(10 + x, 5 + y) == 9 * (1 - v) for (x, y), v in expected.items())
+
+    sprite = display.load_sprite(str(mono), 12, 9, invert=True, rotate=180)
+    assert sprite is display.load_sprite(str(mono), 12, 9, invert=True, rotate=180)
+
+    gs4 = tmp_path / "logo.gs4"
+    gs4.write_bytes(bytes(random_image(16, 6, GS4_HMSB, 3)))
+    display.draw_bitmap_GS4(str(gs4), 100, 40, 16, 6, invert=True, rotate=270)
+    expected, dw, dh = reference(gs4.read_bytes(), 16, 6, GS4_HMSB, 270, True)
+    assert all(display.gs4_fb.pixel(100 + x, 40 + y) == v for (x, y), v in expected.items())
+
+    raw = tmp_path / "photo.raw"
+    raw.write_bytes(bytes(random_image(5, 3, GS8, 4)))
+    display.draw_bitmap_raw(str(raw), 0, 0, 5, 3, rotate=90)
+    expected, dw, dh = reference(raw.read_bytes(), 5, 3, GS8, 90, False)
+    assert all(display.gs4_fb.pixel(x, y) == v & 15 for (x, y), v in expected.items())
+
+    display.present()
+    assert spi.visible() == display.gs4_buf
+    assert display.sprites.used <= 4096
+
+
+def test_one_file_in_two_formats(make_display, tmp_path):
+    display, _ = make_display()
+    path = tmp_path / "tile.bin"
+    path.write_bytes(bytes(random_image(8, 4, GS8, 5)))
+    display.draw_bitmap_GS4(str(path), 0, 0, 8, 4)
+    display.draw_bitmap_raw(str(path), 20, 0, 8, 4)
+    display.draw_bitmap_raw(str(path), 40, 0, 4, 8)
+    assert display.sprites.hits == 0 and len(display.sprites.entries) == 3
+    expected, dw, dh = reference(path.read_bytes(), 8, 4, GS8, 0, False)
+    assert all(display.gs4_fb.pixel(20 + x, y) == v & 15 for (x, y), v in expected.items())
+
+
+def test_cache_can_be_disabled(make_display, tmp_path):
+    display, _ = make_display()
+    display.sprites = sprites.SpriteCache(0)
+    path = tmp_path / "dot.mono"
+    path.write_bytes(b"\x01")
+    a = display.load_sprite(str(path), 1, 1)
+    b = display.load_sprite(str(path), 1, 1)
+    assert a is not b and display.sprites.used == 0
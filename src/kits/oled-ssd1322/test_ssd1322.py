@@ -0,0 +1,81 @@
+# Host tests for lib/ssd1322.py (CPython):  python3 -m pytest test_ssd1322.py
+# The fake bus and the make_display fixture are in conftest.py.
+
+
+def present(display, spi, **kwargs):
+    spi.bytes_sent = 0
+    spi.windows = 0
+    display.present(**kwargs)
+    assert spi.visible() == display.gs4_buf
+    return spi.bytes_sent
+
+
+def test_full_frame_then_nothing(make_display):
+    display, spi = make_display()
+    assert spi.visible() == display.gs4_buf
+    display.fill_rectangle(0, 0, 256, 64, 7)
+    assert present(display, spi) > 8192
+    assert spi.windows == 1
+    assert present(display, spi) == 0
+    assert spi.windows == 0
+
+
+def test_small_change_sends_a_small_window(make_display):
+    display, spi = make_display()
+    display.draw_text8x8(100, 20, "42", 15)
+    sent = present(display, spi)
+    # 16 pixels = 4 column addresses = 8 bytes per row, 8 rows
+    assert sent < 8 * 8 + 20
+    assert spi.windows == 1
+
+
+def test_distant_changes_use_separate_windows(make_display):
+    display, spi = make_display()
+    display.fill_rectangle(0, 0, 8, 4, 15)
+    display.fill_rectangle(240, 56, 8, 4, 15)
+    sent = present(display, spi)
+    assert spi.windows == 2
+    assert sent < 2 * (4 * 4 + 20)
+
+    # Touching rows with similar columns are merged into one window
+    display.fill_rectangle(40, 10, 40, 4, 9)
+    display.fill_rectangle(44, 14, 40, 4, 3)
+    present(display, spi)
+    assert spi.windows == 1
+
+
+def test_bars_redraw_only_their_rows(make_display):
+    display, spi = make_display()
+    for i in range(64):
+        display.fill_rectangle(i * 4, 63 - (i % 8), 2, i % 8 + 1, 12)
+    sent = present(display, spi)
+    assert sent < 8 * 128 + 100
+    assert spi.windows == 1
+
+
+def test_pixels_circles_and_lines(make_display):
+    display, spi = make_display()
+    display.draw_circle(128, 32, 20, 9)
+    display.draw_line(3, 60, 250, 2, 5)
+    present(display, spi)
+    display.draw_pixel(255, 63, 15)
+    assert present(display, spi) < 40
+
+
+def test_region_and_full(make_display):
+    display, spi = make_display()
+    display.fill_rectangle(10, 10, 20, 5, 15)
+    display.fill_rectangle(200, 40, 20, 5, 15)
+    spi.windows = 0
+    display.present(region=(0, 0, 128, 32))
+    assert spi.windows == 1
+    assert spi.visible() != display.gs4_buf
+    # The change outside the region is still pending
+    sent = present(display, spi)
+    assert spi.windows == 1 and 0 < sent < 200
+
+    display.gs4_buf[100] = 0x5A
+    display.mark_dirty(200, 0, 2, 1)
+    present(display, spi)
+    display.gs4_buf[5000] = 0xA5
+    assert present(display, spi, full=True) > 8192
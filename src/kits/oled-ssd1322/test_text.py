@@ -0,0 +1,117 @@
+# Host tests for Display.draw_text (CPython):  python3 -m pytest test_text.py
+# Cached, composed strings must draw exactly what drawing letter by letter
+# with draw_letter and spacing rectangles did.
+
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, 'lib'))
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'tools', 'host'))
+
+from framebuf import FrameBuffer, MONO_VLSB
+
+
+class FakeFont:
+    """Proportional 8 pixel font like XglcdFont; '~' is missing.
+
+    Like XglcdFont, every letter comes back in the same buffer, as a
+    FrameBuffer the size of the letter.
+    """
+
+    def __init__(self):
+        self.buf = bytearray(16)
+        self.calls = 0
+
+    def get_letter(self, letter, rotate=0):
+        self.calls += 1
+        if letter == '~':
+            return None, 0, 0
+        code = ord(letter)
+        w = 3 + code % 4
+        size = (8, w) if rotate in (90, 270) else (w, 8)
+        for i in range(len(self.buf)):
+            self.buf[i] = 0
+        fb = FrameBuffer(self.buf, size[0], size[1], MONO_VLSB)
+        for x in range(w):
+            for y in range(8):
+                if (code >> ((x + y) % 7)) & 1:
+                    if rotate == 0:
+                        fb.pixel(x, y, 1)
+                    elif rotate == 90:
+                        fb.pixel(7 - y, x, 1)
+                    elif rotate == 180:
+                        fb.pixel(w - 1 - x, 7 - y, 1)
+                    else:
+                        fb.pixel(y, w - 1 - x, 1)
+        return fb, size[0], size[1]
+
+
+def draw_text_per_letter(display, x, y, text, font, invert, gs, rotate, spacing):
+    """draw_text as it was: one draw_letter and spacing rectangle per letter."""
+    gsmap = (0, gs)
+    for letter in text:
+        w, h = display.draw_letter(x, y, letter, font, invert, gs, rotate)
+        if w == 0 or h == 0:
+            return
+        if rotate == 0:
+            display.fill_rectangle(x + w, y, spacing, h, gsmap[invert])
+            x += w + spacing
+        elif rotate == 90:
+            display.fill_rectangle(x, y + h, w, spacing, gsmap[invert])
+            y += h + spacing
+        elif rotate == 180:
+            display.fill_rectangle(x - w - spacing, y, spacing, h, gsmap[invert])
+            x -= w + spacing
+        else:
+            display.fill_rectangle(x, y - h - spacing, w, spacing, gsmap[invert])
+            y -= h + spacing
+
+
+@pytest.mark.parametrize("rotate", [0, 90, 180, 270])
+@pytest.mark.parametrize("invert", [False, True])
+def test_matches_letter_by_letter(make_display, rotate, invert):
+    font = FakeFont()
+    text = "Hz 440"
+    for spacing in (1, 2):
+        cached, _ = make_display()
+        plain, _ = make_display()
+        cached.clear_buffers(5)
+        plain.clear_buffers(5)
+        cached.draw_text(120, 40, text, font, invert, 11, rotate, spacing)
+        draw_text_per_letter(plain, 120, 40, text, font, invert, 11, rotate, spacing)
+        assert cached.gs4_buf == plain.gs4_buf
+
+
+def test_repeat_draws_are_one_blit(make_display):
+    font = FakeFont()
+    display, spi = make_display()
+    display.draw_text(2, 2, "Peak:", font)
+    calls = font.calls
+    display.draw_text(2, 20, "Peak:", font, invert=True, gs=6)
+    assert font.calls == calls
+    assert display.text_cache.hits == 1
+    display.present()
+    assert spi.visible() == display.gs4_buf
+
+
+def test_errors_uncached_and_memory_limit(make_display):
+    font = FakeFont()
+    display, _ = make_display()
+    # Rendering stops at a missing letter, as before
+    display.draw_text(0, 0, "ab~cd", font)
+    plain, _ = make_display()
+    draw_text_per_letter(plain, 0, 0, "ab~cd", font, False, 15, 0, 1)
+    assert display.gs4_buf == plain.gs4_buf
+
+    display.draw_text(0, 0, "~", font)
+    display.draw_text(0, 0, "x", font, rotate=45)
+
+    display.draw_text(0, 30, "12:00", font, cache=False)
+    assert display.text_cache.get(("12:00", font, 0, 1)) is None
+
+    for n in range(300):
+        display.draw_text(0, 50, str(n), font)
+    assert display.text_cache.used <= 2048
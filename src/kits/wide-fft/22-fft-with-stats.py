@@ -7,6 +7,7 @@ import math
 import struct
 import time
 import array
+from smoothing import SpectrumSmoother
 
 # Initialize SPI and OLED from config.py
 spi = SPI(config.SPI_BUS, 
@@ -56,6 +57,12 @@ FFT_SIZE = 512
 FREQ_PER_BIN = SAMPLE_RATE / FFT_SIZE  # Frequency resolution per FFT bin
 MAX_FREQUENCY = SAMPLE_RATE / 2  # Nyquist frequency (max measurable frequency)
 
+# Number of frequency bins to display - use close to full display width
+NUM_BINS = config.DISPLAY_WIDTH // 4  # Each bar uses 4 pixels (2 for bar, 2 for spacing)
+
+# Bars rise quickly and sink smoothly, with peak markers that hold then fall
+smoother = SpectrumSmoother(NUM_BINS)
+
 # Precompute the Hanning window coefficients
 hanning_window = array.array('f', [0] * FFT_SIZE)
 for i in range(FFT_SIZE):
@@ -196,8 +203,7 @@ def draw_spectrum(magnitudes):
     # Clear the display
     disp.fill(0)
     
-    # Number of frequency bins to display - use close to full display width
-    num_bins = config.DISPLAY_WIDTH // 4  # Each bar uses 4 pixels (2 for bar, 2 for spacing)
+    num_bins = NUM_BINS
     
     # Combine frequency bins to fit display
     display_bins = array.array('f', [0] * num_bins)
@@ -215,12 +221,12 @@ def draw_spectrum(magnitudes):
         for j in range(start_idx, end_idx):
             bin_sum += magnitudes[j]
         display_bins[i] = bin_sum / (end_idx - start_idx)
+    smoother.update(display_bins)
+    levels = smoother.level
+    peaks = smoother.peaks
     
-    # Find maximum value for scaling (avoid division by zero)
-    max_magnitude = 1
-    for mag in display_bins:
-        if mag > max_magnitude:
-            max_magnitude = mag
+    # Scale to the highest peak marker (avoid division by zero)
+    max_magnitude = max(1, smoother.loudest())
     
     # Use full display height with small margin
     display_height = config.DISPLAY_HEIGHT - 12  # Reduce height to make room for frequency display
@@ -238,9 +244,9 @@ def draw_spectrum(magnitudes):
     disp.text(max_freq_text, config.DISPLAY_WIDTH - len(max_freq_text) * 8 - 2, 2, 15)
     
     # Draw the spectrum
-    for i in range(len(display_bins)):
+    for i in range(num_bins):
         # Apply log scaling for more balanced distribution
-        normalized = display_bins[i] / max_magnitude
+        normalized = levels[i] / max_magnitude
         height = int(math.sqrt(normalized) * display_height * 0.9)  # Scale to 90% of display height
         
         # Draw vertical bar - SSD1322 supports 16 gray levels (0-15)
@@ -252,6 +258,11 @@ def draw_spectrum(magnitudes):
                 # Calculate gradient from bottom to top (15->8)
                 level = max(8, int(15 - (7 * (baseline - y) / height)))
                 disp.line(x, y, x + 1, y, level)  # Use line to draw 2px wide with same gray level
+        
+        # Peak marker above the bar at full brightness
+        peak = int(math.sqrt(peaks[i] / max_magnitude) * display_height * 0.9)
+        if peak > height:
+            disp.line(x, baseline - peak, x + 1, baseline - peak, 15)
     
     # Draw baseline
     disp.line(0, baseline, config.DISPLAY_WIDTH - 1, baseline, 15)
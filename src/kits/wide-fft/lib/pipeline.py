@@ -0,0 +1,184 @@
+# pipeline.py Buffered producer/consumer frames across two threads
+# On an RP2040 _thread.start_new_thread() runs a function on the second core.
+# FramePipeline uses that to overlap the two halves of an analyzer loop:
+# - the producer thread (core 1) captures audio and computes the spectrum
+#   into a preallocated frame buffer
+# - the consumer (the main thread on core 0) draws the latest finished frame
+#   and sends it to the display
+#
+# With one loop the frame time is capture + FFT + draw + SPI transfer. With
+# the pipeline it is the slower of the two halves.
+#
+# Buffer handoff, under one lock:
+# - ready is the buffer holding the newest finished frame, or -1
+# - reading is the buffer the consumer is drawing, or -1
+# The producer writes the third buffer, which is neither, then makes it the
+# ready one. Double buffering alone is not enough: while the consumer draws
+# one buffer and the other holds an unread frame, the producer would have to
+# wait or overwrite that frame, and either halves the frame rate. If the
+# consumer falls behind, the unread frame is replaced and counted in dropped,
+# so the display always shows the latest spectrum and the producer never
+# waits for the display.
+#
+# _thread is the same module in CPython, so test_pipeline.py runs this code
+# on a PC with real threads.
+
+import _thread
+import array
+import time
+
+try:
+    _ticks_us = time.ticks_us
+    _ticks_diff = time.ticks_diff
+    _sleep_ms = time.sleep_ms
+except AttributeError:          # CPython
+    def _ticks_us():
+        return time.perf_counter_ns() // 1000
+
+    def _ticks_diff(end, start):
+        return end - start
+
+    def _sleep_ms(ms):
+        time.sleep(ms / 1000)
+
+
+class StageStats:
+    """Total microseconds and call counts per named stage, for one thread."""
+
+    def __init__(self):
+        self.totals = {}
+        self.counts = {}
+
+    def add(self, name, us):
+        self.totals[name] = self.totals.get(name, 0) + us
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def time(self, name, start):
+        """Add the time since start (a ticks_us() value); returns the current ticks."""
+        now = _ticks_us()
+        self.add(name, _ticks_diff(now, start))
+        return now
+
+    def averages(self):
+        """(name, average ms) for each stage in the order first seen."""
+        # The other thread may be adding a stage while this runs
+        totals = self.totals
+        counts = self.counts
+        return [(name, totals[name] / counts[name] / 1000)
+                for name in list(totals) if counts.get(name)]
+
+    def reset(self):
+        self.totals = {}
+        self.counts = {}
+
+
+class FramePipeline:
+    def __init__(self, produce, consume, size, typecode='f'):
+        self.produce = produce      # produce(buf, stats) -> True if buf now holds a frame
+        self.consume = consume      # consume(buf, stats) draws and shows a frame
+        self.buffers = [array.array(typecode, [0] * size) for _ in range(3)]
+        self.lock = _thread.allocate_lock()
+        self.ready = -1
+        self.reading = -1
+        self.running = False
+        self.producer_done = True
+        self.error = None           # Exception that stopped the producer
+        self.produced = 0
+        self.consumed = 0
+        self.dropped = 0
+        self.waits = 0              # Consumer polls that found no new frame
+        self.producer_stats = StageStats()
+        self.consumer_stats = StageStats()
+        # Set by the consumer after a report. The producer clears its own
+        # stats, so they are never reset in the middle of an add()
+        self.reset_requested = False
+
+    def start(self):
+        """Start the producer on the second core (a new thread on a PC)."""
+        self.running = True
+        self.producer_done = False
+        _thread.start_new_thread(self.producer_loop, ())
+
+    def stop(self):
+        """Ask the producer to finish its frame and wait until it has."""
+        self.running = False
+        while not self.producer_done:
+            _sleep_ms(1)
+
+    def producer_loop(self):
+        stats = self.producer_stats
+        try:
+            while self.running:
+                if self.reset_requested:
+                    self.reset_requested = False
+                    stats.reset()
+                with self.lock:
+                    index = 0
+                    while index == self.reading or index == self.ready:
+                        index += 1
+                start = _ticks_us()
+                if not self.produce(self.buffers[index], stats):
+                    continue
+                stats.time('frame', start)
+                with self.lock:
+                    if self.ready >= 0:
+                        # The consumer never took the previous frame
+                        self.dropped += 1
+                    self.ready = index
+                    self.produced += 1
+        except Exception as e:
+            self.error = e
+            self.running = False
+        finally:
+            self.producer_done = True
+
+    def consume_next(self):
+        """Consume the newest frame if there is one. Returns True if it did."""
+        with self.lock:
+            index = self.ready
+            if index >= 0:
+                self.reading = index
+                self.ready = -1
+        if index < 0:
+            self.waits += 1
+            return False
+        start = _ticks_us()
+        try:
+            self.consume(self.buffers[index], self.consumer_stats)
+        finally:
+            with self.lock:
+                self.reading = -1
+        self.consumer_stats.time('frame', start)
+        self.consumed += 1
+        return True
+
+    def run(self, frames=None, report_every=0, report=print):
+        """Consume frames on this thread until stopped or frames have been shown.
+
+        Every report_every frames the per-stage averages are passed to report.
+        """
+        shown = 0
+        try:
+            while self.running and (frames is None or shown < frames):
+                if not self.consume_next():
+                    _sleep_ms(1)
+                    continue
+                shown += 1
+                if report_every and shown % report_every == 0:
+                    report(self.report())
+                    self.reset_requested = True
+                    self.consumer_stats.reset()
+        finally:
+            self.stop()
+        if self.error is not None:
+            raise self.error
+
+    def report(self):
+        """Per-stage timing summary for both threads."""
+        lines = ["Producer (capture core): " + ", ".join(
+                     "{} {:.2f} ms".format(name, ms) for name, ms in self.producer_stats.averages()),
+                 "Consumer (display core): " + ", ".join(
+                     "{} {:.2f} ms".format(name, ms) for name, ms in self.consumer_stats.averages()),
+                 "Frames produced {}, shown {}, dropped {}".format(
+                     self.produced, self.consumed, self.dropped)]
+        return "\n".join(lines)
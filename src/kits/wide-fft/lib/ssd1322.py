@@ -5,18 +5,33 @@ other: SSD1322 Advance Information 480 x 128, Dot Matrix High Power OLED/PLED Se
        (9 COMMAND TABLE)  https://www.newhavendisplay.com/resources_dataFiles/datasheets/OLEDs/SSD1322.pdf
 
 set set_orientation by Dan McCreary in March of 2025.
+
+The drawing methods record which rows and columns they change and show()
+sends only those. Call mark_dirty() after drawing on framebuf or buffer directly.
 """
 __version__ = '0.2'
 
 import time
 import framebuf
 
+# Estimated cost of an address window and of each extra write for a row of a
+# narrower window, in bytes of transfer time. show() merges damage when
+# sending the extra pixels is cheaper.
+WINDOW_COST = 96
+ROW_COST = 16
+
 class SSD1322:
     def __init__(self, width=256, height=64):
         self.width = width
         self.height = height
         self.buffer = bytearray(self.width * self.height //2)
         self.framebuf = framebuf.FrameBuffer(self.buffer, self.width, self.height, framebuf.GS4_HMSB)
+        self.view = memoryview(self.buffer)
+        # Changed column addresses (4 pixels each) per row:
+        # dirty_c0 <= address < dirty_c1, empty when equal
+        self.columns = self.width // 4
+        self.dirty_c0 = bytearray(self.height)
+        self.dirty_c1 = bytearray(self.height)
 
         # self.poweron()
         time.sleep_ms(5)
@@ -151,39 +166,143 @@ class SSD1322:
     def invert(self, invert):
         self.write_cmd(0xA4 | (invert & 1) << 1 | (invert & 1)) # 0xA4=Normal, 0xA7=Inverted
 
-    def show(self):
+    def mark_dirty(self, x=0, y=0, w=None, h=None):
+        """Mark a rectangle as changed so the next show() sends it (default: everything)."""
+        if w is None:
+            w = self.width - x
+        if h is None:
+            h = self.height - y
+        x0 = max(x, 0)
+        x1 = min(x + w, self.width)
+        y0 = max(y, 0)
+        y1 = min(y + h, self.height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        c0 = x0 >> 2
+        c1 = (x1 + 3) >> 2
+        dirty_c0 = self.dirty_c0
+        dirty_c1 = self.dirty_c1
+        for row in range(y0, y1):
+            if dirty_c0[row] == dirty_c1[row]:
+                dirty_c0[row] = c0
+                dirty_c1[row] = c1
+            else:
+                if c0 < dirty_c0[row]:
+                    dirty_c0[row] = c0
+                if c1 > dirty_c1[row]:
+                    dirty_c1[row] = c1
+
+    def show(self, region=None, full=False):
+        """Send the rows and columns changed since the last show().
+
+        region=(x, y, w, h) sends that area instead and leaves other changes
+        pending; full=True sends the whole buffer.
+        """
+        dirty_c0 = self.dirty_c0
+        dirty_c1 = self.dirty_c1
+        if region is not None:
+            x, y, w, h = region
+            x0 = max(x, 0)
+            x1 = min(x + w, self.width)
+            y0 = max(y, 0)
+            y1 = min(y + h, self.height)
+            if x0 >= x1 or y0 >= y1:
+                return
+            c0 = x0 >> 2
+            c1 = (x1 + 3) >> 2
+            self.write_window(c0, y0, c1, y1)
+            for row in range(y0, y1):
+                if c0 <= dirty_c0[row] and dirty_c1[row] <= c1:
+                    dirty_c0[row] = dirty_c1[row] = 0
+            return
+        if full:
+            self.mark_dirty()
+
+        # Grow a window row by row (over clean rows too) while that costs
+        # less than sending it and starting another
+        columns = self.columns
+        top = -1
+        bottom = c0 = c1 = cost = 0
+        for row in range(self.height):
+            a = dirty_c0[row]
+            b = dirty_c1[row]
+            if a == b:
+                continue
+            dirty_c0[row] = dirty_c1[row] = 0
+            row_bytes = (b - a) * 2 + (0 if b - a == columns else ROW_COST)
+            if top >= 0:
+                m0 = min(a, c0)
+                m1 = max(b, c1)
+                merged = (row + 1 - top) * ((m1 - m0) * 2 + (0 if m1 - m0 == columns else ROW_COST))
+                if merged <= cost + row_bytes + WINDOW_COST:
+                    bottom = row + 1
+                    c0 = m0
+                    c1 = m1
+                    cost = merged
+                    continue
+                self.write_window(c0, top, c1, bottom)
+            top = row
+            bottom = row + 1
+            c0 = a
+            c1 = b
+            cost = row_bytes
+        if top >= 0:
+            self.write_window(c0, top, c1, bottom)
+
+    def write_window(self, c0, y0, c1, y1):
+        """Send column addresses c0 <= c < c1 (4 pixels each) of rows y0 <= y < y1."""
         offset=(480-self.width)//2
         col_start=offset//4
         # Adjust column addressing to fix the 16-pixel shift
         col_start += 4  # Shift right by 16 pixels (4 nibbles)
-        col_end=col_start+self.width//4-1
         self.write_cmd(0x15)
-        self.write_data(col_start)
-        self.write_data(col_end)
+        self.write_data(col_start+c0)
+        self.write_data(col_start+c1-1)
         self.write_cmd(0x75)
-        self.write_data(0)
-        self.write_data(self.height-1)
+        self.write_data(y0)
+        self.write_data(y1-1)
         self.write_cmd(0x5c)
-        self.write_data(self.buffer)
+        row_bytes = self.width // 2
+        if c0 == 0 and c1 == self.columns:
+            # Whole rows are contiguous in the buffer
+            self.write_data(self.view[y0*row_bytes:y1*row_bytes])
+            return
+        # The display wraps to the next row at c1, so the pieces of each row
+        # follow one another
+        start = y0*row_bytes + c0*2
+        length = (c1-c0)*2
+        for _ in range(y1-y0):
+            self.write_data(self.view[start:start+length])
+            start += row_bytes
 
     def fill(self, col):
         self.framebuf.fill(col)
+        self.mark_dirty()
+
+    def fill_rect(self, x, y, w, h, col):
+        self.framebuf.fill_rect(x, y, w, h, col)
+        self.mark_dirty(x, y, w, h)
 
     def pixel(self, x, y, col):
         self.framebuf.pixel(x, y, col)
+        self.mark_dirty(x, y, 1, 1)
 
     def pp(self,x,y,col):
         self.buffer[self.width//2*y+x//2]=0xff if col else 0
+        self.mark_dirty(x & ~1, y, 2, 1)
 
     def line(self, x1, y1, x2, y2, col):
         self.framebuf.line(x1, y1, x2, y2, col)
+        self.mark_dirty(min(x1, x2), min(y1, y2), abs(x2 - x1) + 1, abs(y2 - y1) + 1)
 
     def scroll(self, dx, dy):
         self.framebuf.scroll(dx, dy)
+        self.mark_dirty()
         # software scroll
 
     def text(self, string, x, y, col=15):
         self.framebuf.text(string, x, y, col)
+        self.mark_dirty(x, y, 8 * len(string), 8)
 
     def write_cmd(self):
         raise NotImplementedError
@@ -217,11 +336,11 @@ class SSD1322_SPI(SSD1322):
     #@micropython.native
     def write_data( self, aData ) :
         '''Write given data to the device.  This may be
-           either a single int or a bytearray of values.'''
+           either a single int or a bytearray (or memoryview) of values.'''
         self.dc(1)
         self.cs(0)
-        if type(aData)==bytes or type(aData)==bytearray:
-            self.spi.write(aData)
-        else:
+        if type(aData)==int:
             self.spi.write(bytearray([aData]))
+        else:
+            self.spi.write(aData)
         self.cs(1)
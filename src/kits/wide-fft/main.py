@@ -7,6 +7,9 @@ import math
 import struct
 import time
 import array
+from bands import BandMapper
+from smoothing import SpectrumSmoother
+from pipeline import FramePipeline
 
 # Initialize SPI and OLED from config.py
 spi = SPI(config.SPI_BUS, 
@@ -52,11 +55,38 @@ audio_in = I2S(
 # FFT size (must be a power of 2)
 FFT_SIZE = 512
 
+# Real microphone samples can be transformed with an FFT of half the size
+# (see real_fft), which roughly halves the time and memory per frame
+USE_REAL_FFT = True
+
+# Capture and FFT on the second core while the first core draws and updates
+# the display (see lib/pipeline.py); False runs every stage in one loop
+PIPELINED = True
+PIPELINE_REPORT_EVERY = 100  # Print per-stage timings every N frames, 0 for never
+
 # Calculate frequency related values
 FREQ_PER_BIN = SAMPLE_RATE / FFT_SIZE  # Frequency resolution per FFT bin
 NYQUIST_FREQUENCY = SAMPLE_RATE / 2  # Theoretical max frequency (Nyquist)
 MAX_FREQUENCY = 2500  # Set maximum display frequency to 2500 Hz
 
+# Display bars: each uses 4 pixels (2 for bar, 2 for spacing), spaced evenly
+# in log(frequency) from BAND_MIN_FREQUENCY to MAX_FREQUENCY ('mel' also works)
+NUM_BINS = config.DISPLAY_WIDTH // 4
+BAND_MIN_FREQUENCY = 60
+BAND_SCALE = 'log'
+band_mapper = BandMapper(SAMPLE_RATE, FFT_SIZE, NUM_BINS, BAND_MIN_FREQUENCY, MAX_FREQUENCY, BAND_SCALE)
+display_bins = array.array('f', [0] * NUM_BINS)
+
+# Bars rise quickly and sink smoothly, with peak markers that hold then fall
+smoother = SpectrumSmoother(NUM_BINS)
+
+# The display driver sends only changed rows, so each frame clears just the
+# rows the bars reached last time and redraws the header only when its text
+# changes
+HEADER_HEIGHT = 12
+bars_top = HEADER_HEIGHT
+header_text = ""
+
 # Precompute the Hanning window coefficients
 hanning_window = array.array('f', [0] * FFT_SIZE)
 for i in range(FFT_SIZE):
@@ -83,8 +113,12 @@ for i in range(FFT_SIZE // 2):
     twiddle_factors_real[i] = math.cos(angle)
     twiddle_factors_imag[i] = math.sin(angle)
 
-def capture_audio_samples():
-    """Capture audio samples for FFT processing"""
+def capture_audio_samples(real_only=False):
+    """Capture audio samples for FFT processing
+
+    Returns (real, imag) arrays for iterative_fft(), or with real_only
+    just the windowed samples for real_fft().
+    """
     # For 32-bit samples, we need 4 bytes per sample
     NUM_SAMPLE_BYTES = FFT_SIZE * 4
     
@@ -104,6 +138,11 @@ def capture_audio_samples():
     # Convert to float array and apply windowing function
     # Reuse the same arrays to avoid memory allocation
     real = array.array('f', [0] * len(samples))
+    if real_only:
+        for i in range(len(samples)):
+            real[i] = (samples[i] >> 8) * hanning_window[i]
+        return real
+
     imag = array.array('f', [0] * len(samples))
     
     for i in range(len(samples)):
@@ -156,10 +195,95 @@ def iterative_fft(real, imag):
     
     return (real, imag)
 
-def calculate_magnitudes(real, imag):
-    """Calculate magnitude spectrum from complex FFT result"""
+def real_fft(data):
+    """Compute the spectrum of N real samples in-place with an N/2 point FFT
+
+    The samples are treated as N/2 complex values (even samples real, odd
+    samples imaginary), transformed with an N/2 point FFT that reuses the
+    N point bit-reversal and twiddle tables, and then split into the
+    spectrum of the real signal. No imaginary array is needed.
+
+    On return data holds bins 0..N/2-1 as interleaved (real, imag) pairs,
+    except data[1], which holds the real-valued Nyquist bin N/2 (bin 0 is
+    always real). Bin k equals real[k] + j*imag[k] from iterative_fft().
+    """
+    n = len(data)
+    assert n == FFT_SIZE, "FFT size must match precomputed tables"
+    half = n // 2
+
+    # Bit-reverse reordering of the complex pairs. For i < N/2 the N/2 point
+    # reversal is the N point table entry shifted right by one bit.
+    for i in range(half):
+        j = bit_reverse_table[i] >> 1
+        if i < j:
+            a = 2 * i
+            b = 2 * j
+            data[a], data[b] = data[b], data[a]
+            data[a + 1], data[b + 1] = data[b + 1], data[a + 1]
+
+    # Cooley-Tukey iterative FFT of size N/2. Twiddle k of the N/2 point
+    # transform is twiddle 2k of the N point table, so the index is the
+    # same j * (n // m) as in iterative_fft().
+    m = 2
+    while m <= half:
+        m2 = m // 2
+        step = n // m
+        for k in range(0, half, m):
+            for j in range(m2):
+                twiddle_idx = j * step
+                wr = twiddle_factors_real[twiddle_idx]
+                wi = twiddle_factors_imag[twiddle_idx]
+
+                idx1 = 2 * (k + j)
+                idx2 = idx1 + m
+
+                tr = data[idx2] * wr - data[idx2 + 1] * wi
+                ti = data[idx2] * wi + data[idx2 + 1] * wr
+
+                data[idx2] = data[idx1] - tr
+                data[idx2 + 1] = data[idx1 + 1] - ti
+                data[idx1] = data[idx1] + tr
+                data[idx1 + 1] = data[idx1 + 1] + ti
+        m *= 2
+
+    # Split step: bins k and N/2-k come from complex bins k and N/2-k
+    #   E = (Z[k] + conj(Z[N/2-k])) / 2     spectrum of the even samples
+    #   O = -j (Z[k] - conj(Z[N/2-k])) / 2  spectrum of the odd samples
+    #   X[k] = E + W^k O,  X[N/2-k] = conj(E - W^k O)
+    zr = data[0]
+    zi = data[1]
+    data[0] = zr + zi           # DC
+    data[1] = zr - zi           # Nyquist
+    for k in range(1, half // 2 + 1):
+        a = 2 * k
+        b = n - a
+        zr = data[a]
+        zi = data[a + 1]
+        yr = data[b]
+        yi = data[b + 1]
+
+        er = 0.5 * (zr + yr)
+        ei = 0.5 * (zi - yi)
+        o_r = 0.5 * (zi + yi)
+        o_i = 0.5 * (yr - zr)
+
+        wr = twiddle_factors_real[k]
+        wi = twiddle_factors_imag[k]
+        tr = o_r * wr - o_i * wi
+        ti = o_r * wi + o_i * wr
+
+        data[a] = er + tr
+        data[a + 1] = ei + ti
+        data[b] = er - tr
+        data[b + 1] = ti - ei
+
+    return data
+
+def calculate_magnitudes(real, imag, mags=None):
+    """Calculate magnitude spectrum from complex FFT result (into mags if given)"""
     # Only need the first half due to symmetry for real input
-    mags = array.array('f', [0] * (FFT_SIZE // 2))
+    if mags is None:
+        mags = array.array('f', [0] * (FFT_SIZE // 2))
     
     # Use a fast approximation for magnitude calculation
     # |z| ≈ max(|Re(z)|, |Im(z)|) + 0.4 * min(|Re(z)|, |Im(z)|)
@@ -173,6 +297,23 @@ def calculate_magnitudes(real, imag):
     
     return mags
 
+def calculate_real_magnitudes(data, mags=None):
+    """Calculate magnitude spectrum from the packed real_fft() result (into mags if given)"""
+    if mags is None:
+        mags = array.array('f', [0] * (FFT_SIZE // 2))
+    mags[0] = abs(data[0])  # DC bin is real; data[1] holds the Nyquist bin
+
+    # Same fast approximation as calculate_magnitudes()
+    for i in range(1, FFT_SIZE // 2):
+        re_abs = abs(data[2 * i])
+        im_abs = abs(data[2 * i + 1])
+        if re_abs > im_abs:
+            mags[i] = re_abs + 0.4 * im_abs
+        else:
+            mags[i] = im_abs + 0.4 * re_abs
+
+    return mags
+
 def find_peak_frequency(magnitudes):
     """Find the frequency with the highest magnitude (peak frequency)"""
     # Skip the first few bins as they often contain DC and very low frequency noise
@@ -195,62 +336,46 @@ def find_peak_frequency(magnitudes):
     
     return peak_freq
 
-def draw_spectrum(magnitudes):
+def draw_spectrum(magnitudes, show=True):
     """Draw the frequency spectrum on the SSD1322 OLED display"""
-    # Clear the display
-    disp.fill(0)
-    
-    # Number of frequency bins to display - use close to full display width
-    num_bins = config.DISPLAY_WIDTH // 4  # Each bar uses 4 pixels (2 for bar, 2 for spacing)
-    
-    # Calculate maximum bin index corresponding to MAX_FREQUENCY
-    max_bin = int(MAX_FREQUENCY / FREQ_PER_BIN)
-    
-    # Calculate the number of FFT bins we'll actually display
-    display_bin_count = min(len(magnitudes), max_bin)
-    
-    # Combine frequency bins to fit display
-    display_bins = array.array('f', [0] * num_bins)
-    bin_width = display_bin_count / num_bins
+    global bars_top, header_text
     
-    # Simple averaging of bins
-    for i in range(num_bins):
-        start_idx = int(i * bin_width)
-        end_idx = min(int((i + 1) * bin_width), display_bin_count)
-        if start_idx >= display_bin_count:
-            break
-            
-        # Fast averaging
-        bin_sum = 0
-        for j in range(start_idx, end_idx):
-            bin_sum += magnitudes[j]
-        display_bins[i] = bin_sum / max(1, (end_idx - start_idx))
+    # Combine frequency bins into the display bars (tables built at startup)
+    band_mapper.aggregate(magnitudes, display_bins)
+    smoother.update(display_bins)
+    levels = smoother.level
+    peaks = smoother.peaks
     
-    # Find maximum value for scaling (avoid division by zero)
-    max_magnitude = 1
-    for mag in display_bins:
-        if mag > max_magnitude:
-            max_magnitude = mag
+    # Scale to the highest peak marker (avoid division by zero)
+    max_magnitude = max(1, smoother.loudest())
     
     # Use full display height with small margin
-    display_height = config.DISPLAY_HEIGHT - 12  # Reduce height to make room for frequency display
+    display_height = config.DISPLAY_HEIGHT - HEADER_HEIGHT  # Reduce height to make room for frequency display
     baseline = config.DISPLAY_HEIGHT - 1
     
     # Find the peak frequency
     peak_freq = find_peak_frequency(magnitudes)
     
-    # Display peak frequency in top left corner
     peak_freq_text = f"Peak: {int(peak_freq)} Hz"
-    disp.text(peak_freq_text, 2, 2, 15)
+    if peak_freq_text != header_text:
+        disp.fill_rect(0, 0, config.DISPLAY_WIDTH, HEADER_HEIGHT, 0)
+        
+        # Display peak frequency in top left corner
+        disp.text(peak_freq_text, 2, 2, 15)
+        
+        # Display maximum frequency in top right corner
+        max_freq_text = f"Max: {int(MAX_FREQUENCY)} Hz"
+        disp.text(max_freq_text, config.DISPLAY_WIDTH - len(max_freq_text) * 8 - 2, 2, 15)
+        header_text = peak_freq_text
     
-    # Display maximum frequency in top right corner
-    max_freq_text = f"Max: {int(MAX_FREQUENCY)} Hz"
-    disp.text(max_freq_text, config.DISPLAY_WIDTH - len(max_freq_text) * 8 - 2, 2, 15)
+    # Clear the rows drawn last frame; higher rows are still blank
+    disp.fill_rect(0, bars_top, config.DISPLAY_WIDTH, baseline - bars_top, 0)
+    top = baseline
     
     # Draw the spectrum
-    for i in range(len(display_bins)):
+    for i in range(NUM_BINS):
         # Apply log scaling for more balanced distribution
-        normalized = display_bins[i] / max_magnitude
+        normalized = levels[i] / max_magnitude
         height = int(math.sqrt(normalized) * display_height * 0.9)  # Scale to 90% of display height
         
         # Draw vertical bar - SSD1322 supports 16 gray levels (0-15)
@@ -262,12 +387,52 @@ def draw_spectrum(magnitudes):
                 # Calculate gradient from bottom to top (15->8)
                 level = max(8, int(15 - (7 * (baseline - y) / height)))
                 disp.line(x, y, x + 1, y, level)  # Use line to draw 2px wide with same gray level
+        
+        # Peak marker above the bar at full brightness
+        peak = int(math.sqrt(peaks[i] / max_magnitude) * display_height * 0.9)
+        if peak > height:
+            disp.line(x, baseline - peak, x + 1, baseline - peak, 15)
+            height = peak + 1
+        if baseline - height + 1 < top:
+            top = baseline - height + 1
+    bars_top = top
     
     # Draw baseline
     disp.line(0, baseline, config.DISPLAY_WIDTH - 1, baseline, 15)
     
     # Update the display
+    if show:
+        disp.show()
+
+def produce_frame(mags, stats):
+    """Pipeline producer (second core): capture, FFT and magnitudes into mags"""
+    start = time.ticks_us()
+    if USE_REAL_FFT:
+        samples = capture_audio_samples(real_only=True)
+        if not samples:
+            return False
+        start = stats.time('capture', start)
+        real_fft(samples)
+        start = stats.time('fft', start)
+        calculate_real_magnitudes(samples, mags)
+    else:
+        samples = capture_audio_samples()
+        if not samples:
+            return False
+        start = stats.time('capture', start)
+        iterative_fft(samples[0], samples[1])
+        start = stats.time('fft', start)
+        calculate_magnitudes(samples[0], samples[1], mags)
+    stats.time('magnitudes', start)
+    return True
+
+def consume_frame(mags, stats):
+    """Pipeline consumer (first core): draw the bars, then send them to the display"""
+    start = time.ticks_us()
+    draw_spectrum(mags, show=False)
+    start = stats.time('draw', start)
     disp.show()
+    stats.time('present', start)
 
 try:
     print("Enhanced Sound Spectrum Analyzer for SSD1322")
@@ -288,8 +453,20 @@ try:
     disp.show()
     time.sleep(1)
     
+    if PIPELINED:
+        pipeline = FramePipeline(produce_frame, consume_frame, FFT_SIZE // 2)
+        pipeline.start()
+        pipeline.run(report_every=PIPELINE_REPORT_EVERY)
+
     # Main processing loop
     while True:
+        if USE_REAL_FFT:
+            samples = capture_audio_samples(real_only=True)
+            if samples:
+                real_fft(samples)
+                draw_spectrum(calculate_real_magnitudes(samples))
+            continue
+
         # Capture audio samples
         samples = capture_audio_samples()
         
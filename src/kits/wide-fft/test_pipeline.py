@@ -0,0 +1,128 @@
+# Host tests for lib/pipeline.py (CPython):  python3 -m pytest test_pipeline.py
+#
+# CPython's _thread runs the producer in a real thread, standing in for the
+# RP2040's second core.
+
+import _thread
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lib'))
+
+from pipeline import FramePipeline
+
+SIZE = 64
+
+
+class Source:
+    """Writes frame number n into every element of frame n."""
+
+    def __init__(self, delay=0.0, limit=None):
+        self.delay = delay
+        self.limit = limit
+        self.count = 0
+
+    def produce(self, buf, stats):
+        if self.limit is not None and self.count >= self.limit:
+            time.sleep(0.001)
+            return False
+        start = time.perf_counter_ns() // 1000
+        self.count += 1
+        for i in range(len(buf)):
+            buf[i] = self.count
+        time.sleep(self.delay)
+        stats.time('capture', start)
+        return True
+
+
+class Sink:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.frames = []
+
+    def consume(self, buf, stats):
+        start = time.perf_counter_ns() // 1000
+        first = buf[0]
+        time.sleep(self.delay)
+        # The producer must never write the buffer being drawn
+        assert all(v == first for v in buf)
+        self.frames.append(first)
+        stats.time('draw', start)
+
+
+def run(source, sink, frames):
+    pipeline = FramePipeline(source.produce, sink.consume, SIZE)
+    pipeline.start()
+    pipeline.run(frames=frames)
+    return pipeline
+
+
+def test_frames_arrive_in_order_and_intact():
+    source = Source(delay=0.002)
+    sink = Sink()
+    pipeline = run(source, sink, 20)
+    assert sink.frames == sorted(sink.frames)
+    assert len(set(sink.frames)) == 20
+    assert pipeline.consumed == 20
+    assert pipeline.producer_done
+
+
+def test_slow_consumer_sees_latest_frame_and_counts_drops():
+    source = Source(delay=0.001)
+    sink = Sink(delay=0.01)
+    pipeline = run(source, sink, 10)
+    assert sink.frames == sorted(sink.frames)
+    assert pipeline.dropped > 0
+    assert pipeline.produced >= pipeline.consumed + pipeline.dropped - 1
+
+
+def test_stages_overlap():
+    # Producing and consuming each take 10 ms; in one loop 10 frames would
+    # take 200 ms, pipelined about half that
+    start = time.perf_counter()
+    run(Source(delay=0.01), Sink(delay=0.01), 10)
+    assert time.perf_counter() - start < 0.17
+
+
+def test_stage_stats_and_report():
+    pipeline = run(Source(delay=0.001), Sink(), 5)
+    producer = dict(pipeline.producer_stats.averages())
+    consumer = dict(pipeline.consumer_stats.averages())
+    assert set(producer) == {'capture', 'frame'}
+    assert set(consumer) == {'draw', 'frame'}
+    assert producer['capture'] >= 1.0
+    assert "dropped" in pipeline.report()
+
+
+def test_each_thread_resets_its_own_stats():
+    pipeline = FramePipeline(Source(delay=0.001).produce, Sink().consume, SIZE)
+    resets = []
+    reset = pipeline.producer_stats.reset
+
+    def producer_reset():
+        resets.append(_thread.get_ident())
+        reset()
+
+    pipeline.producer_stats.reset = producer_reset
+    reports = []
+    pipeline.start()
+    pipeline.run(frames=20, report_every=5, report=reports.append)
+    assert len(reports) == 4
+    assert resets and _thread.get_ident() not in resets
+    assert pipeline.producer_stats.counts['frame'] < pipeline.produced
+    assert 'frame' not in pipeline.consumer_stats.counts
+
+
+def test_producer_error_is_raised_on_the_consumer():
+    def broken(buf, stats):
+        raise ValueError("no microphone")
+
+    pipeline = FramePipeline(broken, Sink().consume, SIZE)
+    pipeline.start()
+    try:
+        pipeline.run(frames=1)
+    except ValueError as e:
+        assert "no microphone" in str(e)
+    else:
+        raise AssertionError("error was not raised")
@@ -0,0 +1,141 @@
+# Host tests for lib/ssd1322.py (CPython):  python3 -m pytest test_wide_fft_ssd1322.py
+# FakeSPI decodes the command stream into its own copy of the controller
+# RAM, with the same column/row window wrapping as the SSD1322, so each
+# show() can be checked against the buffer and its bytes counted.
+
+import importlib.util
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, 'lib'))
+# CPython framebuf and micropython modules
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'tools', 'host'))
+
+if not hasattr(time, 'sleep_ms'):
+    time.sleep_ms = lambda ms: None
+
+
+def load_driver():
+    """Load lib/ssd1322.py as wide_fft_ssd1322.
+
+    The oled-ssd1322 kit has a different driver with the same file name, so
+    a plain import would share one module between the two kits' tests.
+    """
+    spec = importlib.util.spec_from_file_location(
+        'wide_fft_ssd1322', os.path.join(HERE, 'lib', 'ssd1322.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+ssd1322 = load_driver()
+
+COLUMN_START = 32   # (480 - 256) // 8 + 4, see SSD1322.write_window
+
+
+class Pin:
+    def __init__(self):
+        self.value = 0
+
+    def __call__(self, value=None):
+        if value is not None:
+            self.value = value
+        return self.value
+
+
+class FakeSPI:
+    def __init__(self, dc):
+        self.dc = dc
+        self.ram = bytearray(240 * 128)
+        self.command = None
+        self.args = []
+        self.cols = (0, 119)
+        self.rows = (0, 127)
+        self.pos = 0
+        self.bytes_sent = 0
+        self.windows = 0
+
+    def write(self, data):
+        self.bytes_sent += len(data)
+        if not self.dc():
+            self.command = data[0]
+            self.args = []
+            if self.command == 0x5C:
+                self.windows += 1
+                self.pos = 0
+            return
+        for byte in bytes(data):
+            if self.command == 0x5C:
+                width = (self.cols[1] - self.cols[0] + 1) * 2
+                rows = self.rows[1] - self.rows[0] + 1
+                row = self.rows[0] + (self.pos // width) % rows
+                self.ram[row * 240 + self.cols[0] * 2 + self.pos % width] = byte
+                self.pos += 1
+                continue
+            self.args.append(byte)
+            if len(self.args) == 2 and self.command == 0x15:
+                self.cols = tuple(self.args)
+            elif len(self.args) == 2 and self.command == 0x75:
+                self.rows = tuple(self.args)
+
+    def visible(self):
+        out = bytearray()
+        for row in range(64):
+            start = row * 240 + COLUMN_START * 2
+            out += self.ram[start:start + 128]
+        return out
+
+
+def make_display():
+    dc = Pin()
+    spi = FakeSPI(dc)
+    disp = ssd1322.SSD1322_SPI(256, 64, spi, dc, Pin(), Pin())
+    return disp, spi
+
+
+def show(disp, spi, **kwargs):
+    spi.bytes_sent = 0
+    spi.windows = 0
+    disp.show(**kwargs)
+    assert spi.visible() == disp.buffer
+    return spi.bytes_sent
+
+
+def test_only_changes_are_sent():
+    disp, spi = make_display()
+    disp.fill(0)
+    disp.text("Spectrum Analyzer", 60, 24, 15)
+    assert show(disp, spi) > 8192
+    assert show(disp, spi) == 0
+
+    disp.text("Peak: 440 Hz", 2, 2, 15)
+    sent = show(disp, spi)
+    assert spi.windows == 1 and sent < 8 * 52 + 40
+
+    disp.pixel(0, 0, 3)
+    disp.line(250, 60, 255, 63, 9)
+    show(disp, spi)
+    assert spi.windows == 2
+
+
+def test_bar_rows_and_region():
+    disp, spi = make_display()
+    disp.fill(0)
+    show(disp, spi)
+    # Low bars across the width: only the bottom rows go out, as one window
+    disp.fill_rect(0, 50, 256, 13, 0)
+    for x in range(0, 256, 4):
+        disp.line(x, 60, x + 1, 60, 12)
+    sent = show(disp, spi)
+    assert spi.windows == 1 and sent < 14 * 128 + 40
+
+    disp.fill_rect(0, 0, 8, 8, 15)
+    disp.fill_rect(200, 30, 8, 8, 15)
+    spi.windows = 0
+    disp.show(region=(0, 0, 16, 16))
+    assert spi.windows == 1 and spi.visible() != disp.buffer
+    show(disp, spi)
+    assert spi.windows == 1
+    assert show(disp, spi, full=True) > 8192
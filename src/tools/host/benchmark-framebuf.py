@@ -0,0 +1,99 @@
+# benchmark-framebuf.py Time framebuf drawing calls on a PC and dump PNGs
+#   python3 benchmark-framebuf.py [output_dir]
+#
+# Runs each drawing call of the emulated framebuf on a 128x64 MONO_VLSB
+# buffer (SSD1306), a 256x64 GS4_HMSB buffer (SSD1322) and a 240x240 RGB565
+# buffer (round LCD), prints calls per second, then draws a test frame
+# through the real SSD1306 driver and saves it with one PNG per format.
+# The numbers compare drawing code on a PC, they do not predict board speed.
+
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, '..', '..', 'drivers'))
+
+import framebuf
+
+SCREENS = [
+    ('SSD1306 MONO_VLSB', 128, 64, framebuf.MONO_VLSB, 1, 128 * 64 // 8),
+    ('SSD1322 GS4_HMSB', 256, 64, framebuf.GS4_HMSB, 15, 256 * 64 // 2),
+    ('LCD RGB565', 240, 240, framebuf.RGB565, 0xFFFF, 240 * 240 * 2),
+]
+DURATION = 0.2      # Seconds per measurement
+
+
+def rate(func):
+    """Calls per second of func, run for about DURATION seconds."""
+    calls = 0
+    start = time.perf_counter()
+    end = start + DURATION
+    while True:
+        func()
+        calls += 1
+        now = time.perf_counter()
+        if now >= end:
+            return calls / (now - start)
+
+
+def draw_test_frame(fb, w, h, c):
+    fb.fill(0)
+    fb.rect(0, 0, w, h, c)
+    fb.line(0, 0, w - 1, h - 1, c)
+    fb.ellipse(w // 2, h // 2, w // 4, h // 4, c, True)
+    fb.poly(w // 8, h // 2, [0, 0, w // 8, -h // 4, w // 4, 0], c, True)
+    fb.text("framebuf", 2, 2, c)
+
+
+class NullI2C:
+    def writeto(self, addr, buf):
+        pass
+
+    def writevto(self, addr, bufs):
+        pass
+
+
+def main(out_dir=None):
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    for name, w, h, fmt, c, size in SCREENS:
+        fb = framebuf.FrameBuffer(bytearray(size), w, h, fmt)
+        sprite = framebuf.FrameBuffer(bytearray(size), w, h, fmt)
+        sprite.fill_rect(0, 0, 16, 16, c)
+        tests = [
+            ('fill', lambda: fb.fill(0)),
+            ('pixel', lambda: fb.pixel(5, 5, c)),
+            ('hline', lambda: fb.hline(0, 10, w, c)),
+            ('fill_rect 32x32', lambda: fb.fill_rect(8, 8, 32, 32, c)),
+            ('line', lambda: fb.line(0, 0, w - 1, h - 1, c)),
+            ('ellipse filled', lambda: fb.ellipse(w // 2, h // 2, 20, 20, c, True)),
+            ('poly filled', lambda: fb.poly(10, 10, [0, 0, 30, 5, 10, 30], c, True)),
+            ('text 16 chars', lambda: fb.text("0123456789abcdef", 0, 0, c)),
+            ('scroll', lambda: fb.scroll(1, 0)),
+            ('blit', lambda: fb.blit(sprite, 4, 4, 0)),
+            ('test frame', lambda: draw_test_frame(fb, w, h, c)),
+        ]
+        print(name)
+        for label, func in tests:
+            print("  {:16} {:10.0f} calls/s".format(label, rate(func)))
+        if out_dir:
+            draw_test_frame(fb, w, h, c)
+            path = os.path.join(out_dir, name.split()[1].lower() + '.png')
+            fb.save_png(path, scale=2)
+            print("  saved", path)
+
+    import ssd1306
+    oled = ssd1306.SSD1306_I2C(128, 64, NullI2C())
+    draw_test_frame(oled, 128, 64, 1)
+    print("ssd1306 driver")
+    print("  {:16} {:10.0f} calls/s".format('draw + show', rate(lambda: (draw_test_frame(oled, 128, 64, 1), oled.show()))))
+    if out_dir:
+        path = os.path.join(out_dir, 'ssd1306-driver.png')
+        oled.save_png(path, scale=4)
+        print("  saved", path)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
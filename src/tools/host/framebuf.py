@@ -0,0 +1,550 @@
+# framebuf.py CPython version of MicroPython's framebuf module, backed by NumPy
+# The display drivers (drivers/ssd1306.py, sh1106.py, max7219.py,
+# kits/oled-ssd1322/lib/ssd1322.py, displays/waveshare-round/LCD_1inch28.py)
+# subclass or wrap framebuf.FrameBuffer, which only exists in MicroPython.
+# Put this directory first on the path and they import and draw on a PC:
+#
+#   PYTHONPATH=src/tools/host python3 my_test.py
+#
+# micropython.py and utime.py next to this file cover the other imports the
+# drivers need.
+#
+# Like the C version, a FrameBuffer keeps no state of its own besides the
+# buffer it was given: every method reads and writes the bytes in the layout
+# of the chosen format, so drivers can send self.buffer or poke it directly.
+# Single pixels use plain index arithmetic; fills, scrolls and blits decode
+# the buffer into a NumPy array, work on that and encode it back; lines,
+# ellipses, polygons and text collect their pixels and write them with one
+# vectorised call.
+#
+# The line, ellipse and polygon algorithms follow MicroPython's framebuf.c so
+# the same pixels are lit. text() uses the 5x7 glcdfont from src/lib in 8x8
+# cells: the same size and spacing as MicroPython's built-in font, but not
+# the same glyph shapes.
+#
+# Extras for testing on a PC:
+# - to_array() returns the pixels as a (height, width) array
+# - to_image() / save_png() convert to a Pillow image (Pillow is only needed
+#   for these)
+# - benchmark-framebuf.py times the drawing calls
+
+import os
+
+import numpy as np
+
+MONO_VLSB = 0
+MONO_HLSB = 3
+MONO_HMSB = 4
+RGB565 = 1
+GS2_HMSB = 5
+GS4_HMSB = 2
+GS8 = 6
+MVLSB = MONO_VLSB
+
+# Quadrant bits for ellipse(); MicroPython numbers them anticlockwise from
+# the top right
+_ELLIPSE_Q1 = 0x01
+_ELLIPSE_Q2 = 0x02
+_ELLIPSE_Q3 = 0x04
+_ELLIPSE_Q4 = 0x08
+_ELLIPSE_ALL = 0x0F
+
+_FONT = None
+_GLYPHS = {}
+
+
+def _font():
+    """5 column bytes per character from src/lib/glcdfont.py, loaded once."""
+    global _FONT
+    if _FONT is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'lib', 'glcdfont.py')
+        namespace = {}
+        with open(path) as f:
+            exec(compile(f.read(), path, 'exec'), namespace)
+        _FONT = namespace['_font']
+    return _FONT
+
+
+def _glyph(code):
+    """(dx, dy) arrays of the lit pixels of a character in its 8x8 cell."""
+    offsets = _GLYPHS.get(code)
+    if offsets is None:
+        font = _font()
+        if code < 32 or code > 127:
+            code = 127
+        dxs = []
+        dys = []
+        for col in range(5):
+            bits = font[code * 5 + col]
+            for row in range(8):
+                if bits & (1 << row):
+                    dxs.append(col + 1)
+                    dys.append(row)
+        offsets = (np.array(dxs, dtype=np.int64), np.array(dys, dtype=np.int64))
+        _GLYPHS[code] = offsets
+    return offsets
+
+
+def _cdiv(a, b):
+    """Integer division truncating towards zero, like C."""
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format, stride=None):
+        self.buffer = buffer
+        self._width = width
+        self._height = height
+        self._format = format
+        self._stride = width if stride is None else stride
+        stride = self._stride
+        if format == MONO_VLSB:
+            needed = ((height + 7) >> 3) * stride
+        elif format in (MONO_HLSB, MONO_HMSB):
+            needed = ((stride + 7) >> 3) * height
+        elif format == GS2_HMSB:
+            needed = (stride * height + 3) >> 2
+        elif format == GS4_HMSB:
+            needed = (stride * height + 1) >> 1
+        elif format == GS8:
+            needed = stride * height
+        elif format == RGB565:
+            needed = stride * height * 2
+        else:
+            raise ValueError("invalid format")
+        if len(memoryview(buffer).cast('B')) < needed:
+            raise ValueError("buffer too small")
+        self._bytes = np.frombuffer(buffer, dtype=np.uint8, count=needed)
+        if format == RGB565:
+            self._words = self._bytes.view(np.uint16)
+
+    # Plane access: the whole buffer as a 2D array of pixel values
+
+    def _plane(self):
+        """Decode the buffer into a (rows, columns) array including padding."""
+        fmt = self._format
+        stride = self._stride
+        b = self._bytes
+        if fmt == MONO_VLSB:
+            pages = b.reshape(-1, stride)
+            bits = np.unpackbits(pages[:, np.newaxis, :], axis=1, bitorder='little')
+            return bits.reshape(-1, stride)
+        if fmt in (MONO_HLSB, MONO_HMSB):
+            rows = b.reshape(self._height, -1)
+            order = 'big' if fmt == MONO_HLSB else 'little'
+            return np.unpackbits(rows, axis=1, bitorder=order)
+        if fmt == GS2_HMSB:
+            flat = np.stack([(b >> s) & 3 for s in (0, 2, 4, 6)], axis=1).reshape(-1)
+            return flat[:stride * self._height].reshape(self._height, stride)
+        if fmt == GS4_HMSB:
+            flat = np.stack([b >> 4, b & 0x0F], axis=1).reshape(-1)
+            return flat[:stride * self._height].reshape(self._height, stride)
+        if fmt == GS8:
+            return b.reshape(self._height, stride).copy()
+        return self._words.reshape(self._height, stride).copy()
+
+    def _store(self, plane):
+        """Encode a plane from _plane() back into the buffer."""
+        fmt = self._format
+        stride = self._stride
+        b = self._bytes
+        if fmt == MONO_VLSB:
+            bits = plane.reshape(-1, 8, stride).astype(np.uint8)
+            b[:] = np.packbits(bits, axis=1, bitorder='little').reshape(-1)
+        elif fmt in (MONO_HLSB, MONO_HMSB):
+            order = 'big' if fmt == MONO_HLSB else 'little'
+            b[:] = np.packbits(plane.astype(np.uint8), axis=1, bitorder=order).reshape(-1)
+        elif fmt == GS2_HMSB:
+            flat = np.zeros(len(b) * 4, dtype=np.uint8)
+            flat[:plane.size] = plane.reshape(-1)
+            q = flat.reshape(-1, 4)
+            b[:] = q[:, 0] | (q[:, 1] << 2) | (q[:, 2] << 4) | (q[:, 3] << 6)
+        elif fmt == GS4_HMSB:
+            flat = np.zeros(len(b) * 2, dtype=np.uint8)
+            flat[:plane.size] = plane.reshape(-1)
+            pairs = flat.reshape(-1, 2)
+            b[:] = (pairs[:, 0] << 4) | pairs[:, 1]
+        elif fmt == GS8:
+            b[:] = plane.reshape(-1)
+        else:
+            self._words[:] = plane.reshape(-1)
+
+    def _mask(self, c):
+        """Colour reduced to the bits the format stores."""
+        fmt = self._format
+        if fmt in (MONO_VLSB, MONO_HLSB, MONO_HMSB):
+            return c & 1
+        if fmt == GS2_HMSB:
+            return c & 3
+        if fmt == GS4_HMSB:
+            return c & 0x0F
+        if fmt == GS8:
+            return c & 0xFF
+        return c & 0xFFFF
+
+    # Pixel writes
+
+    def _set_points(self, xs, ys, c):
+        """Set the pixels at coordinate arrays xs, ys (clipped here) to colour c."""
+        xs = np.asarray(xs, dtype=np.int64)
+        ys = np.asarray(ys, dtype=np.int64)
+        keep = (xs >= 0) & (xs < self._width) & (ys >= 0) & (ys < self._height)
+        xs = xs[keep]
+        ys = ys[keep]
+        if not len(xs):
+            return
+        c = self._mask(c)
+        fmt = self._format
+        stride = self._stride
+        b = self._bytes
+        if fmt in (MONO_VLSB, MONO_HLSB, MONO_HMSB):
+            if fmt == MONO_VLSB:
+                idx = (ys >> 3) * stride + xs
+                bits = (1 << (ys & 7)).astype(np.uint8)
+            else:
+                idx = ys * ((stride + 7) >> 3) + (xs >> 3)
+                if fmt == MONO_HLSB:
+                    bits = (0x80 >> (xs & 7)).astype(np.uint8)
+                else:
+                    bits = (1 << (xs & 7)).astype(np.uint8)
+            if c:
+                np.bitwise_or.at(b, idx, bits)
+            else:
+                np.bitwise_and.at(b, idx, ~bits)
+        elif fmt in (GS2_HMSB, GS4_HMSB):
+            pos = xs + ys * stride
+            if fmt == GS2_HMSB:
+                idx = pos >> 2
+                shift = (pos & 3) << 1
+                mask = 3
+            else:
+                idx = pos >> 1
+                shift = np.where(pos & 1, 0, 4)
+                mask = 0x0F
+            np.bitwise_and.at(b, idx, (~(mask << shift)).astype(np.uint8))
+            np.bitwise_or.at(b, idx, (c << shift).astype(np.uint8))
+        elif fmt == GS8:
+            b[ys * stride + xs] = c
+        else:
+            self._words[ys * stride + xs] = c
+
+    def _fill_area(self, x0, y0, x1, y1, c):
+        """Fill the clipped rectangle x0 <= x < x1, y0 <= y < y1."""
+        x0 = max(x0, 0)
+        y0 = max(y0, 0)
+        x1 = min(x1, self._width)
+        y1 = min(y1, self._height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        plane = self._plane()
+        plane[y0:y1, x0:x1] = self._mask(c)
+        self._store(plane)
+
+    # MicroPython API
+
+    def fill(self, c):
+        self._fill_area(0, 0, self._width, self._height, c)
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return None
+        if c is None:
+            fmt = self._format
+            stride = self._stride
+            b = self._bytes
+            if fmt == MONO_VLSB:
+                return (int(b[(y >> 3) * stride + x]) >> (y & 7)) & 1
+            if fmt == MONO_HLSB:
+                return (int(b[y * ((stride + 7) >> 3) + (x >> 3)]) >> (7 - (x & 7))) & 1
+            if fmt == MONO_HMSB:
+                return (int(b[y * ((stride + 7) >> 3) + (x >> 3)]) >> (x & 7)) & 1
+            pos = x + y * stride
+            if fmt == GS2_HMSB:
+                return (int(b[pos >> 2]) >> ((pos & 3) << 1)) & 3
+            if fmt == GS4_HMSB:
+                return (int(b[pos >> 1]) >> (0 if pos & 1 else 4)) & 0x0F
+            if fmt == GS8:
+                return int(b[pos])
+            return int(self._words[pos])
+        self._set_points((x,), (y,), c)
+        return None
+
+    def hline(self, x, y, w, c):
+        self._fill_area(x, y, x + w, y + 1, c)
+
+    def vline(self, x, y, h, c):
+        self._fill_area(x, y, x + 1, y + h, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        self._fill_area(x, y, x + w, y + h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self._fill_area(x, y, x + w, y + h, c)
+            return
+        xs = []
+        ys = []
+        if w > 0 and h > 0:
+            for xx in range(x, x + w):
+                xs += (xx, xx)
+                ys += (y, y + h - 1)
+            for yy in range(y, y + h):
+                xs += (x, x + w - 1)
+                ys += (yy, yy)
+        self._set_points(xs, ys, c)
+
+    def _line_points(self, x1, y1, x2, y2, xs, ys):
+        """Bresenham as in framebuf.c, appending to xs and ys."""
+        dx = x2 - x1
+        if dx > 0:
+            sx = 1
+        else:
+            dx = -dx
+            sx = -1
+        dy = y2 - y1
+        if dy > 0:
+            sy = 1
+        else:
+            dy = -dy
+            sy = -1
+        steep = dy > dx
+        if steep:
+            x1, y1 = y1, x1
+            dx, dy = dy, dx
+            sx, sy = sy, sx
+        e = 2 * dy - dx
+        for _ in range(dx):
+            if steep:
+                xs.append(y1)
+                ys.append(x1)
+            else:
+                xs.append(x1)
+                ys.append(y1)
+            while e >= 0:
+                y1 += sy
+                e -= 2 * dx
+            x1 += sx
+            e += 2 * dy
+        xs.append(x2)
+        ys.append(y2)
+
+    def line(self, x1, y1, x2, y2, c):
+        xs = []
+        ys = []
+        self._line_points(x1, y1, x2, y2, xs, ys)
+        self._set_points(xs, ys, c)
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=_ELLIPSE_ALL):
+        """Midpoint ellipse as in framebuf.c; m selects quadrants."""
+        xs = []
+        ys = []
+
+        def points(px, py):
+            if f:
+                if m & _ELLIPSE_Q1:
+                    xs.extend(range(x, x + px + 1))
+                    ys.extend([y - py] * (px + 1))
+                if m & _ELLIPSE_Q2:
+                    xs.extend(range(x - px, x + 1))
+                    ys.extend([y - py] * (px + 1))
+                if m & _ELLIPSE_Q3:
+                    xs.extend(range(x - px, x + 1))
+                    ys.extend([y + py] * (px + 1))
+                if m & _ELLIPSE_Q4:
+                    xs.extend(range(x, x + px + 1))
+                    ys.extend([y + py] * (px + 1))
+            else:
+                if m & _ELLIPSE_Q1:
+                    xs.append(x + px)
+                    ys.append(y - py)
+                if m & _ELLIPSE_Q2:
+                    xs.append(x - px)
+                    ys.append(y - py)
+                if m & _ELLIPSE_Q3:
+                    xs.append(x - px)
+                    ys.append(y + py)
+                if m & _ELLIPSE_Q4:
+                    xs.append(x + px)
+                    ys.append(y + py)
+
+        two_asquare = 2 * xr * xr
+        two_bsquare = 2 * yr * yr
+        px = xr
+        py = 0
+        xchange = yr * yr * (1 - 2 * xr)
+        ychange = xr * xr
+        error = 0
+        stoppingx = two_bsquare * xr
+        stoppingy = 0
+        while stoppingx >= stoppingy:
+            points(px, py)
+            py += 1
+            stoppingy += two_asquare
+            error += ychange
+            ychange += two_asquare
+            if 2 * error + xchange > 0:
+                px -= 1
+                stoppingx -= two_bsquare
+                error += xchange
+                xchange += two_bsquare
+        px = 0
+        py = yr
+        xchange = yr * yr
+        ychange = xr * xr * (1 - 2 * yr)
+        error = 0
+        stoppingx = 0
+        stoppingy = two_asquare * yr
+        while stoppingx <= stoppingy:
+            points(px, py)
+            px += 1
+            stoppingx += two_bsquare
+            error += xchange
+            xchange += two_bsquare
+            if 2 * error + ychange > 0:
+                py -= 1
+                stoppingy -= two_asquare
+                error += ychange
+                ychange += two_asquare
+        self._set_points(xs, ys, c)
+
+    def poly(self, x, y, coords, c, f=False):
+        """Closed polygon through the (x, y) pairs in coords, offset by x, y."""
+        n = len(coords) // 2
+        if n < 1:
+            return
+        xs = []
+        ys = []
+        if not f:
+            px1 = coords[0]
+            py1 = coords[1]
+            i = n * 2 - 1
+            while i >= 0:
+                py2 = coords[i]
+                px2 = coords[i - 1]
+                i -= 2
+                self._line_points(x + px1, y + py1, x + px2, y + py2, xs, ys)
+                px1 = px2
+                py1 = py2
+            self._set_points(xs, ys, c)
+            return
+
+        # Scanline fill: each row is filled between pairs of edge crossings
+        # Indexed, not coords[1::2]: MicroPython arrays passed in by drivers
+        # under test may refuse step slices
+        y_min = min(coords[i] for i in range(1, n * 2, 2))
+        y_max = max(coords[i] for i in range(1, n * 2, 2))
+        for row in range(y_min, y_max + 1):
+            nodes = []
+            px1 = coords[0]
+            py1 = coords[1]
+            i = n * 2 - 1
+            while i >= 0:
+                py2 = coords[i]
+                px2 = coords[i - 1]
+                i -= 2
+                # Leave out the bottom pixel of each edge so a shared vertex
+                # is not counted twice
+                if py1 != py2 and ((py1 > row >= py2) or (py1 <= row < py2)):
+                    nodes.append(_cdiv(32 * px1 + _cdiv(32 * (px2 - px1) * (row - py1), py2 - py1) + 16, 32))
+                elif row == max(py1, py2):
+                    # Fill in the pixels missed at local minima
+                    if py1 < py2:
+                        xs.append(x + px2)
+                        ys.append(y + py2)
+                    elif py2 < py1:
+                        xs.append(x + px1)
+                        ys.append(y + py1)
+                    else:
+                        self._line_points(x + px1, y + py1, x + px2, y + py2, xs, ys)
+                px1 = px2
+                py1 = py2
+            nodes.sort()
+            for k in range(0, len(nodes) - 1, 2):
+                xs.extend(range(x + nodes[k], x + nodes[k + 1] + 1))
+                ys.extend([y + row] * (nodes[k + 1] - nodes[k] + 1))
+        self._set_points(xs, ys, c)
+
+    def text(self, s, x, y, c=1):
+        xs = []
+        ys = []
+        for i, ch in enumerate(s):
+            dx, dy = _glyph(ord(ch))
+            xs.append(dx + x + 8 * i)
+            ys.append(dy + y)
+        if xs:
+            self._set_points(np.concatenate(xs), np.concatenate(ys), c)
+
+    def scroll(self, xstep, ystep):
+        """Shift the contents; the uncovered strip keeps its old pixels, as in MicroPython."""
+        w = self._width
+        h = self._height
+        if abs(xstep) >= w or abs(ystep) >= h:
+            return
+        plane = self._plane()
+        view = plane[:h, :w]
+        src = view.copy()
+        dx0, dx1 = max(xstep, 0), w + min(xstep, 0)
+        dy0, dy1 = max(ystep, 0), h + min(ystep, 0)
+        view[dy0:dy1, dx0:dx1] = src[dy0 - ystep:dy1 - ystep, dx0 - xstep:dx1 - xstep]
+        self._store(plane)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        """Copy another FrameBuffer (or a (buffer, width, height, format[, stride]) tuple)."""
+        if isinstance(fbuf, tuple):
+            fbuf = FrameBuffer(*fbuf)
+        sw = fbuf._width
+        sh = fbuf._height
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + sw, self._width)
+        y1 = min(y + sh, self._height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        src = fbuf._plane()[y0 - y:y1 - y, x0 - x:x1 - x].astype(np.int64)
+        if palette is not None:
+            lookup = palette._plane()[0, :palette._width].astype(np.int64)
+            src = lookup[np.clip(src, 0, palette._width - 1)]
+        plane = self._plane()
+        target = plane[y0:y1, x0:x1]
+        keep = src != key
+        target[keep] = src[keep] & self._mask(-1)
+        self._store(plane)
+
+    # Host extras
+
+    def to_array(self):
+        """Pixel values as a (height, width) NumPy array."""
+        return self._plane()[:self._height, :self._width].copy()
+
+    def to_image(self, scale=1, swap_bytes=False):
+        """Pillow image of the frame: greyscale for mono/GS formats, RGB for RGB565.
+
+        Set swap_bytes for drivers that store RGB565 big-endian (most SPI LCDs).
+        """
+        from PIL import Image
+
+        pixels = self.to_array()
+        fmt = self._format
+        if fmt == RGB565:
+            if swap_bytes:
+                pixels = ((pixels >> 8) | (pixels << 8)) & 0xFFFF
+            r = ((pixels >> 11) & 0x1F) * 255 // 31
+            g = ((pixels >> 5) & 0x3F) * 255 // 63
+            b = (pixels & 0x1F) * 255 // 31
+            image = Image.fromarray(np.stack([r, g, b], axis=2).astype(np.uint8), 'RGB')
+        else:
+            top = {GS2_HMSB: 3, GS4_HMSB: 15, GS8: 255}.get(fmt, 1)
+            image = Image.fromarray((pixels.astype(np.uint32) * 255 // top).astype(np.uint8), 'L')
+        if scale != 1:
+            image = image.resize((self._width * scale, self._height * scale), Image.NEAREST)
+        return image
+
+    def save_png(self, path, scale=1, swap_bytes=False):
+        """Write the frame to a PNG file (needs Pillow)."""
+        self.to_image(scale, swap_bytes).save(path)
+
+
+def FrameBuffer1(buffer, width, height, format=MONO_VLSB, stride=None):
+    """Old MicroPython name for FrameBuffer."""
+    return FrameBuffer(buffer, width, height, format, stride)
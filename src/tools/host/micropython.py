@@ -0,0 +1,27 @@
+# micropython.py CPython stand-in for the micropython module
+# Only what the drivers and kits use: const() and the code emitter
+# decorators, which run the plain Python function on a PC.
+
+
+def const(value):
+    return value
+
+
+def native(func):
+    return func
+
+
+def viper(func):
+    return func
+
+
+def heap_lock():
+    pass
+
+
+def heap_unlock():
+    return 0
+
+
+def mem_info(*args):
+    pass
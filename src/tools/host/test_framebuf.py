@@ -0,0 +1,257 @@
+# Host tests for framebuf.py (CPython):  python3 -m pytest test_framebuf.py
+# The byte layouts checked here are the ones MicroPython's framebuf.c uses,
+# so drivers that send or poke self.buffer see the same bytes as on a board.
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+import framebuf
+
+MONO_FORMATS = (framebuf.MONO_VLSB, framebuf.MONO_HLSB, framebuf.MONO_HMSB)
+ALL_FORMATS = MONO_FORMATS + (framebuf.GS2_HMSB, framebuf.GS4_HMSB, framebuf.GS8, framebuf.RGB565)
+BYTES_PER_PIXEL = {framebuf.GS8: 1, framebuf.RGB565: 2}
+
+
+def make(width, height, fmt):
+    if fmt in BYTES_PER_PIXEL:
+        size = width * height * BYTES_PER_PIXEL[fmt]
+    elif fmt == framebuf.MONO_VLSB:
+        size = width * ((height + 7) // 8)
+    elif fmt == framebuf.GS2_HMSB:
+        size = (width * height + 3) // 4
+    elif fmt == framebuf.GS4_HMSB:
+        size = (width * height + 1) // 2
+    else:
+        size = ((width + 7) // 8) * height
+    buf = bytearray(size)
+    return framebuf.FrameBuffer(buf, width, height, fmt), buf
+
+
+def lit(fb):
+    """Set of (x, y) with a non-zero pixel."""
+    return {(x, y) for y in range(fb._height) for x in range(fb._width) if fb.pixel(x, y)}
+
+
+def test_byte_layouts():
+    fb, buf = make(16, 16, framebuf.MONO_VLSB)
+    fb.pixel(3, 9, 1)
+    assert buf[16 + 3] == 0x02
+
+    fb, buf = make(16, 2, framebuf.MONO_HLSB)
+    fb.pixel(1, 1, 1)
+    assert buf[2] == 0x40
+
+    fb, buf = make(16, 2, framebuf.MONO_HMSB)
+    fb.pixel(1, 1, 1)
+    assert buf[2] == 0x02
+
+    fb, buf = make(4, 2, framebuf.GS4_HMSB)
+    fb.pixel(0, 1, 0xA)
+    fb.pixel(1, 1, 0x5)
+    assert buf[2] == 0xA5
+
+    fb, buf = make(4, 1, framebuf.GS2_HMSB)
+    fb.pixel(1, 0, 3)
+    assert buf[0] == 0x0C   # framebuf.c: shift = (x & 3) << 1
+    fb.fill_rect(2, 0, 2, 1, 2)   # Goes through the whole-buffer path
+    assert buf[0] == 0xAC and fb.pixel(3, 0) == 2
+
+    fb, buf = make(4, 2, framebuf.RGB565)
+    fb.pixel(2, 1, 0xF81F)
+    assert buf[12:14] == b"\x1f\xf8"
+
+
+@pytest.mark.parametrize("fmt", ALL_FORMATS)
+def test_pixels_round_trip_and_clip(fmt):
+    fb, buf = make(21, 11, fmt)
+    top = {framebuf.GS2_HMSB: 3, framebuf.GS4_HMSB: 15, framebuf.GS8: 255, framebuf.RGB565: 0xFFFF}.get(fmt, 1)
+    fb.pixel(0, 0, top)
+    fb.pixel(20, 10, 1)
+    fb.pixel(21, 3, 1)
+    fb.pixel(-1, 3, 1)
+    assert fb.pixel(0, 0) == top
+    assert fb.pixel(20, 10) == 1
+    assert fb.pixel(21, 3) is None
+    assert lit(fb) == {(0, 0), (20, 10)}
+
+    fb.fill(1)
+    assert len(lit(fb)) == 21 * 11
+    fb.fill_rect(-5, -5, 10, 10, 0)
+    assert fb.pixel(4, 4) == 0 and fb.pixel(5, 5) == 1
+
+
+def test_lines_match_bresenham():
+    fb, _ = make(16, 16, framebuf.MONO_VLSB)
+    fb.line(0, 0, 5, 2, 1)
+    assert lit(fb) == {(0, 0), (1, 0), (2, 1), (3, 1), (4, 2), (5, 2)}
+
+    fb.fill(0)
+    fb.line(3, 10, 3, 4, 1)
+    assert lit(fb) == {(3, y) for y in range(4, 11)}
+
+    fb.fill(0)
+    fb.hline(2, 3, 4, 1)
+    fb.vline(10, 1, 3, 1)
+    assert lit(fb) == {(2, 3), (3, 3), (4, 3), (5, 3), (10, 1), (10, 2), (10, 3)}
+
+
+def test_rect_outline_and_fill():
+    fb, _ = make(10, 10, framebuf.GS8)
+    fb.rect(1, 2, 4, 3, 7)
+    assert lit(fb) == {(1, 2), (2, 2), (3, 2), (4, 2), (1, 3), (4, 3), (1, 4), (2, 4), (3, 4), (4, 4)}
+    fb.rect(1, 2, 4, 3, 9, True)
+    assert fb.pixel(2, 3) == 9 and len(lit(fb)) == 12
+
+
+def test_ellipse_is_symmetric_and_fills():
+    fb, _ = make(32, 32, framebuf.MONO_HLSB)
+    fb.ellipse(16, 16, 8, 5, 1)
+    outline = lit(fb)
+    assert (24, 16) in outline and (8, 16) in outline
+    assert (16, 11) in outline and (16, 21) in outline
+    assert outline == {(32 - x, y) for x, y in outline}
+    assert outline == {(x, 32 - y) for x, y in outline}
+
+    fb.ellipse(16, 16, 8, 5, 1, True)
+    filled = lit(fb)
+    assert (16, 16) in filled and outline <= filled
+
+    fb.fill(0)
+    fb.ellipse(16, 16, 6, 6, 1, False, 0x01)
+    assert all(x >= 16 and y <= 16 for x, y in lit(fb))
+
+
+def test_poly_outline_and_fill():
+    fb, _ = make(20, 20, framebuf.MONO_VLSB)
+    square = [0, 0, 5, 0, 5, 5, 0, 5]
+    fb.poly(2, 3, square, 1)
+    assert lit(fb) == {(x, y) for x in range(2, 8) for y in range(3, 9)
+                       if x in (2, 7) or y in (3, 8)}
+    fb.poly(2, 3, square, 1, True)
+    assert lit(fb) == {(x, y) for x in range(2, 8) for y in range(3, 9)}
+
+    fb.fill(0)
+    fb.poly(0, 0, [10, 0, 19, 18, 0, 18], 1, True)
+    triangle = lit(fb)
+    assert (10, 0) in triangle and (10, 10) in triangle
+    assert (1, 1) not in triangle and (18, 1) not in triangle
+
+
+def test_text_uses_8x8_cells():
+    fb, _ = make(40, 8, framebuf.MONO_VLSB)
+    fb.text("Hi", 0, 0, 1)
+    pixels = lit(fb)
+    assert pixels
+    assert all(x < 16 for x, y in pixels)
+    assert any(x >= 8 for x, y in pixels)
+    fb.text(" ", 16, 0, 1)
+    assert lit(fb) == pixels
+
+
+def test_scroll_keeps_uncovered_pixels():
+    fb, _ = make(8, 8, framebuf.GS8)
+    fb.pixel(1, 1, 5)
+    fb.scroll(2, 3)
+    assert fb.pixel(3, 4) == 5
+    assert fb.pixel(1, 1) == 5      # MicroPython leaves the old strip alone
+    fb.scroll(-3, -4)
+    assert fb.pixel(0, 0) == 5
+    fb.scroll(8, 0)
+    assert fb.pixel(0, 0) == 5
+
+
+def test_blit_with_key_and_palette():
+    sprite, _ = make(3, 2, framebuf.MONO_HLSB)
+    sprite.pixel(0, 0, 1)
+    sprite.pixel(2, 1, 1)
+
+    # The mono to GS4 palette used by the SSD1322 driver
+    palette, _ = make(2, 1, framebuf.GS4_HMSB)
+    palette.pixel(0, 0, 0)
+    palette.pixel(1, 0, 12)
+
+    fb, _ = make(8, 8, framebuf.GS4_HMSB)
+    fb.fill(3)
+    fb.blit(sprite, 6, 7, 0, palette)
+    assert fb.pixel(6, 7) == 12
+    assert fb.pixel(7, 7) == 3      # Key colour after the palette is skipped
+
+    fb.blit(sprite, 1, 1)
+    assert fb.pixel(1, 1) == 1 and fb.pixel(2, 1) == 0 and fb.pixel(3, 2) == 1
+
+    _, buf = make(2, 1, framebuf.GS8)
+    buf[:] = b"\x07\x00"
+    fb.blit((buf, 2, 1, framebuf.GS8), 0, 0, 0)
+    assert fb.pixel(0, 0) == 7 and fb.pixel(1, 0) == 3
+
+
+def test_stride_keeps_padding():
+    buf = bytearray(b"\xAA" * 16)
+    fb = framebuf.FrameBuffer(buf, 6, 2, framebuf.GS8, 8)
+    fb.fill(1)
+    assert buf == bytearray(b"\x01" * 6 + b"\xAA\xAA" + b"\x01" * 6 + b"\xAA\xAA")
+
+
+def test_png_dump(tmp_path):
+    pytest.importorskip("PIL")
+    fb, _ = make(16, 8, framebuf.RGB565)
+    fb.fill_rect(0, 0, 8, 8, 0xF800)
+    image = fb.to_image(scale=2)
+    assert image.size == (32, 16)
+    assert image.getpixel((0, 0)) == (255, 0, 0)
+    assert image.getpixel((31, 0)) == (0, 0, 0)
+    path = tmp_path / "frame.png"
+    fb.save_png(str(path))
+    assert path.read_bytes()[:4] == b"\x89PNG"
+
+
+class Pin:
+    OUT = 1
+
+    def __init__(self):
+        self.value = 0
+
+    def init(self, mode, value=0):
+        self.value = value
+
+    def __call__(self, value=None):
+        if value is not None:
+            self.value = value
+        return self.value
+
+
+class SPI:
+    def __init__(self):
+        self.data = bytearray()
+
+    def write(self, data):
+        self.data += data
+
+
+def test_ssd1322_driver_draws_on_host(monkeypatch):
+    lib = os.path.join(HERE, '..', '..', 'kits', 'oled-ssd1322', 'lib')
+    monkeypatch.syspath_prepend(lib)
+    import utime
+    monkeypatch.setattr(utime, 'sleep_ms', lambda ms: None)
+    # Not a plain import: wide-fft has a different ssd1322.py
+    spec = importlib.util.spec_from_file_location('oled_ssd1322', os.path.join(lib, 'ssd1322.py'))
+    ssd1322 = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(ssd1322)
+    monkeypatch.setattr(ssd1322, 'sleep_ms', lambda ms: None)
+
+    spi = SPI()
+    display = ssd1322.Display(spi, Pin(), Pin(), Pin())
+    display.draw_text8x8(0, 0, "OK", 15)
+    display.fill_circle(128, 32, 10, 8)
+    display.draw_line(0, 63, 255, 0, 4)
+    assert display.gs4_fb.pixel(128, 32) == 8
+    assert display.gs4_fb.pixel(0, 63) == 4
+    spi.data = bytearray()
+    display.present()
+    assert spi.data.endswith(display.gs4_buf)
@@ -0,0 +1,27 @@
+# utime.py CPython stand-in for MicroPython's utime module
+
+from time import sleep, time, perf_counter_ns
+
+
+def sleep_ms(ms):
+    sleep(ms / 1000)
+
+
+def sleep_us(us):
+    sleep(us / 1000000)
+
+
+def ticks_ms():
+    return perf_counter_ns() // 1000000
+
+
+def ticks_us():
+    return perf_counter_ns() // 1000
+
+
+def ticks_diff(end, start):
+    return end - start
+
+
+def ticks_add(ticks, delta):
+    return ticks + delta